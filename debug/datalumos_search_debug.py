@@ -16,6 +16,7 @@ from utils.Logger import Logger
 from duplicate_checking.datalumos_search import (
     _fetch_search_page,
     _parse_num_found,
+    _parse_search_results_blob,
     DATALUMOS_SEARCH_BASE,
 )
 from urllib.parse import urlencode
@@ -54,7 +55,7 @@ out = Path(__file__).parent / "datalumos_search_response.html"
 out.write_text(html, encoding="utf-8")
 print("Wrote", out)
 
-n = _parse_num_found(html)
+n = _parse_num_found(html, _parse_search_results_blob(html))
 print("numFound:", n)
 
 # Show snippet around "numFound" or "response"
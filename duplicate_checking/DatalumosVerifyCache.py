@@ -0,0 +1,79 @@
+"""
+Persistent cache of datalumos verification results.
+
+Stores source URLs that were verified as present in datalumos, with the time
+of verification, in a small SQLite file. Pipeline reruns consult it so URLs
+verified within the TTL are not searched again. Only positive results are
+cached: a URL missing today may be uploaded tomorrow.
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+DEFAULT_VERIFY_CACHE_PATH = Path("~/.drp/datalumos_verify_cache.db")
+DEFAULT_VERIFY_CACHE_TTL_DAYS = 30
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS verified (
+    source_url TEXT PRIMARY KEY,
+    verified_at REAL NOT NULL
+)
+"""
+
+
+class DatalumosVerifyCache:
+    """SQLite-backed cache of source URLs verified as present in datalumos."""
+
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_VERIFY_CACHE_PATH,
+        ttl_days: float = DEFAULT_VERIFY_CACHE_TTL_DAYS,
+    ) -> None:
+        """
+        Args:
+            db_path: SQLite file for the cache (created on first write; ~ expanded).
+            ttl_days: Entries older than this many days are treated as missing.
+        """
+        self._db_path = Path(db_path).expanduser()
+        self._ttl_seconds = float(ttl_days) * 86400
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the cache database (creating file and table), commit, and close."""
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._db_path)
+        try:
+            conn.execute(_SCHEMA_SQL)
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def is_verified(self, source_url: str) -> bool:
+        """Return True if source_url was verified within the TTL."""
+        if not self._db_path.exists():
+            return False
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT verified_at FROM verified WHERE source_url = ?",
+                (source_url,),
+            ).fetchone()
+        return row is not None and time.time() - row[0] < self._ttl_seconds
+
+    def mark_verified(self, source_url: str) -> None:
+        """Record that source_url was verified as present in datalumos now."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO verified (source_url, verified_at) VALUES (?, ?)",
+                (source_url, time.time()),
+            )
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        if not self._db_path.exists():
+            return
+        with self._connect() as conn:
+            conn.execute("DELETE FROM verified")
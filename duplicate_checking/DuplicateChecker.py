@@ -5,9 +5,15 @@ Checks whether a proposed source_url already exists in Storage or in
 external repositories (e.g. datalumos). Use to avoid adding duplicates.
 """
 
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
+from duplicate_checking.DatalumosVerifyCache import (
+    DEFAULT_VERIFY_CACHE_PATH,
+    DatalumosVerifyCache,
+)
 from duplicate_checking.datalumos_search import verify_source_url_in_datalumos
+from utils.Args import Args
 
 if TYPE_CHECKING:
     from storage.StorageProtocol import StorageProtocol
@@ -18,12 +24,27 @@ class DuplicateChecker:
     Checks for duplicate source URLs in Storage and external repos (e.g. datalumos).
     """
 
-    def __init__(self) -> None:
+    def __init__(self, verify_cache: Optional[DatalumosVerifyCache] = None) -> None:
         """
         Initialize DuplicateChecker. Uses Storage singleton (call Storage.initialize() first).
+
+        Args:
+            verify_cache: Cache of URLs already verified in datalumos. If None, built
+                from Args (datalumos_verify_cache, datalumos_verify_cache_path,
+                datalumos_verify_cache_ttl_days); disabled when datalumos_verify_cache is False.
         """
         # Storage methods are accessed directly on the Storage class, no need to store instance
-        pass
+        self._verify_cache = verify_cache if verify_cache is not None else self._cache_from_args()
+
+    @staticmethod
+    def _cache_from_args() -> Optional[DatalumosVerifyCache]:
+        """Build the datalumos verification cache from Args, or None when disabled."""
+        if not Args.datalumos_verify_cache:
+            return None
+        return DatalumosVerifyCache(
+            Path(Args.datalumos_verify_cache_path or DEFAULT_VERIFY_CACHE_PATH),
+            ttl_days=Args.datalumos_verify_cache_ttl_days,
+        )
 
     def exists_in_storage(self, source_url: str) -> bool:
         """
@@ -47,6 +68,8 @@ class DuplicateChecker:
         Searches datalumos, navigates to each result page, and returns True only
         if some result's "Original Distribution URL:" <a> text matches the search
         URL. On navigation failure or no match, logs a warning and returns False.
+        URLs verified within the cache TTL are answered from the cache without
+        searching.
 
         Args:
             source_url: The URL to check (e.g. a data.cdc.gov about_data link).
@@ -54,4 +77,9 @@ class DuplicateChecker:
         Returns:
             True if a matching Original Distribution URL is found, False otherwise.
         """
-        return verify_source_url_in_datalumos(source_url)
+        if self._verify_cache is not None and self._verify_cache.is_verified(source_url):
+            return True
+        found = verify_source_url_in_datalumos(source_url)
+        if found and self._verify_cache is not None:
+            self._verify_cache.mark_verified(source_url)
+        return found
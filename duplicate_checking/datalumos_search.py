@@ -8,9 +8,13 @@ Playwright to load the page, then optionally navigate to each result and verify
 """
 
 import re
+import sys
+from typing import Any
 from urllib.parse import urlencode
 
-from playwright.sync_api import Page, sync_playwright
+import orjson
+from playwright.sync_api import Browser, Page, Route, sync_playwright
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 from utils.Logger import Logger
 
@@ -24,56 +28,164 @@ _DEFAULT_PARAMS = {
     "rows": "25",
 }
 
+# Resource types we never need: we only read the initial HTML and a few DOM nodes.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "stylesheet", "font", "media"})
+
+# Result pages: navigate with wait_until="commit", then wait briefly for the
+# label region the ODU extractor reads before falling back to domcontentloaded.
+_ODU_LABEL_SELECTOR = "dt, label, dl"
+_ODU_LABEL_WAIT_MS = 2000
+
+# Cloudflare interstitial titles ("Just a moment..." / "Just a minute...").
+_CLOUDFLARE_RE = re.compile(r"Just a m(?:oment|inute)")
+
+# Embedded React props: SearchPage, {searchResults : {...}, searchConfig : {...}}
+_SEARCH_RESULTS_RE = re.compile(
+    r'searchResults\s*:\s*(\{"response".*?\})\s*,\s*searchConfig', re.DOTALL
+)
 _NUMFOUND_RE = re.compile(r'"numFound"\s*:\s*(\d+)')
 _ID_RE = re.compile(r'"ID"\s*:\s*(\d+)')
 
 
-def _parse_num_found(text: str) -> int:
-    """Extract numFound from response text. Returns -1 if not found."""
+def _parse_search_results_blob(text: str) -> dict[str, Any] | None:
+    """
+    Locate the embedded searchResults JSON and return its "response" object.
+
+    Returns None when the blob is absent or does not have the expected shape,
+    so callers can fall back to a regex scan of the whole text. Parse once per
+    response and pass the result to _parse_num_found and _parse_result_ids.
+    """
+    m = _SEARCH_RESULTS_RE.search(text)
+    if not m:
+        return None
+    try:
+        data = orjson.loads(m.group(1))
+    except orjson.JSONDecodeError:
+        return None
+    response = data.get("response") if isinstance(data, dict) else None
+    return response if isinstance(response, dict) else None
+
+
+def _parse_num_found(text: str, response: dict[str, Any] | None) -> int:
+    """
+    Extract numFound from the parsed searchResults response, else from the raw text.
+
+    Returns -1 if not found.
+    """
+    if response is not None and isinstance(response.get("numFound"), int):
+        return response["numFound"]
     m = _NUMFOUND_RE.search(text)
     return int(m.group(1)) if m else -1
 
 
-def _parse_result_ids(text: str) -> list[int]:
-    """Extract study IDs from search response docs. Returns empty list if none."""
+def _parse_result_ids(text: str, response: dict[str, Any] | None) -> list[int]:
+    """
+    Extract study IDs from the parsed response docs, else from the raw text.
+
+    Returns empty list if none.
+    """
+    if response is not None and isinstance(response.get("docs"), list):
+        return [
+            int(d["ID"]) for d in response["docs"]
+            if isinstance(d, dict) and "ID" in d
+        ]
     return [int(g) for g in _ID_RE.findall(text)]
 
 
-def _parse_and_validate_search_response(text: str, source_url: str) -> int | None:
+def _parse_and_validate_search_response(
+    text: str, source_url: str, response: dict[str, Any] | None
+) -> int | None:
     """
     Parse numFound from search HTML, log Cloudflare / missing / multi-match
     warnings as needed, and return num (>= 0) on success or None on failure.
+
+    `response` is _parse_search_results_blob(text).
     """
-    num = _parse_num_found(text)
+    num = _parse_num_found(text, response)
     if num < 0:
-        if "Just a moment" in text:
+        if _CLOUDFLARE_RE.search(text):
             Logger.warning(
-                f"Cloudflare challenge detected; datalumos search could not complete for {source_url!r}"
+                "Cloudflare challenge detected; datalumos search could not complete for %r",
+                source_url,
             )
         else:
             Logger.warning(
-                f"Datalumos search response missing 'numFound' for {source_url!r}"
+                "Datalumos search response missing 'numFound' for %r", source_url
             )
         return None
     if num > 1:
         Logger.warning(
-            f"Datalumos returned {num} matches for {source_url!r}; expected at most one"
+            "Datalumos returned %s matches for %r; expected at most one",
+            num,
+            source_url,
         )
     return num
 
 
+def _build_search_url(source_url: str) -> str:
+    """Return the datalumos search/studies URL that queries for source_url."""
+    params = {**_DEFAULT_PARAMS, "q": source_url}
+    return f"{DATALUMOS_SEARCH_BASE}?{urlencode(params)}"
+
+
+def _result_urls_from_search(text: str, source_url: str) -> list[str] | None:
+    """
+    Parse a search response into result project URLs.
+
+    Logs the same warnings as _parse_and_validate_search_response, plus one
+    when matches are reported but no IDs can be parsed. Returns None on failure.
+    URLs are interned, so (result_url, odu) tuples collected for mismatch
+    warnings share one string per project.
+    """
+    response = _parse_search_results_blob(text)
+    num = _parse_and_validate_search_response(text, source_url, response)
+    if num is None:
+        return None
+    ids = _parse_result_ids(text, response)
+    if not ids:
+        Logger.warning(
+            "Datalumos reported %s match(es) for %r but no result IDs could be parsed",
+            num,
+            source_url,
+        )
+        return None
+    # Interned: the same project URLs recur across many searches in a batch run.
+    return [sys.intern(DATALUMOS_PROJECT_URL.format(project_id=i)) for i in ids]
+
+
+def _warn_no_odu_match(
+    source_url: str, found: list[tuple[str, str]], num_results: int
+) -> None:
+    """Log why none of the result pages matched the expected Original Distribution URL."""
+    if found:
+        Logger.warning(
+            "Searched for %r; no matching Original Distribution URL. Result(s) found: %s",
+            source_url,
+            "; ".join(f"{u}: {o!r}" for u, o in found),
+        )
+    else:
+        Logger.warning(
+            "Searched for %r; navigated to %s result(s) "
+            "but could not extract Original Distribution URL from any",
+            source_url,
+            num_results,
+        )
+
+
 _ODU_EXTRACT_JS = """
 () => {
+  const LABEL = /Original\\s+Distribution\\s+URL\\s*:?\\s*/;
+  const HREF = /^https?:\\/\\//i;
   const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT, null, false);
   let n;
   while (n = walker.nextNode()) {
-    if (/Original\\s+Distribution\\s+URL\\s*:?\\s*/.test(n.textContent)) {
+    if (LABEL.test(n.textContent)) {
       let el = n.parentElement;
       while (el) {
         const candidates = el.tagName === 'A' ? [el] : el.querySelectorAll('a');
         for (const a of candidates) {
           const t = (a.textContent || '').trim();
-          if (t && /^https?:\\/\\//i.test(t)) return t;
+          if (t && HREF.test(t)) return t;
         }
         el = el.nextElementSibling;
       }
@@ -95,6 +207,26 @@ def _extract_original_distribution_url_from_page(page: Page) -> str | None:
     return result if isinstance(result, str) and result else None
 
 
+def _block_heavy_resources(route: Route) -> None:
+    """Abort image/stylesheet/font/media requests; let everything else through."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _new_lean_page(browser: Browser) -> Page:
+    """
+    Open a new page that skips theme assets (images, CSS, fonts, media).
+
+    Documents, scripts, and XHR/fetch stay enabled so the React-embedded JSON
+    still renders.
+    """
+    page = browser.new_page()
+    page.route("**/*", _block_heavy_resources)
+    return page
+
+
 def _fetch_search_page(
     url: str,
     timeout_ms: int,
@@ -111,10 +243,24 @@ def _fetch_search_page(
         page.goto(url, timeout=timeout_ms, wait_until="domcontentloaded")
         return page.content()
     except Exception as e:
-        Logger.warning(f"Datalumos search request failed for {source_url!r}: {e}")
+        Logger.warning("Datalumos search request failed for %r: %s", source_url, e)
         return None
 
 
+def _goto_result_page(page: Page, result_url: str, timeout_ms: int) -> None:
+    """
+    Navigate to a result page without waiting for sub-resources.
+
+    Returns once the ODU label region is parsed, or once the DOM is loaded if
+    no label element shows up within _ODU_LABEL_WAIT_MS.
+    """
+    page.goto(result_url, timeout=timeout_ms, wait_until="commit")
+    try:
+        page.wait_for_selector(_ODU_LABEL_SELECTOR, timeout=_ODU_LABEL_WAIT_MS)
+    except PlaywrightTimeoutError:
+        page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+
+
 def _check_result_pages_for_odu_match(
     page: Page,
     result_urls: list[str],
@@ -130,40 +276,25 @@ def _check_result_pages_for_odu_match(
     found: list[tuple[str, str]] = []
     for result_url in result_urls:
         try:
-            page.goto(
-                result_url,
-                timeout=timeout_ms,
-                wait_until="domcontentloaded",
-            )
+            _goto_result_page(page, result_url, timeout_ms)
             html = page.content()
-            if "Just a moment" in html or "Just a minute" in html:
+            if _CLOUDFLARE_RE.search(html):
                 Logger.warning(
-                    f"Cloudflare challenge detected on result page {result_url}; "
-                    f"could not extract Original Distribution URL"
+                    "Cloudflare challenge detected on result page %s; "
+                    "could not extract Original Distribution URL",
+                    result_url,
                 )
                 continue
             odu = _extract_original_distribution_url_from_page(page)
         except Exception as e:
-            Logger.warning(
-                f"Failed to load datalumos result page {result_url}: {e}"
-            )
+            Logger.warning("Failed to load datalumos result page %s: %s", result_url, e)
             continue
         if odu is None:
             continue
         if odu == expected:
             return True
         found.append((result_url, odu))
-    if found:
-        parts = [f"{u}: {o!r}" for u, o in found]
-        Logger.warning(
-            f"Searched for {source_url!r}; no matching Original Distribution URL. "
-            f"Result(s) found: {'; '.join(parts)}"
-        )
-    else:
-        Logger.warning(
-            f"Searched for {source_url!r}; navigated to {len(result_urls)} result(s) "
-            f"but could not extract Original Distribution URL from any"
-        )
+    _warn_no_odu_match(source_url, found, len(result_urls))
     return False
 
 
@@ -187,25 +318,24 @@ def search_datalumos(
     Returns:
         The number of matching studies (numFound). -1 on network/parse error.
     """
-    params = {**_DEFAULT_PARAMS, "q": source_url}
-    url = f"{DATALUMOS_SEARCH_BASE}?{urlencode(params)}"
+    url = _build_search_url(source_url)
     timeout_ms = int(timeout * 1000)
 
     try:
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=headless)
             try:
-                page = browser.new_page()
+                page = _new_lean_page(browser)
                 text = _fetch_search_page(url, timeout_ms, source_url, page)
             finally:
                 browser.close()
     except Exception as e:
-        Logger.warning(f"Datalumos search request failed for {source_url!r}: {e}")
+        Logger.warning("Datalumos search request failed for %r: %s", source_url, e)
         return -1
 
     if text is None:
         return -1
-    num = _parse_and_validate_search_response(text, source_url)
+    num = _parse_and_validate_search_response(text, source_url, _parse_search_results_blob(text))
     if num is None:
         return -1
     return num
@@ -228,8 +358,7 @@ def verify_source_url_in_datalumos(
 
     headless=False can help avoid Cloudflare blocking (use for live verification).
     """
-    params = {**_DEFAULT_PARAMS, "q": source_url}
-    search_url = f"{DATALUMOS_SEARCH_BASE}?{urlencode(params)}"
+    search_url = _build_search_url(source_url)
     timeout_ms = int(timeout * 1000)
     expected = source_url.strip()
 
@@ -237,30 +366,20 @@ def verify_source_url_in_datalumos(
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=headless)
             try:
-                page = browser.new_page()
+                page = _new_lean_page(browser)
                 text = _fetch_search_page(
                     search_url, timeout_ms, source_url, page
                 )
                 if text is None:
                     return False
-                num = _parse_and_validate_search_response(text, source_url)
-                if num is None:
-                    return False
-                ids = _parse_result_ids(text)
-                if not ids:
-                    Logger.warning(
-                        f"Datalumos reported {num} match(es) for {source_url!r} "
-                        f"but no result IDs could be parsed"
-                    )
+                result_urls = _result_urls_from_search(text, source_url)
+                if result_urls is None:
                     return False
-                result_urls = [
-                    DATALUMOS_PROJECT_URL.format(project_id=i) for i in ids
-                ]
                 return _check_result_pages_for_odu_match(
                     page, result_urls, expected, source_url, timeout_ms
                 )
             finally:
                 browser.close()
     except Exception as e:
-        Logger.warning(f"Datalumos verification failed for {source_url!r}: {e}")
+        Logger.warning("Datalumos verification failed for %r: %s", source_url, e)
         return False
@@ -0,0 +1,54 @@
+"""
+Unit tests for DatalumosVerifyCache.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from duplicate_checking.DatalumosVerifyCache import DatalumosVerifyCache
+
+
+class TestDatalumosVerifyCache(unittest.TestCase):
+    """Test cases for DatalumosVerifyCache."""
+
+    def setUp(self) -> None:
+        """Create a cache in a temporary directory."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_path = self.temp_dir / "sub" / "cache.db"
+        self.cache = DatalumosVerifyCache(self.db_path, ttl_days=30)
+
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_unknown_url_not_verified_and_no_file_created(self) -> None:
+        """Test lookups on an empty cache return False without creating the file."""
+        self.assertFalse(self.cache.is_verified("https://example.com"))
+        self.assertFalse(self.db_path.exists())
+
+    def test_mark_verified_persists_across_instances(self) -> None:
+        """Test a marked URL is seen by a new cache instance on the same file."""
+        self.cache.mark_verified("https://example.com")
+        self.assertTrue(DatalumosVerifyCache(self.db_path).is_verified("https://example.com"))
+        self.assertFalse(self.cache.is_verified("https://other.com"))
+
+    def test_entries_expire_after_ttl(self) -> None:
+        """Test entries older than the TTL are treated as not verified."""
+        with patch("duplicate_checking.DatalumosVerifyCache.time.time", return_value=1000.0):
+            self.cache.mark_verified("https://example.com")
+        later = 1000.0 + 31 * 86400
+        with patch("duplicate_checking.DatalumosVerifyCache.time.time", return_value=later):
+            self.assertFalse(self.cache.is_verified("https://example.com"))
+
+    def test_clear_removes_entries(self) -> None:
+        """Test clear() empties the cache."""
+        self.cache.mark_verified("https://example.com")
+        self.cache.clear()
+        self.assertFalse(self.cache.is_verified("https://example.com"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,8 @@
 Unit tests for DuplicateChecker.
 """
 
+import shutil
+import sys
 import tempfile
 import unittest
 from pathlib import Path
@@ -11,34 +13,42 @@ from utils.Args import Args
 from utils.Logger import Logger
 from storage import Storage
 from duplicate_checking import DuplicateChecker
+from duplicate_checking.DatalumosVerifyCache import DatalumosVerifyCache
 
 
 class TestDuplicateChecker(unittest.TestCase):
     """Test cases for DuplicateChecker class."""
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Create one in-memory database and cache file shared by all tests in the class."""
+        Logger.initialize(log_level="WARNING")
+        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls.storage = Storage.initialize("StorageSQLLite", db_path=Path(":memory:"))
+        cls.verify_cache = DatalumosVerifyCache(cls.temp_dir / "verify_cache.db")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Close the shared database and remove the cache directory."""
+        cls.storage.close()
+        Storage.reset()  # Reset singleton for other test classes
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
     def setUp(self) -> None:
-        """Set up test environment before each test."""
-        import sys
+        """Set up test environment before each test: empty tables and cache."""
         self._original_argv = sys.argv.copy()
         sys.argv = ["test", "noop"]
 
         Args.initialize()
         Logger.initialize(log_level="WARNING")
 
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.test_db_path = self.temp_dir / "test_drp_pipeline.db"
-        self.storage = Storage.initialize("StorageSQLLite", db_path=self.test_db_path)
-        self.checker = DuplicateChecker()
+        self.storage.clear_all_records()
+        self.verify_cache.clear()
+        self.checker = DuplicateChecker(verify_cache=self.verify_cache)
 
     def tearDown(self) -> None:
         """Clean up after each test."""
-        import sys
-        self.storage.close()
-        Storage.reset()  # Reset singleton for next test
         sys.argv = self._original_argv
-        if self.temp_dir.exists():
-            import shutil
-            shutil.rmtree(self.temp_dir)
 
     def test_exists_in_storage_returns_false_when_not_present(self) -> None:
         """Test exists_in_storage returns False when URL is not in database."""
@@ -74,3 +84,30 @@ class TestDuplicateChecker(unittest.TestCase):
         url = "https://data.cdc.gov/Vision-Eye-Health/BRFSS-Vision-Module-Data-Vision-Eye-Health/pttf-ck53/about_data"
         self.assertTrue(self.checker.exists_in_datalumos(url))
         mock_verify.assert_called_once_with(url)
+
+    @patch("duplicate_checking.DuplicateChecker.verify_source_url_in_datalumos")
+    def test_exists_in_datalumos_uses_cache_for_verified_url(
+        self, mock_verify: unittest.mock.MagicMock
+    ) -> None:
+        """Test a URL verified once is answered from the cache on the next check."""
+        mock_verify.return_value = True
+        url = "https://data.cdc.gov/x/y/about_data"
+        self.assertTrue(self.checker.exists_in_datalumos(url))
+        self.assertTrue(DuplicateChecker(verify_cache=self.verify_cache).exists_in_datalumos(url))
+        mock_verify.assert_called_once_with(url)
+
+    @patch("duplicate_checking.DuplicateChecker.verify_source_url_in_datalumos")
+    def test_exists_in_datalumos_does_not_cache_misses(
+        self, mock_verify: unittest.mock.MagicMock
+    ) -> None:
+        """Test a URL not found in datalumos is re-verified on the next check."""
+        mock_verify.return_value = False
+        url = "https://data.cdc.gov/x/y/about_data"
+        self.checker.exists_in_datalumos(url)
+        self.checker.exists_in_datalumos(url)
+        self.assertEqual(mock_verify.call_count, 2)
+
+    def test_cache_disabled_via_args(self) -> None:
+        """Test datalumos_verify_cache=False builds a checker without a cache."""
+        with patch.dict(Args._config, {"datalumos_verify_cache": False}):
+            self.assertIsNone(DuplicateChecker()._verify_cache)
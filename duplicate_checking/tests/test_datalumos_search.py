@@ -3,19 +3,27 @@ Unit tests for datalumos_search.
 """
 
 import os
+import sys
 import unittest
 from unittest.mock import patch
 
 from utils.Args import Args
 from utils.Logger import Logger
+import orjson
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from playwright.sync_api import sync_playwright
 
 from duplicate_checking.datalumos_search import (
     DATALUMOS_SEARCH_BASE,
+    _block_heavy_resources,
     _extract_original_distribution_url_from_page,
     _fetch_search_page,
+    _goto_result_page,
+    _parse_and_validate_search_response,
     _parse_num_found,
     _parse_result_ids,
+    _parse_search_results_blob,
+    _result_urls_from_search,
     search_datalumos,
     verify_source_url_in_datalumos,
 )
@@ -27,11 +35,11 @@ class TestParseNumFound(unittest.TestCase):
     def test_parses_num_found(self) -> None:
         """Test _parse_num_found extracts numFound from JSON-like text."""
         text = '{"response":{"docs":[],"numFound":3,"start":0}}'
-        self.assertEqual(_parse_num_found(text), 3)
+        self.assertEqual(_parse_num_found(text, _parse_search_results_blob(text)), 3)
 
     def test_returns_minus_one_when_missing(self) -> None:
         """Test _parse_num_found returns -1 when numFound absent."""
-        self.assertEqual(_parse_num_found("<html><body>unexpected</body></html>"), -1)
+        self.assertEqual(_parse_num_found("<html><body>unexpected</body></html>", None), -1)
 
     def test_parses_embedded_react_response(self) -> None:
         """Test _parse_num_found works with React-embedded response."""
@@ -40,21 +48,51 @@ class TestParseNumFound(unittest.TestCase):
             '{"response":{"docs":[],"numFound":1,"start":0},'
             '"responseHeader":{}}, searchConfig : {}}), document.getElementById("search"));'
         )
-        self.assertEqual(_parse_num_found(text), 1)
+        self.assertEqual(_parse_num_found(text, _parse_search_results_blob(text)), 1)
+
+    def test_falls_back_to_regex_when_blob_malformed(self) -> None:
+        """Test _parse_num_found falls back to regex scan when the blob is not valid JSON."""
+        text = (
+            'React.createElement(SearchPage, {searchResults : '
+            '{"response":{"docs":[],"numFound":4,}, searchConfig : {}})'
+        )
+        self.assertEqual(_parse_num_found(text, _parse_search_results_blob(text)), 4)
+
+
+class TestParseAndValidateSearchResponse(unittest.TestCase):
+    """Test cases for _parse_and_validate_search_response."""
+
+    def test_num_found_outside_blob_ignored(self) -> None:
+        """Test a numFound of 1 elsewhere on the page does not override the searchResults count."""
+        text = (
+            '<script>var stats = {"numFound":1, "x": 0};</script>'
+            'React.createElement(SearchPage, {searchResults : '
+            '{"response":{"docs":[],"numFound":3,"start":0}}, searchConfig : {}})'
+        )
+        with patch("duplicate_checking.datalumos_search.Logger"):
+            self.assertEqual(
+                _parse_and_validate_search_response(text, "https://x", _parse_search_results_blob(text)), 3
+            )
+
+    def test_multi_digit_count_not_taken_as_one(self) -> None:
+        """Test numFound 10 is not read as 1."""
+        text = '{"response":{"numFound":10,"docs":[]}}'
+        with patch("duplicate_checking.datalumos_search.Logger"):
+            self.assertEqual(_parse_and_validate_search_response(text, "https://x", None), 10)
 
 
 class TestFetchSearchPage(unittest.TestCase):
     """Test cases for _fetch_search_page."""
 
     def setUp(self) -> None:
-        import sys
+        """Initialize Args (noop module) and Logger, saving sys.argv."""
         self._original_argv = sys.argv.copy()
         sys.argv = ["test", "noop"]
         Args.initialize()
         Logger.initialize(log_level="WARNING")
 
     def tearDown(self) -> None:
-        import sys
+        """Restore sys.argv."""
         sys.argv = self._original_argv
 
     def test_returns_none_when_goto_raises(self) -> None:
@@ -72,43 +110,164 @@ class TestFetchSearchPage(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class TestGotoResultPage(unittest.TestCase):
+    """Test cases for _goto_result_page."""
+
+    def test_navigates_at_commit_and_waits_for_labels(self) -> None:
+        """Test goto uses wait_until=commit then waits for the label region."""
+        mock_page = unittest.mock.MagicMock()
+
+        _goto_result_page(mock_page, "https://example.com/r", 30_000)
+
+        self.assertEqual(mock_page.goto.call_args.kwargs["wait_until"], "commit")
+        mock_page.wait_for_selector.assert_called_once()
+        mock_page.wait_for_load_state.assert_not_called()
+
+    def test_falls_back_to_domcontentloaded_when_labels_missing(self) -> None:
+        """Test a label-wait timeout falls back to waiting for domcontentloaded."""
+        mock_page = unittest.mock.MagicMock()
+        mock_page.wait_for_selector.side_effect = PlaywrightTimeoutError("timeout")
+
+        _goto_result_page(mock_page, "https://example.com/r", 30_000)
+
+        mock_page.wait_for_load_state.assert_called_once_with(
+            "domcontentloaded", timeout=30_000
+        )
+
+
+class TestBlockHeavyResources(unittest.TestCase):
+    """Test cases for _block_heavy_resources."""
+
+    def _route(self, resource_type: str) -> unittest.mock.MagicMock:
+        """Build a mock Route whose request has the given resource type."""
+        route = unittest.mock.MagicMock()
+        route.request.resource_type = resource_type
+        return route
+
+    def test_aborts_images_css_fonts_media(self) -> None:
+        """Test heavy resource types are aborted."""
+        for resource_type in ("image", "stylesheet", "font", "media"):
+            route = self._route(resource_type)
+            _block_heavy_resources(route)
+            route.abort.assert_called_once()
+            route.continue_.assert_not_called()
+
+    def test_continues_documents_and_scripts(self) -> None:
+        """Test document, script, xhr, and fetch requests are allowed through."""
+        for resource_type in ("document", "script", "xhr", "fetch"):
+            route = self._route(resource_type)
+            _block_heavy_resources(route)
+            route.continue_.assert_called_once()
+            route.abort.assert_not_called()
+
+
 class TestParseResultIds(unittest.TestCase):
     """Test cases for _parse_result_ids."""
 
     def test_parses_ids_from_docs(self) -> None:
         """Test _parse_result_ids extracts IDs from embedded docs."""
         text = '{"response":{"docs":[{"ID":243433,"TITLE":"x"},{"ID":100486}],"numFound":2,"start":0}}'
-        self.assertEqual(_parse_result_ids(text), [243433, 100486])
+        self.assertEqual(_parse_result_ids(text, _parse_search_results_blob(text)), [243433, 100486])
 
     def test_returns_empty_when_no_ids(self) -> None:
         """Test _parse_result_ids returns empty list when no IDs present."""
-        self.assertEqual(_parse_result_ids("<html><body>x</body></html>"), [])
+        self.assertEqual(_parse_result_ids("<html><body>x</body></html>", None), [])
+
+    def test_ignores_ids_outside_embedded_blob(self) -> None:
+        """Test _parse_result_ids reads docs from the searchResults blob only."""
+        text = (
+            '<script>var other = {"ID": 1};</script>'
+            'React.createElement(SearchPage, {searchResults : '
+            '{"response":{"docs":[{"ID":243433},{"ID":100486}],"numFound":2,"start":0},'
+            '"responseHeader":{"params":{"q":"x"}}}, searchConfig : {}})'
+        )
+        self.assertEqual(_parse_result_ids(text, _parse_search_results_blob(text)), [243433, 100486])
+
+
+class TestResultUrlsFromSearch(unittest.TestCase):
+    """Test cases for _result_urls_from_search."""
+
+    def setUp(self) -> None:
+        """Initialize Args (noop module) and Logger, saving sys.argv."""
+        self._original_argv = sys.argv.copy()
+        sys.argv = ["test", "noop"]
+        Args.initialize()
+        Logger.initialize(log_level="WARNING")
+
+    def tearDown(self) -> None:
+        """Restore sys.argv."""
+        sys.argv = self._original_argv
+
+    def test_builds_interned_project_urls(self) -> None:
+        """Test result URLs are built per ID and interned across calls."""
+        text = '{"response":{"docs":[{"ID":99}],"numFound":1,"start":0}}'
+        first = _result_urls_from_search(text, "https://example.com/a")
+        second = _result_urls_from_search(text, "https://example.com/b")
+        self.assertEqual(
+            first, ["https://www.datalumos.org/datalumos/project/99/version/V1/view"]
+        )
+        self.assertIs(first[0], second[0])
+
+    def test_parses_search_blob_once(self) -> None:
+        """Test the embedded searchResults JSON is parsed once for both numFound and IDs."""
+        text = (
+            'React.createElement(SearchPage, {searchResults : '
+            '{"response":{"docs":[{"ID":7}],"numFound":1,"start":0}}, searchConfig : {}})'
+        )
+        with patch(
+            "duplicate_checking.datalumos_search.orjson.loads", wraps=orjson.loads
+        ) as mock_loads:
+            urls = _result_urls_from_search(text, "https://example.com/a")
+        self.assertEqual(urls, ["https://www.datalumos.org/datalumos/project/7/version/V1/view"])
+        mock_loads.assert_called_once()
+
+    @patch("duplicate_checking.datalumos_search.Logger")
+    def test_returns_none_when_ids_missing(self, mock_logger: unittest.mock.MagicMock) -> None:
+        """Test None is returned (with a warning) when numFound > 0 but no IDs parse."""
+        text = '{"response":{"docs":[],"numFound":1,"start":0}}'
+        self.assertIsNone(_result_urls_from_search(text, "https://example.com/a"))
+        mock_logger.warning.assert_called_once()
 
 
 class TestExtractOriginalDistributionUrl(unittest.TestCase):
     """Test cases for _extract_original_distribution_url_from_page (Playwright)."""
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Launch one headless browser shared by every test in the class."""
+        cls._pw = sync_playwright().start()
+        try:
+            cls._browser = cls._pw.chromium.launch(headless=True)
+        except Exception:
+            cls._pw.stop()
+            raise
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Close the shared browser and stop Playwright."""
+        cls._browser.close()
+        cls._pw.stop()
+
     def setUp(self) -> None:
-        import sys
+        """Initialize Args (noop module) and Logger, saving sys.argv."""
         self._original_argv = sys.argv.copy()
         sys.argv = ["test", "noop"]
         Args.initialize()
         Logger.initialize(log_level="WARNING")
 
     def tearDown(self) -> None:
-        import sys
+        """Restore sys.argv."""
         sys.argv = self._original_argv
 
     def _odu_from_html(self, html: str) -> str | None:
-        """Load HTML into a Playwright page and extract ODU."""
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            try:
-                page = browser.new_page()
-                page.set_content(html)
-                return _extract_original_distribution_url_from_page(page)
-            finally:
-                browser.close()
+        """Load HTML into a page in a fresh context and extract ODU."""
+        ctx = self._browser.new_context()
+        try:
+            page = ctx.new_page()
+            page.set_content(html)
+            return _extract_original_distribution_url_from_page(page)
+        finally:
+            ctx.close()
 
     def test_extracts_odu_from_dt_dd(self) -> None:
         """Test ODU extracted from dt/dd with adjacent a."""
@@ -138,7 +297,6 @@ class TestDatalumosSearch(unittest.TestCase):
 
     def setUp(self) -> None:
         """Set up test environment before each test."""
-        import sys
         self._original_argv = sys.argv.copy()
         sys.argv = ["test", "noop"]
         Args.initialize()
@@ -146,7 +304,6 @@ class TestDatalumosSearch(unittest.TestCase):
 
     def tearDown(self) -> None:
         """Clean up after each test."""
-        import sys
         sys.argv = self._original_argv
 
     @patch("duplicate_checking.datalumos_search.sync_playwright")
@@ -245,6 +402,27 @@ class TestDatalumosSearch(unittest.TestCase):
         call_args = " ".join(str(c) for c in mock_logger.warning.call_args[0])
         self.assertIn("Cloudflare", call_args)
 
+    @patch("duplicate_checking.datalumos_search.sync_playwright")
+    @patch("duplicate_checking.datalumos_search._fetch_search_page")
+    @patch("duplicate_checking.datalumos_search.Logger")
+    def test_search_datalumos_cloudflare_just_a_minute_warning(
+        self,
+        mock_logger: unittest.mock.MagicMock,
+        mock_fetch: unittest.mock.MagicMock,
+        mock_pw: unittest.mock.MagicMock,
+    ) -> None:
+        """Test the "Just a minute" challenge variant is also reported as Cloudflare."""
+        mock_pw.return_value.__enter__.return_value.chromium.launch.return_value = (
+            unittest.mock.MagicMock()
+        )
+        mock_fetch.return_value = '<html><title>Just a minute...</title></html>'
+
+        n = search_datalumos("https://example.com/data")
+
+        self.assertEqual(n, -1)
+        call_args = " ".join(str(c) for c in mock_logger.warning.call_args[0])
+        self.assertIn("Cloudflare", call_args)
+
     @patch("duplicate_checking.datalumos_search.sync_playwright")
     @patch("duplicate_checking.datalumos_search._fetch_search_page")
     @patch("duplicate_checking.datalumos_search.Logger")
@@ -264,7 +442,8 @@ class TestDatalumosSearch(unittest.TestCase):
 
         self.assertEqual(n, 2)
         mock_logger.warning.assert_called_once()
-        call_args = " ".join(str(c) for c in mock_logger.warning.call_args[0])
+        fmt, *fmt_args = mock_logger.warning.call_args[0]
+        call_args = fmt % tuple(fmt_args)
         self.assertIn("2 matches", call_args)
         self.assertIn("expected at most one", call_args)
 
@@ -274,7 +453,6 @@ class TestVerifySourceUrlInDatalumos(unittest.TestCase):
 
     def setUp(self) -> None:
         """Set up test environment before each test."""
-        import sys
         self._original_argv = sys.argv.copy()
         sys.argv = ["test", "noop"]
         Args.initialize()
@@ -282,7 +460,6 @@ class TestVerifySourceUrlInDatalumos(unittest.TestCase):
 
     def tearDown(self) -> None:
         """Clean up after each test."""
-        import sys
         sys.argv = self._original_argv
 
     @patch("duplicate_checking.datalumos_search.sync_playwright")
@@ -388,14 +565,14 @@ class TestDatalumosSearchLive(unittest.TestCase):
     """
 
     def setUp(self) -> None:
-        import sys
+        """Initialize Args (noop module) and Logger, saving sys.argv."""
         self._original_argv = sys.argv.copy()
         sys.argv = ["test", "noop"]
         Args.initialize()
         Logger.initialize(log_level="INFO")
 
     def tearDown(self) -> None:
-        import sys
+        """Restore sys.argv."""
         sys.argv = self._original_argv
 
     def test_verify_cdc_url_exists_in_datalumos(self) -> None:
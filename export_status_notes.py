@@ -10,54 +10,152 @@ Usage:
 
 import argparse
 import csv
+import os
+import re
 import sqlite3
+from itertools import chain
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+# (drpid, source_url, title, data_type, url)
+ExportRow = Tuple[int, str, str, str, str]
+
+# "title -> data_type [url]": title runs to the first " -> "; then the first
+# whitespace-delimited token is data_type and the remainder is url.
+_LINE_RE = re.compile(r"(.*?)\s* -> \s*(\S*)\s*(.*)")
 
 
 def parse_status_notes_line(line: str) -> Tuple[str, str, str]:
     """
     Parse a single status_notes line into (title, data_type, url).
 
-    Format: "  title -> data_type" or "  title -> data_type https://url"
+    Format: "title -> data_type" or "title -> data_type https://url"
+
+    Precondition: `line` is already stripped (callers strip and skip blanks).
     """
-    line = line.strip()
-    if not line:
-        return ("", "", "")
-    if " -> " not in line:
+    m = _LINE_RE.match(line)
+    if m is None:
         return (line, "", "")
-    title, rest = line.split(" -> ", 1)
-    title = title.strip()
-    rest = rest.strip()
-    parts = rest.split(None, 1)
-    data_type = parts[0] if parts else ""
-    url = parts[1] if len(parts) > 1 else ""
-    return (title, data_type, url)
+    return (m.group(1), m.group(2), m.group(3))
+
+
+_BARE_404_SUFFIX = " -> 404"
+
+# data_type values whose lines are left out of the export.
+_SKIP_DATA_TYPES: frozenset[str] = frozenset({"404"})
+
+
+def _is_bare_404_line(line: str) -> bool:
+    """
+    True for the common "title -> 404" form, without parsing the line.
+
+    Only matches when the suffix holds the first " -> ", so the 404 really is
+    the data_type. Other 404 forms fall through to the full parse.
+    """
+    return line.endswith(_BARE_404_SUFFIX) and line.find(" -> ") == len(line) - len(_BARE_404_SUFFIX)
 
 
 def expand_status_notes_to_rows(
     drpid: int, source_url: str, status_notes: str
-) -> List[Tuple[int, str, str, str, str]]:
+) -> Iterator[ExportRow]:
     """
     Expand status_notes into one row per non-empty line.
 
-    Returns:
-        List of (drpid, source_url, title, data_type, url) tuples.
+    Skips blank lines, entries whose data_type is in _SKIP_DATA_TYPES, and URLs already seen for this project.
+
+    Yields:
+        (drpid, source_url, title, data_type, url) tuples.
     """
-    rows: List[Tuple[int, str, str, str, str]] = []
     seen_urls: set[str] = set()
     for line in status_notes.splitlines():
         line = line.strip()
-        if not line:
+        if not line or _is_bare_404_line(line):
             continue
         title, data_type, url = parse_status_notes_line(line)
-        if data_type == "404":
+        if data_type in _SKIP_DATA_TYPES:
             continue
         if url in seen_urls:
             continue
         seen_urls.add(url)
-        rows.append((drpid, source_url, title, data_type, url))
-    return rows
+        yield (drpid, source_url, title, data_type, url)
+
+
+# 1 MiB output buffer: csv.writer issues one write() per row.
+_CSV_BUFFER_SIZE = 1 << 20
+
+# One row per project with notes, in DRPID order; lines are split in Python
+# with str.splitlines, which handles LF, CRLF and lone CR alike.
+_SELECT_STATUS_NOTES_SQL = """
+SELECT DRPID, source_url, status_notes FROM projects
+WHERE status_notes IS NOT NULL AND status_notes != ''
+ORDER BY DRPID
+"""
+
+
+# Read-side tuning for the bulk scan. journal_mode/synchronous are left to the
+# pipeline's writer connection (Storage already runs in WAL mode).
+_READ_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _connect_readonly(db_path: Path) -> sqlite3.Connection:
+    """Open db_path read-only (URI mode=ro) with the bulk-read PRAGMAs applied."""
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    for pragma in _READ_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _select_status_notes(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    """
+    Return a cursor over (DRPID, source_url, status_notes) for every project with notes.
+
+    Rows are the connection's native tuples (no row_factory), unpacked directly.
+    """
+    return conn.execute(_SELECT_STATUS_NOTES_SQL)
+
+
+def write_status_notes_csv(
+    records: Iterable[Tuple[int, Optional[str], str]], output_path: Path
+) -> int:
+    """
+    Stream (DRPID, source_url, status_notes) records to a CSV, one row per kept line.
+
+    URL de-duplication is per project. Nothing is accumulated across projects.
+
+    Returns:
+        Number of data rows written (excluding the header).
+    """
+    count = 0
+
+    def counted(rows: Iterable[ExportRow]) -> Iterator[ExportRow]:
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write beside the target and swap in at the end so a failed export never
+    # leaves a truncated CSV in place.
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    try:
+        with open(
+            tmp_path, "w", newline="", encoding="utf-8-sig", buffering=_CSV_BUFFER_SIZE
+        ) as f:
+            writer = csv.writer(f)
+            writer.writerow(["DRPID", "source_url", "title", "data_type", "url"])
+            writer.writerows(counted(chain.from_iterable(
+                expand_status_notes_to_rows(drpid, source_url or "", status_notes)
+                for drpid, source_url, status_notes in records
+            )))
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return count
 
 
 def main() -> None:
@@ -81,32 +179,14 @@ def main() -> None:
         print(f"Database not found: {db_path}", file=__import__("sys").stderr)
         raise SystemExit(1)
 
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
-    cursor = conn.execute(
-        "SELECT DRPID, source_url, status_notes FROM projects "
-        "WHERE status_notes IS NOT NULL AND TRIM(status_notes) != '' "
-        "ORDER BY DRPID ASC"
-    )
-    records = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    all_rows: List[Tuple[int, str, str, str, str]] = []
-    for rec in records:
-        drpid = rec["DRPID"]
-        source_url = rec.get("source_url", "")
-        status_notes = rec.get("status_notes") or ""
-        rows = expand_status_notes_to_rows(drpid, source_url, status_notes)
-        all_rows.extend(rows)
-
     output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(output_path, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.writer(f)
-        writer.writerow(["DRPID", "source_url", "title", "data_type", "url"])
-        writer.writerows(all_rows)
+    conn = _connect_readonly(db_path)
+    try:
+        count = write_status_notes_csv(_select_status_notes(conn), output_path)
+    finally:
+        conn.close()
 
-    print(f"Exported {len(all_rows)} rows to {output_path}")
+    print(f"Exported {count} rows to {output_path}")
 
 
 if __name__ == "__main__":
@@ -4,6 +4,9 @@ Run the Interactive Collector web app when the package is executed with -m.
   python -m interactive_collector [--db-path ...] [--config ...]
 
 Uses Args like the rest of the pipeline; initializes Args and Logger when run standalone.
+Only argv normalization and Args/Logger setup run at import time; the Flask app
+(and every blueprint it registers) is imported only when the server is started,
+so --help and reloader re-imports do not load the web stack.
 """
 
 import sys
@@ -21,7 +24,13 @@ if not getattr(Args, "_initialized", False):
     Args.initialize()
     Logger.initialize(log_level=getattr(Args, "log_level", "WARNING"))
 
-from interactive_collector.app import app
 
-if __name__ == "__main__":
+def main() -> None:
+    """Import the Flask app and serve it on localhost:5000."""
+    from interactive_collector.app import app
+
     app.run(host="127.0.0.1", port=5000, debug=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,30 @@
 """
 Flask Blueprint for Interactive Collector JSON API.
 
-Serves the SPA with: projects, projects/load, scoreboard, save, download-file.
+Serves the SPA with: projects, projects/load, scoreboard, save, download-file,
+download-status.
+
+Modules needed by only one route (save/PDF generation, file download, HTML to
+markdown) are imported inside that route so importing the blueprint stays light.
 """
 
-import json
-import sys
+import functools
+import logging
+import os
+import zlib
 from pathlib import Path
-from typing import Any
+from types import SimpleNamespace
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
 
-from urllib.parse import unquote
+from urllib.parse import unquote, urlparse
 
-from flask import Blueprint, Response, request
+from flask import Blueprint, Response, current_app, request
 import requests
+from werkzeug.wsgi import ClosingIterator
 
-from interactive_collector.api_download import generate_download_progress
+from interactive_collector import api_proxy_cache
 from interactive_collector.api_projects import (
+    _ensure_storage,
     add_project_with_source_url,
     ensure_output_folder,
     folder_path_for_drpid,
@@ -23,30 +32,188 @@ from interactive_collector.api_projects import (
     get_next_eligible_after,
     get_project_by_drpid,
 )
-from interactive_collector.api_save import generate_save_progress, save_metadata
-from interactive_collector.api_scoreboard import add_download, add_to_scoreboard, clear_scoreboard, get_scoreboard_tree, get_scoreboard_urls
+from interactive_collector.api_scoreboard import (
+    add_download,
+    add_to_scoreboard,
+    clear_scoreboard,
+    get_scoreboard_snapshot,
+    scoreboard_etag,
+)
 from interactive_collector.collector_state import (
     get_metadata_from_page,
     get_result_by_drpid,
-    get_scoreboard,
     set_metadata_from_page,
 )
-from bs4 import BeautifulSoup
-from markdownify import markdownify as html_to_markdown
-
-from interactive_collector.html_table_expand import expand_tables_for_markdown
-from utils.file_utils import sanitize_filename
-from utils.url_utils import BROWSER_HEADERS, is_valid_url
+from storage import Storage
+from utils.file_utils import copy_stream_to_file, sanitize_filename
+from utils.url_utils import BROWSER_HEADERS, create_pooled_session, is_valid_url
 
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 
+_log = logging.getLogger(__name__)
+
+# Shared keep-alive pool for proxied asset fetches.
+_SESSION = create_pooled_session()
+
+# Chunk size for streaming /api/proxy bodies from upstream to the client.
+_PROXY_CHUNK_SIZE = 64 * 1024
+
+# Content types compressed with gzip for clients that accept it (prefix match).
+_GZIP_CONTENT_TYPES = ("text/", "application/json", "application/javascript", "application/xml")
+
+# Shared error responses (Flask serializes the dict without mutating it).
+_ERR_CURRENT_DRPID_REQUIRED = ({"error": "current_drpid required"}, 400)
+_ERR_INVALID_CURRENT_DRPID = ({"error": "Invalid current_drpid"}, 400)
+_ERR_PROJECT_NOT_FOUND = ({"error": "Project not found"}, 404)
+_ERR_DRPID_REQUIRED = ({"error": "drpid required"}, 400)
+_ERR_INVALID_DRPID = ({"error": "Invalid drpid"}, 400)
+_ERR_VALID_URL_REQUIRED = ({"error": "valid url required"}, 400)
+_ERR_INVALID_OR_MISSING_URL = ({"error": "Invalid or missing url"}, 400)
+_ERR_INVALID_SCOREBOARD_JSON = ({"error": "Invalid scoreboard_urls_json"}, 400)
+# Extension endpoints (lowercase messages).
+_ERR_EXT_INVALID_DRPID = ({"error": "invalid drpid"}, 400)
+_ERR_EXT_NO_OUTPUT_FOLDER = ({"error": "no output folder for project"}, 400)
+_ERR_EXT_OUTPUT_FOLDER_NOT_FOUND = ({"error": "output folder not found"}, 400)
+
+
+def _normalize(
+    data: Mapping[str, Any],
+    str_fields: Iterable[str] = (),
+    bool_fields: Iterable[str] = (),
+) -> SimpleNamespace:
+    """
+    Normalize request fields in one pass.
+
+    String fields become the stripped string, or None if missing/empty. Bool
+    fields are True for JSON true or the form value "1".
+    """
+    ns: dict[str, Any] = {}
+    for f in str_fields:
+        x = data.get(f)
+        s = "" if x is None else str(x).strip()
+        ns[f] = s or None
+    for f in bool_fields:
+        x = data.get(f)
+        ns[f] = x is True or x == "1"
+    return SimpleNamespace(**ns)
+
+
+# Project metadata fields posted by Save/Skip as metadata_<field>.
+_METADATA_FIELDS = ("title", "summary", "keywords", "agency", "office", "time_start", "time_end", "download_date")
+
+
+def _metadata_fields(data: Mapping[str, Any], prefix: str = "metadata_") -> dict[str, str]:
+    """Return {field: stripped value} for _METADATA_FIELDS read from data[prefix + field] ("" if missing)."""
+    out: dict[str, str] = {}
+    for f in _METADATA_FIELDS:
+        x = data.get(prefix + f)
+        out[f] = "" if x is None else str(x).strip()
+    return out
+
+
+def parse_body(
+    str_fields: Iterable[str] = (),
+    bool_fields: Iterable[str] = (),
+    required: Iterable[str] = (),
+    url_fields: Iterable[str] = (),
+    text_errors: bool = False,
+    metadata: bool = False,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorate a POST route to parse and validate its JSON or form body.
+
+    The body is normalized with _normalize and passed to the route as its first
+    argument; with metadata=True it also carries `metadata`, the
+    _metadata_fields of the body. Returns 400 before calling the route when a
+    `required` field is empty ("<field> required") or a `url_fields` value is
+    not a valid URL ("Invalid URL"). Errors are {"error": ...} JSON unless
+    text_errors is True.
+    """
+    str_fields, bool_fields, url_fields = tuple(str_fields), tuple(bool_fields), tuple(url_fields)
+
+    def error(msg: str) -> Any:
+        return (msg, 400) if text_errors else ({"error": msg}, 400)
+
+    required_errors = [(f, error(f"{f} required")) for f in required]
+    invalid_url = error("Invalid URL")
+
+    def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            data = request.get_json(silent=True) if request.is_json else request.form
+            ns = _normalize(data or {}, str_fields, bool_fields)
+            if metadata:
+                ns.metadata = _metadata_fields(data or {})
+            for f, missing in required_errors:
+                if not getattr(ns, f):
+                    return missing
+            for f in url_fields:
+                if not is_valid_url(getattr(ns, f)):
+                    return invalid_url
+            return fn(ns, *args, **kwargs)
+        return wrapper
+    return deco
+
+
+def _gzip_chunks(chunks: Iterable[bytes], sync_flush: bool = False) -> Iterator[bytes]:
+    """
+    Gzip-compress a byte stream on the fly.
+
+    With sync_flush each input chunk is flushed (Z_SYNC_FLUSH) so the client can
+    decode it immediately, as progress streams need.
+    """
+    comp = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        out = comp.compress(chunk)
+        if sync_flush:
+            out += comp.flush(zlib.Z_SYNC_FLUSH)
+        if out:
+            yield out
+    yield comp.flush()
+
+
+def _maybe_gzip(
+    chunks: Iterable[bytes],
+    content_type: str,
+    headers: dict[str, str],
+    sync_flush: bool = False,
+) -> Iterable[bytes]:
+    """
+    Return gzip-compressed chunks for text-like content when the client accepts gzip.
 
-def _str_or_none(x: Any) -> str | None:
-    """Return stripped string or None if missing/empty."""
-    if x is None:
-        return None
-    s = str(x).strip()
-    return s if s else None
+    Sets Content-Encoding (and Vary) in headers when compressing; otherwise
+    returns chunks unchanged. Must be called inside the request context.
+    """
+    headers["Vary"] = "Accept-Encoding"
+    if not content_type.startswith(_GZIP_CONTENT_TYPES) or "gzip" not in request.accept_encodings:
+        return chunks
+    headers["Content-Encoding"] = "gzip"
+    return _gzip_chunks(chunks, sync_flush=sync_flush)
+
+
+def _progress_response(lines: Iterable[str], echo: bool = True) -> Response:
+    """
+    Stream progress lines as an unbuffered text/plain response.
+
+    Lines are encoded to bytes here (gzip with a sync flush per line when the
+    client accepts it) and the response uses direct_passthrough, so Werkzeug
+    hands each chunk to the server as-is. With echo, each line is also logged
+    at DEBUG (no per-line stderr flush).
+    """
+    def stream() -> Iterator[bytes]:
+        for line in lines:
+            if echo:
+                _log.debug("progress: %s", line.rstrip("\n"))
+            yield line.encode("utf-8")
+
+    headers = {"X-Accel-Buffering": "no", "Cache-Control": "no-cache"}
+    body = _maybe_gzip(stream(), "text/plain", headers, sync_flush=True)
+    return Response(
+        body,
+        mimetype="text/plain; charset=utf-8",
+        headers=headers,
+        direct_passthrough=True,
+    )
 
 
 @api_bp.route("/projects/first", methods=["GET"])
@@ -75,11 +242,11 @@ def projects_next() -> Any:
     """
     current = request.args.get("current_drpid", "").strip()
     if not current:
-        return {"error": "current_drpid required"}, 400
+        return _ERR_CURRENT_DRPID_REQUIRED
     try:
         current_drpid = int(current)
     except ValueError:
-        return {"error": "Invalid current_drpid"}, 400
+        return _ERR_INVALID_CURRENT_DRPID
     proj = get_next_eligible_after(current_drpid)
     if not proj:
         return {"error": "No next project"}, 404
@@ -96,26 +263,20 @@ def projects_get(drpid: int) -> Any:
     """
     proj = get_project_by_drpid(drpid)
     if not proj:
-        return {"error": "Project not found"}, 404
+        return _ERR_PROJECT_NOT_FOUND
     return proj
 
 
 @api_bp.route("/projects/add", methods=["POST"])
-def projects_add() -> Any:
+@parse_body(str_fields=("source_url",), required=("source_url",))
+def projects_add(body: SimpleNamespace) -> Any:
     """
     Create a new project row (new DRPID) with source_url and status sourced.
 
     Expects JSON: { "source_url": "https://..." }.
     """
-    if request.is_json:
-        data = request.get_json() or {}
-    else:
-        data = {}
-    source_url = _str_or_none(data.get("source_url"))
-    if not source_url:
-        return {"error": "source_url required"}, 400
     try:
-        return add_project_with_source_url(source_url)
+        return add_project_with_source_url(body.source_url)
     except ValueError as e:
         msg = str(e)
         if msg == "duplicate_source_url":
@@ -140,7 +301,7 @@ def projects_load() -> Any:
         try:
             drpid = int(drpid_val)
         except (ValueError, TypeError):
-            return {"error": "Invalid drpid"}, 400
+            return _ERR_INVALID_DRPID
         proj = get_project_by_drpid(drpid)
     else:
         proj = get_first_eligible()
@@ -155,33 +316,32 @@ def projects_load() -> Any:
             delete_folder_on_load = raw.lower() not in ("0", "false", "no")
         else:
             delete_folder_on_load = bool(raw)
-    folder_path = ensure_output_folder(drpid, recreate=delete_folder_on_load)
+    folder_path = ensure_output_folder(drpid, recreate=delete_folder_on_load, record=proj)
     clear_scoreboard()
 
-    metadata = {
-        "title": (proj.get("title") or "").strip(),
-        "summary": (proj.get("summary") or "").strip(),
-        "keywords": (proj.get("keywords") or "").strip(),
-        "agency": (proj.get("agency") or "").strip(),
-        "office": (proj.get("office") or "").strip(),
-        "time_start": (proj.get("time_start") or "").strip(),
-        "time_end": (proj.get("time_end") or "").strip(),
-        "download_date": (proj.get("download_date") or "").strip(),
-    }
+    metadata = _metadata_fields(proj, prefix="")
     if not metadata["download_date"]:
         from datetime import date
         metadata["download_date"] = date.today().isoformat()
 
+    snap = get_scoreboard_snapshot()
     return {
         "DRPID": drpid,
         "source_url": source_url,
         "folder_path": folder_path,
-        "scoreboard": get_scoreboard_tree(),
-        "scoreboard_urls": get_scoreboard_urls(),
+        "scoreboard": snap["tree"],
+        "scoreboard_urls": snap["urls"],
         "metadata": metadata,
     }
 
 
+def _output_folder_for(drpid: int) -> Optional[str]:
+    """Return the project's recorded output folder, creating one if none is recorded yet."""
+    result = get_result_by_drpid().get(drpid)
+    folder_path_str = result.get("folder_path") if result else None
+    return folder_path_str or ensure_output_folder(drpid)
+
+
 def _unique_basename_for_folder(base: str, folder_path: Path, file_ext: str) -> str:
     """Return unique sanitized basename with extension (file_ext e.g. '.pdf', '.md')."""
     safe = sanitize_filename(base, max_length=80) if base else "page"
@@ -195,9 +355,15 @@ def _unique_basename_for_folder(base: str, folder_path: Path, file_ext: str) ->
                 safe = "page"
             low = safe.lower()
             break
+    # One directory listing instead of a stat per candidate; compared case-insensitively
+    # so Windows/macOS folders never get an existing file overwritten.
+    try:
+        existing = {name.lower() for name in os.listdir(folder_path)}
+    except OSError:
+        existing = set()
     for i in range(1000):
         name = f"{safe}{file_ext}" if i == 0 else f"{safe}_{i}{file_ext}"
-        if not (folder_path / name).exists():
+        if name.lower() not in existing:
             return name
     return f"{safe}_999{file_ext}"
 
@@ -213,14 +379,13 @@ def _basename_for_saved_page(page_title: str, url: str, *, default: str = "page"
     if title:
         return sanitize_filename(title, max_length=80) or default
 
-    from urllib.parse import urlparse
-
     parsed = urlparse(url)
-    path = (parsed.path or "").rstrip("/")
-    base = path.split("/")[-1] if path else (parsed.netloc or default).split(".")[0]
+    netloc_stem = (parsed.netloc or default).partition(".")[0] or default
+    path = parsed.path.rstrip("/")
+    base = path.rpartition("/")[2] if path else netloc_stem
     if not base or len(base) > 80:
-        base = (parsed.netloc or default).split(".")[0] or default
-    return sanitize_filename(base, max_length=80) if base else default
+        base = netloc_stem
+    return sanitize_filename(base, max_length=80) or default
 
 
 @api_bp.route("/extension/save-pdf", methods=["POST", "OPTIONS"])
@@ -244,25 +409,23 @@ def extension_save_pdf() -> Any:
     pdf_file = request.files.get("pdf")
 
     if not drpid_str:
-        return {"error": "drpid required"}, 400
+        return _ERR_DRPID_REQUIRED
     if not url or not is_valid_url(url):
-        return {"error": "valid url required"}, 400
+        return _ERR_VALID_URL_REQUIRED
     if not pdf_file:
         return {"error": "pdf file required"}, 400
     try:
         drpid = int(drpid_str)
     except (ValueError, TypeError):
-        return {"error": "invalid drpid"}, 400
+        return _ERR_EXT_INVALID_DRPID
 
-    folder_path_str = get_result_by_drpid().get(drpid, {}).get("folder_path")
-    if not folder_path_str:
-        folder_path_str = ensure_output_folder(drpid)
+    folder_path_str = _output_folder_for(drpid)
     if not folder_path_str:
-        return {"error": "no output folder for project"}, 400
+        return _ERR_EXT_NO_OUTPUT_FOLDER
 
     folder_path = Path(folder_path_str)
     if not folder_path.is_dir():
-        return {"error": "output folder not found"}, 400
+        return _ERR_EXT_OUTPUT_FOLDER_NOT_FOUND
 
     # Prefer page title from extension for a helpful filename; fallback to URL-derived base
     base = _basename_for_saved_page(page_title, url)
@@ -274,7 +437,7 @@ def extension_save_pdf() -> Any:
     dest = folder_path / basename
 
     try:
-        pdf_file.save(str(dest))
+        copy_stream_to_file(pdf_file.stream, dest)
     except OSError as e:
         return {"error": str(e)[:200]}, 500
 
@@ -291,6 +454,11 @@ def _page_html_to_markdown_document(html: str, page_url: str, page_title: str) -
 
     Returns ``(markdown_text, table_expand_ok, table_expand_fail)``.
     """
+    from bs4 import BeautifulSoup
+    from markdownify import markdownify as html_to_markdown
+
+    from interactive_collector.html_table_expand import expand_tables_for_markdown
+
     soup = BeautifulSoup(html or "", "html.parser")
     for tag in soup(["script", "style", "noscript"]):
         tag.decompose()
@@ -340,25 +508,23 @@ def extension_save_markdown() -> Any:
             pass
 
     if not drpid_str:
-        return {"error": "drpid required"}, 400
+        return _ERR_DRPID_REQUIRED
     if not url or not is_valid_url(url):
-        return {"error": "valid url required"}, 400
+        return _ERR_VALID_URL_REQUIRED
     if not html_raw:
         return {"error": "html required"}, 400
     try:
         drpid = int(drpid_str)
     except (ValueError, TypeError):
-        return {"error": "invalid drpid"}, 400
+        return _ERR_EXT_INVALID_DRPID
 
-    folder_path_str = get_result_by_drpid().get(drpid, {}).get("folder_path")
-    if not folder_path_str:
-        folder_path_str = ensure_output_folder(drpid)
+    folder_path_str = _output_folder_for(drpid)
     if not folder_path_str:
-        return {"error": "no output folder for project"}, 400
+        return _ERR_EXT_NO_OUTPUT_FOLDER
 
     folder_path = Path(folder_path_str)
     if not folder_path.is_dir():
-        return {"error": "output folder not found"}, 400
+        return _ERR_EXT_OUTPUT_FOLDER_NOT_FOUND
 
     base = _basename_for_saved_page(page_title, url)
     if not base:
@@ -388,59 +554,98 @@ def extension_save_markdown() -> Any:
     )
 
 
+def _proxy_headers(content_type: str) -> dict[str, str]:
+    """Response headers for a proxied resource."""
+    return {"Content-Type": content_type, "Access-Control-Allow-Origin": "*"}
+
+
+def _proxy_cached_response(entry: api_proxy_cache.ProxyCacheEntry) -> Response:
+    """Serve a proxied resource from the proxy cache."""
+    headers = _proxy_headers(entry.content_type)
+    body = _maybe_gzip([entry.body], entry.content_type, headers)
+    return Response(
+        body,
+        status=200,
+        headers=headers,
+        mimetype=entry.content_type,
+    )
+
+
 @api_bp.route("/proxy", methods=["GET"])
 def proxy_resource() -> Any:
     """
     Fetch an external URL and stream it back so the iframe can load CSS/JS/images
     from our origin (avoids CSP and cross-origin issues in srcdoc).
+
+    Small responses are kept in api_proxy_cache; fresh hits skip the network and
+    stale entries with an ETag are revalidated with If-None-Match.
     """
     raw = request.args.get("url", "").strip()
     url = unquote(raw) if raw else ""
     if not url or not is_valid_url(url):
-        return {"error": "Invalid or missing url"}, 400
+        return _ERR_INVALID_OR_MISSING_URL
+    cached = api_proxy_cache.lookup(url)
+    if cached is not None and cached.is_fresh():
+        return _proxy_cached_response(cached)
+    req_headers = BROWSER_HEADERS
+    if cached is not None and cached.etag:
+        req_headers = {**BROWSER_HEADERS, "If-None-Match": cached.etag}
+    try:
+        resp = _SESSION.get(url, headers=req_headers, timeout=30, stream=True)
+    except requests.RequestException as e:
+        return {"error": str(e)}, 502
+    ttl = api_proxy_cache.ttl_from_headers(resp.headers)
+    if resp.status_code == 304 and cached is not None:
+        resp.close()
+        refreshed = api_proxy_cache.refresh(url, ttl or 0.0)
+        return _proxy_cached_response(refreshed or cached)
     try:
-        resp = requests.get(url, headers=BROWSER_HEADERS, timeout=30)
         resp.raise_for_status()
     except requests.RequestException as e:
+        resp.close()
         return {"error": str(e)}, 502
     content_type = resp.headers.get("Content-Type") or "application/octet-stream"
     if ";" in content_type:
         content_type = content_type.split(";")[0].strip()
 
-    body = resp.content
-    headers = {
-        "Content-Type": content_type,
-        "Access-Control-Allow-Origin": "*",
-    }
-    return Response(body, status=200, headers=headers, mimetype=content_type)
+    chunks = resp.iter_content(chunk_size=_PROXY_CHUNK_SIZE)
+    if ttl:
+        chunks = api_proxy_cache.tee_into_cache(
+            url, chunks, content_type, resp.headers.get("ETag"), ttl
+        )
+    # Upstream Content-Length is not forwarded: iter_content decodes gzip/deflate,
+    # so the byte count sent can differ from the upstream header.
+    # direct_passthrough hands this iterable to the WSGI server as-is (Response
+    # close callbacks are skipped), so the iterable itself closes the upstream.
+    headers = _proxy_headers(content_type)
+    chunks = _maybe_gzip(chunks, content_type, headers)
+    return Response(
+        ClosingIterator(chunks, resp.close),
+        status=resp.status_code,
+        headers=headers,
+        mimetype=content_type,
+        direct_passthrough=True,
+    )
 
 
 @api_bp.route("/no-links", methods=["POST"])
-def no_links_route() -> Any:
+@parse_body(str_fields=("drpid",), required=("drpid",))
+def no_links_route(body: SimpleNamespace) -> Any:
     """
     Mark the current project (DRPID) as having no live links.
 
     Expects JSON/form: {drpid}.
     Updates Storage: status = 'no_links'.
     """
-    if request.is_json:
-        data = request.get_json() or {}
-    else:
-        data = {"drpid": (request.form.get("drpid") or "").strip()}
-    drpid_val = data.get("drpid")
-    if not drpid_val:
-        return {"error": "drpid required"}, 400
     try:
-        drpid = int(drpid_val)
+        drpid = int(body.drpid)
     except (ValueError, TypeError):
-        return {"error": "Invalid drpid"}, 400
-    from interactive_collector.api_projects import _ensure_storage
+        return _ERR_INVALID_DRPID
     _ensure_storage()
-    from storage import Storage
     try:
         Storage.update_record(drpid, {"status": "no_links"})
     except ValueError:
-        return {"error": "Project not found"}, 404
+        return _ERR_PROJECT_NOT_FOUND
     return {"ok": True}
 
 
@@ -463,10 +668,7 @@ def metadata_from_page_route() -> Any:
         "Access-Control-Allow-Private-Network": "true",
     }
     if request.method == "POST":
-        if request.is_json:
-            data = request.get_json() or {}
-        else:
-            data = {k: request.form.get(k) for k in ("drpid", "title", "summary", "keywords", "agency", "office", "time_start", "time_end", "download_date")}
+        data = (request.get_json(silent=True) if request.is_json else request.form) or {}
         drpid_val = data.get("drpid")
         if not drpid_val:
             return {"error": "drpid required"}, 400, cors_headers
@@ -474,11 +676,7 @@ def metadata_from_page_route() -> Any:
             drpid = int(drpid_val)
         except (ValueError, TypeError):
             return {"error": "Invalid drpid"}, 400, cors_headers
-        payload = {
-            k: (data.get(k) or "").strip()
-            for k in ("title", "summary", "keywords", "agency", "office", "time_start", "time_end", "download_date")
-        }
-        payload = {k: v for k, v in payload.items() if v}
+        payload = {k: v for k, v in _metadata_fields(data, prefix="").items() if v}
         set_metadata_from_page(drpid, payload)
         return {"ok": True}, 200, cors_headers
     # GET
@@ -511,9 +709,7 @@ def downloads_watcher_start() -> Any:
         drpid = int(drpid_val)
     except (ValueError, TypeError):
         return {"error": "Invalid drpid", "ok": False}, 400
-    folder_path_str = get_result_by_drpid().get(drpid, {}).get("folder_path")
-    if not folder_path_str:
-        folder_path_str = ensure_output_folder(drpid)
+    folder_path_str = _output_folder_for(drpid)
     if not folder_path_str:
         return {"error": "No output folder for project", "ok": False}, 400
     output_folder = Path(folder_path_str)
@@ -553,8 +749,18 @@ def downloads_watcher_status() -> Any:
 
 @api_bp.route("/scoreboard", methods=["GET"])
 def scoreboard_get() -> Any:
-    """Return the current scoreboard tree."""
-    return {"scoreboard": get_scoreboard_tree(), "urls": get_scoreboard_urls()}
+    """
+    Return the current scoreboard tree.
+
+    Responses carry an ETag that changes on every scoreboard mutation; a poll
+    with a matching If-None-Match gets an empty 304 instead of the tree.
+    """
+    etag = scoreboard_etag()
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+    if request.if_none_match.contains(etag):
+        return "", 304, headers
+    snap = get_scoreboard_snapshot()
+    return {"scoreboard": snap["tree"], "urls": snap["urls"]}, 200, headers
 
 
 @api_bp.route("/scoreboard/clear", methods=["POST"])
@@ -565,27 +771,16 @@ def scoreboard_clear() -> Any:
 
 
 @api_bp.route("/scoreboard/add", methods=["POST"])
-def scoreboard_add() -> Any:
+@parse_body(str_fields=("url", "referrer", "status_label"), required=("url",))
+def scoreboard_add(body: SimpleNamespace) -> Any:
     """
     Add a URL to the scoreboard.
 
     Expects JSON/form: {url, referrer?, status_label}.
     """
-    if request.is_json:
-        data = request.get_json() or {}
-    else:
-        data = {
-            "url": (request.form.get("url") or "").strip(),
-            "referrer": (request.form.get("referrer") or "").strip() or None,
-            "status_label": (request.form.get("status_label") or "OK").strip(),
-        }
-    url = _str_or_none(data.get("url")) or ""
-    if not url:
-        return {"error": "url required"}, 400
-    referrer = _str_or_none(data.get("referrer"))
-    status_label = _str_or_none(data.get("status_label")) or "OK"
-    add_to_scoreboard(url, referrer, status_label)
-    return {"scoreboard": get_scoreboard_tree(), "urls": get_scoreboard_urls()}
+    add_to_scoreboard(body.url, body.referrer, body.status_label or "OK")
+    snap = get_scoreboard_snapshot()
+    return {"scoreboard": snap["tree"], "urls": snap["urls"]}
 
 
 @api_bp.route("/save", methods=["POST"])
@@ -597,92 +792,60 @@ def save_route() -> Any:
     save_url (list of indices), metadata_*.
     Streams progress as text/plain (SAVING, DONE, ERROR).
     """
+    from interactive_collector.api_save import (
+        deferred_metadata_save,
+        generate_save_progress,
+        parse_save_indices,
+    )
+
     drpid_str = (request.form.get("drpid") or "").strip()
     folder_path_str = (request.form.get("folder_path") or "").strip()
     urls_json = (request.form.get("scoreboard_urls_json") or "[]").strip()
     indices = request.form.getlist("save_url")
 
-    # Save metadata once: after PDFs when we generate them, otherwise now.
-    will_generate_pdfs = bool(folder_path_str and indices)
-    metadata = {
-        "title": (request.form.get("metadata_title") or "").strip(),
-        "summary": (request.form.get("metadata_summary") or "").strip(),
-        "keywords": (request.form.get("metadata_keywords") or "").strip(),
-        "agency": (request.form.get("metadata_agency") or "").strip(),
-        "office": (request.form.get("metadata_office") or "").strip(),
-        "time_start": (request.form.get("metadata_time_start") or "").strip(),
-        "time_end": (request.form.get("metadata_time_end") or "").strip(),
-        "download_date": (request.form.get("metadata_download_date") or "").strip(),
-    }
-    if drpid_str and not will_generate_pdfs:
-        try:
-            drpid = int(drpid_str)
-            board = get_scoreboard()
-            notes_lines = [f"  {n.get('url', '')} -> {n.get('status_label', '')}" for n in board if n.get("url")]
-            status_notes = "\n".join(notes_lines) if notes_lines else None
-            save_metadata(
-                drpid,
-                folder_path_str,
-                title=metadata["title"],
-                summary=metadata["summary"],
-                keywords=metadata["keywords"],
-                agency=metadata["agency"],
-                office=metadata["office"],
-                time_start=metadata["time_start"],
-                time_end=metadata["time_end"],
-                download_date=metadata["download_date"],
-                status_notes=status_notes,
-            )
-        except (ValueError, TypeError):
-            pass
+    metadata = _metadata_fields(request.form)
+    try:
+        drpid = int(drpid_str) if drpid_str else None
+    except (ValueError, TypeError):
+        drpid = None
+    # Save metadata exactly once: now for a metadata-only save, else after the PDFs.
+    save_meta = deferred_metadata_save(drpid, folder_path_str, metadata) if drpid is not None else None
 
     if not folder_path_str or not indices:
+        if save_meta is not None:
+            try:
+                save_meta()
+            except ValueError:
+                pass
         # Metadata-only save: stream DONE so frontend can finish
-        def empty_stream():
-            yield "DONE\t0\n"
-
-        return Response(
-            empty_stream(),
-            mimetype="text/plain; charset=utf-8",
-            headers={"X-Accel-Buffering": "no", "Cache-Control": "no-cache"},
-        )
+        return _progress_response(["DONE\t0\n"], echo=False)
 
     try:
-        urls = json.loads(urls_json)
-    except json.JSONDecodeError:
-        return {"error": "Invalid scoreboard_urls_json"}, 400
+        urls = current_app.json.loads(urls_json)
+    except ValueError:
+        return _ERR_INVALID_SCOREBOARD_JSON
+    if not isinstance(urls, list):
+        return _ERR_INVALID_SCOREBOARD_JSON
 
     folder_path = Path(folder_path_str)
     if not folder_path.is_dir():
         return {"error": "Output folder not found"}, 400
 
-    try:
-        drpid_for_stats = int(drpid_str) if drpid_str else None
-    except (ValueError, TypeError):
-        drpid_for_stats = None
-
-    def stream() -> Any:
-        for line in generate_save_progress(
+    return _progress_response(
+        generate_save_progress(
             folder_path,
             urls,
-            indices,
-            drpid=drpid_for_stats,
-            folder_path_str=folder_path_str,
-            metadata=metadata if will_generate_pdfs and drpid_for_stats is not None else None,
-        ):
-            sys.stderr.write(line)
-            sys.stderr.flush()
-            yield line
-
-    return Response(
-        stream(),
-        mimetype="text/plain; charset=utf-8",
-        headers={"X-Accel-Buffering": "no", "Cache-Control": "no-cache"},
+            parse_save_indices(indices, len(urls)),
+            drpid=drpid,
+            metadata_title=metadata["title"],
+            on_done=save_meta,
+        )
     )
 
 
 @api_bp.route("/skip", methods=["POST"])
-def skip_route() -> Any:
+@parse_body(str_fields=("drpid", "reason", "skip_type", "folder_path"), metadata=True)
+def skip_route(body: SimpleNamespace) -> Any:
     """
     Update the project like Save but set status from skip_type or collector_hold reason.
 
@@ -691,37 +854,10 @@ def skip_route() -> Any:
     """
     _SKIP_TYPES = frozenset({"no dataset", "gigantic upload", "needs scripting"})
 
-    if request.is_json:
-        data = request.get_json() or {}
-        drpid_val = data.get("drpid")
-        reason = (data.get("reason") or "").strip()
-        skip_type = (data.get("skip_type") or "").strip().lower()
-        folder_path_str = (data.get("folder_path") or "").strip()
-        metadata = {
-            "title": (data.get("metadata_title") or "").strip(),
-            "summary": (data.get("metadata_summary") or "").strip(),
-            "keywords": (data.get("metadata_keywords") or "").strip(),
-            "agency": (data.get("metadata_agency") or "").strip(),
-            "office": (data.get("metadata_office") or "").strip(),
-            "time_start": (data.get("metadata_time_start") or "").strip(),
-            "time_end": (data.get("metadata_time_end") or "").strip(),
-            "download_date": (data.get("metadata_download_date") or "").strip(),
-        }
-    else:
-        drpid_val = (request.form.get("drpid") or "").strip()
-        reason = (request.form.get("reason") or "").strip()
-        skip_type = (request.form.get("skip_type") or "").strip().lower()
-        folder_path_str = (request.form.get("folder_path") or "").strip()
-        metadata = {
-            "title": (request.form.get("metadata_title") or "").strip(),
-            "summary": (request.form.get("metadata_summary") or "").strip(),
-            "keywords": (request.form.get("metadata_keywords") or "").strip(),
-            "agency": (request.form.get("metadata_agency") or "").strip(),
-            "office": (request.form.get("metadata_office") or "").strip(),
-            "time_start": (request.form.get("metadata_time_start") or "").strip(),
-            "time_end": (request.form.get("metadata_time_end") or "").strip(),
-            "download_date": (request.form.get("metadata_download_date") or "").strip(),
-        }
+    drpid_val = body.drpid
+    reason = body.reason or ""
+    skip_type = (body.skip_type or "").lower()
+    folder_path_str = body.folder_path or ""
     if skip_type and skip_type not in _SKIP_TYPES:
         return {"error": "invalid skip_type", "ok": False}, 400
     if not skip_type and not reason:
@@ -734,31 +870,20 @@ def skip_route() -> Any:
         drpid = int(drpid_val)
     except (ValueError, TypeError):
         return {"error": "Invalid drpid", "ok": False}, 400
-    from interactive_collector.api_projects import _ensure_storage
+    from interactive_collector.api_save import save_metadata, scoreboard_status_notes
 
     _ensure_storage()
     if not folder_path_str:
-        folder_path_str = get_result_by_drpid().get(drpid, {}).get("folder_path") or ""
-        if not folder_path_str:
-            folder_path_str = ensure_output_folder(drpid) or ""
-    board = get_scoreboard()
-    notes_lines = [f"  {n.get('url', '')} -> {n.get('status_label', '')}" for n in board if n.get("url")]
-    status_notes = "\n".join(notes_lines) if notes_lines else None
+        folder_path_str = _output_folder_for(drpid) or ""
+    status_notes = scoreboard_status_notes()
     status_override = skip_type if skip_type else f"collector_hold - {reason}"
     try:
         save_metadata(
             drpid,
             folder_path_str,
-            title=metadata["title"],
-            summary=metadata["summary"],
-            keywords=metadata["keywords"],
-            agency=metadata["agency"],
-            office=metadata["office"],
-            time_start=metadata["time_start"],
-            time_end=metadata["time_end"],
-            download_date=metadata["download_date"],
             status_notes=status_notes,
             status_override=status_override,
+            **body.metadata,
         )
         return {"ok": True}
     except (ValueError, RuntimeError) as e:
@@ -766,39 +891,51 @@ def skip_route() -> Any:
 
 
 @api_bp.route("/download-file", methods=["POST"])
-def download_file_route() -> Any:
+@parse_body(
+    str_fields=("url", "drpid", "referrer"),
+    bool_fields=("background",),
+    url_fields=("url",),
+    text_errors=True,
+)
+def download_file_route(body: SimpleNamespace) -> Any:
     """
     Download a non-HTML URL to the project output folder.
 
-    Expects form: url, drpid, referrer?.
-    Streams progress (SAVING, PROGRESS, DONE).
+    Expects form: url, drpid, referrer?, background?.
+    Streams progress (SAVING, PROGRESS, DONE). With background=1 the download
+    runs on a worker pool instead and 202 {job_id, poll} is returned; poll
+    GET /api/download-status/<job_id>.
     Creates output folder on demand if missing.
     """
-    url = (request.form.get("url") or "").strip()
-    drpid_str = (request.form.get("drpid") or "").strip()
-    referrer = (request.form.get("referrer") or "").strip() or None
 
-    if not url or not is_valid_url(url):
-        return "Invalid URL", 400
+    url, referrer = body.url, body.referrer
     try:
-        drpid = int(drpid_str)
+        drpid = int(body.drpid)
     except (ValueError, TypeError):
         return "Invalid DRPID", 400
 
-    folder_path = get_result_by_drpid().get(drpid, {}).get("folder_path")
-    if not folder_path:
-        folder_path = ensure_output_folder(drpid)
+    folder_path = _output_folder_for(drpid)
     if not folder_path:
         return "No output folder for this project", 400
 
-    def stream() -> Any:
-        for line in generate_download_progress(url, folder_path, drpid, referrer):
-            sys.stderr.write(line)
-            sys.stderr.flush()
-            yield line
+    if body.background:
+        from interactive_collector.api_download_jobs import start_download_job
+        job_id = start_download_job(url, folder_path, drpid, referrer)
+        return {"job_id": job_id, "poll": f"/api/download-status/{job_id}"}, 202
 
-    return Response(
-        stream(),
-        mimetype="text/plain; charset=utf-8",
-        headers={"X-Accel-Buffering": "no", "Cache-Control": "no-cache"},
-    )
+    from interactive_collector.api_download import generate_download_progress
+    return _progress_response(generate_download_progress(url, folder_path, drpid, referrer))
+
+
+@api_bp.route("/download-status/<job_id>", methods=["GET"])
+def download_status_route(job_id: str) -> Any:
+    """
+    Return {state, written, total, filename, error} for a background download.
+
+    A done or error status is returned once; later polls for that job get 404.
+    """
+    from interactive_collector.api_download_jobs import get_download_job
+    job = get_download_job(job_id)
+    if job is None:
+        return {"error": "Unknown job"}, 404
+    return job
@@ -6,16 +6,24 @@ to the project output folder and streams progress (SAVING, PROGRESS, DONE).
 Adds a download entry to the scoreboard on completion.
 """
 
+import functools
+import os
 from pathlib import Path
-from typing import Any, Dict, Generator, Optional
+from types import MappingProxyType
+from typing import Generator, Mapping, Optional, Tuple
+from urllib.parse import unquote, urlparse
 
 import requests
+import urllib3
+from werkzeug.http import parse_options_header
 
+from interactive_collector.api_scoreboard import add_download
+from interactive_collector.collector_state import get_result_by_drpid, state_lock
 from utils.file_utils import sanitize_filename
-from utils.url_utils import BROWSER_HEADERS, is_valid_url
+from utils.url_utils import BROWSER_HEADERS, create_pooled_session, is_valid_url
 
 # Content-Type to file extension (lowercase type -> extension with dot).
-_CONTENT_TYPE_EXT: Dict[str, str] = {
+_CONTENT_TYPE_EXT: Mapping[str, str] = MappingProxyType({
     "application/pdf": ".pdf",
     "text/csv": ".csv",
     "application/csv": ".csv",
@@ -31,66 +39,93 @@ _CONTENT_TYPE_EXT: Dict[str, str] = {
     "image/jpeg": ".jpg",
     "image/gif": ".gif",
     "image/webp": ".webp",
-}
+})
+
+# Shared keep-alive pool for file downloads.
+_SESSION = create_pooled_session()
 
 # Progress report interval for large file downloads (MB).
 _DOWNLOAD_PROGRESS_INTERVAL_MB = 50.0
 
+# Downloads with a known length at least this large are preallocated before writing.
+_PREALLOCATE_MIN_BYTES = 4 * 1024 * 1024
+
+
+@functools.lru_cache(maxsize=64)
+def _normalize_ct(content_type: str) -> str:
+    """Return the bare, lowercased media type of a Content-Type value (no parameters)."""
+    return content_type.split(";", 1)[0].strip().lower()
+
 
 def _extension_from_content_type(content_type: Optional[str]) -> str:
     """Return extension with leading dot from Content-Type, or empty string."""
-    if not content_type or ";" in content_type:
-        content_type = (content_type or "").split(";")[0].strip().lower()
-    return _CONTENT_TYPE_EXT.get(content_type, "")
+    return _CONTENT_TYPE_EXT.get(_normalize_ct(content_type or ""), "")
 
 
 def _filename_from_content_disposition(header_value: Optional[str]) -> Optional[str]:
-    """Extract filename from Content-Disposition header (filename= or filename*=)."""
+    """
+    Extract filename from Content-Disposition header (filename= or filename*=).
+
+    Werkzeug decodes RFC 2231/5987 filename*= values and prefers them over filename=.
+    """
     if not header_value:
         return None
-    if "filename*=" in header_value:
-        try:
-            part = header_value.split("filename*=")[-1].strip().strip(";")
-            if part.lower().startswith("utf-8''"):
-                from urllib.parse import unquote
-                return unquote(part[7:])
-            return part.strip("\"'")
-        except Exception:
-            pass
-    if "filename=" in header_value:
-        try:
-            part = header_value.split("filename=", 1)[-1].strip().strip(";").strip("\"'")
-            if part:
-                return part
-        except Exception:
-            pass
-    return None
+    _, params = parse_options_header(header_value)
+    return params.get("filename") or None
 
 
 def _filename_from_url(url: str) -> str:
     """Last path segment or 'download'."""
-    from urllib.parse import urlparse, unquote
     path = urlparse(url).path or ""
     name = (path.rstrip("/").split("/")[-1] or "download")
     return unquote(name)
 
 
-def _unique_download_basename(base: str, ext: str, used: Dict[str, int]) -> str:
-    """Return unique sanitized basename: base.ext or base_1.ext, etc."""
+def _download_basename(base: str, ext: str) -> str:
+    """Return sanitized basename base.ext (base defaults to 'download')."""
     if not base or base == "download":
         base = "download"
     base = sanitize_filename(base, max_length=80)
     if ext and not base.lower().endswith(ext.lower()):
         base = base + ext
-    key = base.lower()
-    n = used.get(key, 0)
-    used[key] = n + 1
-    if n == 0:
-        return base
-    if "." in base:
-        stem, suffix = base.rsplit(".", 1)
-        return f"{stem}_{n}.{suffix}"
-    return f"{base}_{n}"
+    return base
+
+
+def _create_unique_download_file(folder_path: Path, base: str, ext: str) -> Tuple[str, int]:
+    """
+    Create a new file base.ext (or base_1.ext, base_2.ext, ...) in folder_path.
+
+    Uses O_CREAT|O_EXCL so only names that collide are probed; the folder is
+    never listed. Returns (basename, fd) with fd open for binary writing.
+    """
+    name = _download_basename(base, ext)
+    stem, dot, suffix = name.rpartition(".")
+    if not dot:
+        stem, suffix = name, ""
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+    candidate, n = name, 0
+    while True:
+        try:
+            return candidate, os.open(folder_path / candidate, flags, 0o644)
+        except FileExistsError:
+            n += 1
+            candidate = f"{stem}_{n}{dot}{suffix}"
+
+
+def _preallocate(fd: int, size: Optional[int]) -> bool:
+    """
+    Reserve size bytes for a large download in one call (contiguous extents, less metadata churn).
+
+    Only used above _PREALLOCATE_MIN_BYTES; returns False where posix_fallocate is unavailable
+    (Windows, macOS) or the filesystem refuses it.
+    """
+    if size is None or size < _PREALLOCATE_MIN_BYTES or not hasattr(os, "posix_fallocate"):
+        return False
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError:
+        return False
+    return True
 
 
 def generate_download_progress(
@@ -105,21 +140,38 @@ def generate_download_progress(
     Yields: SAVING\\t{basename}\\n, PROGRESS\\t{written}\\t{total}\\n,
     then DONE\\t{basename}\\t{size}\\t{ext}\\n or ERROR\\t{msg}\\n.
     """
-    from interactive_collector.api_scoreboard import add_download
-    from interactive_collector.collector_state import get_result_by_drpid
-
     folder_path = Path(folder_path_str)
     if not folder_path.is_dir():
         yield "ERROR\tOutput folder not found\n"
         return
     try:
-        resp = requests.get(url, stream=True, headers=BROWSER_HEADERS, timeout=(30, 300))
+        resp = _SESSION.get(url, stream=True, headers=BROWSER_HEADERS, timeout=(30, 300))
+    except requests.RequestException as e:
+        yield f"ERROR\t{str(e)[:200]}\n"
+        return
+    # Closing returns the pooled connection on every exit, including an HTTP error,
+    # a failed write and a client disconnect (GeneratorExit).
+    try:
+        yield from _save_response(resp, url, folder_path, drpid, referrer)
+    finally:
+        resp.close()
+
+
+def _save_response(
+    resp: requests.Response,
+    url: str,
+    folder_path: Path,
+    drpid: int,
+    referrer: Optional[str],
+) -> Generator[str, None, None]:
+    """Write an open download response into folder_path, yielding the progress lines."""
+    try:
         resp.raise_for_status()
     except requests.RequestException as e:
         yield f"ERROR\t{str(e)[:200]}\n"
         return
 
-    content_type = (resp.headers.get("Content-Type") or "").split(";")[0].strip()
+    content_type = _normalize_ct(resp.headers.get("Content-Type") or "")
     content_disp = resp.headers.get("Content-Disposition")
     content_length: Optional[int] = None
     try:
@@ -148,20 +200,31 @@ def generate_download_progress(
         if not ext:
             ext = ""
 
-    used: Dict[str, int] = {p.name.lower(): 1 for p in folder_path.iterdir() if p.is_file()}
-    basename = _unique_download_basename(base, ext, used)
+    try:
+        basename, fd = _create_unique_download_file(folder_path, base, ext)
+    except OSError as e:
+        yield f"ERROR\t{str(e)[:200]}\n"
+        return
     dest = folder_path / basename
 
     yield f"SAVING\t{basename}\n"
     chunk_size = 1024 * 1024  # 1 MB
     written = 0
     last_yield_mb = 0.0
+    # Read decoded 1 MiB blocks straight from urllib3 (no iter_content generator)
+    # and write them unbuffered: the block size already matches the write size.
+    raw = resp.raw
+    raw.decode_content = True
+    preallocated = _preallocate(fd, content_length) if not resp.headers.get("Content-Encoding") else False
     try:
-        with open(dest, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=chunk_size):
+        with os.fdopen(fd, "wb", buffering=0) as f:
+            while True:
+                chunk = raw.read(chunk_size)
                 if not chunk:
                     break
-                f.write(chunk)
+                view = memoryview(chunk)
+                while view:  # unbuffered writes may be short
+                    view = view[f.write(view):]
                 written += len(chunk)
                 mb = written / (1024 * 1024)
                 if (mb - last_yield_mb) >= _DOWNLOAD_PROGRESS_INTERVAL_MB or (
@@ -170,18 +233,25 @@ def generate_download_progress(
                     last_yield_mb = mb
                     total_str = str(content_length) if content_length is not None else ""
                     yield f"PROGRESS\t{written}\t{total_str}\n"
-    except OSError as e:
+            if preallocated and written != content_length:
+                f.truncate(written)  # short body: drop the reserved tail
+    except (OSError, urllib3.exceptions.HTTPError) as e:
+        # Remove the partial (possibly preallocated, zero-tailed) file rather than
+        # leave something that looks like a complete download.
+        dest.unlink(missing_ok=True)
         yield f"ERROR\t{str(e)[:200]}\n"
         return
 
     ext_display = ext.lstrip(".")
+    # Record before DONE so a client that sees DONE also sees the scoreboard entry.
+    # Also runs on background pool threads (api_download_jobs).
+    with state_lock():
+        get_result_by_drpid().setdefault(drpid, {}).setdefault("downloads", []).append({
+            "url": url,
+            "path": str(dest),
+            "size": written,
+            "extension": ext_display,
+            "filename": basename,
+        })
+        add_download(url, referrer, str(dest), written, ext_display, filename=basename)
     yield f"DONE\t{basename}\t{written}\t{ext_display}\n"
-
-    get_result_by_drpid().setdefault(drpid, {}).setdefault("downloads", []).append({
-        "url": url,
-        "path": str(dest),
-        "size": written,
-        "extension": ext_display,
-        "filename": basename,
-    })
-    add_download(url, referrer, str(dest), written, ext_display, filename=basename)
@@ -0,0 +1,109 @@
+"""
+Background file downloads for the Interactive Collector API.
+
+Serves: POST /api/download-file with background=1, GET /api/download-status/<job_id>.
+Runs generate_download_progress on a bounded thread pool so a multi-MB download
+does not hold a Flask request thread; progress lines are folded into a per-job
+status dict that clients poll. A finished job is dropped on the first poll that
+reports it done or failed; finished jobs nobody polls expire after
+_FINISHED_JOB_TTL_S.
+
+State is process-local; it does not persist across server restarts.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from interactive_collector.api_download import generate_download_progress
+
+_DOWNLOAD_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="collector-download")
+
+# job_id -> {state, written, total, filename, error}. state: queued, saving, done, error.
+_jobs: Dict[str, Dict[str, Any]] = {}
+# job_id -> time.monotonic() when its worker finished; only for jobs still in _jobs.
+_finished_at: Dict[str, float] = {}
+_jobs_lock = threading.Lock()
+
+_TERMINAL_STATES = frozenset({"done", "error"})
+
+# Finished jobs that are never polled are dropped after this many seconds.
+_FINISHED_JOB_TTL_S = 15 * 60
+
+
+def _apply_progress_line(job: Dict[str, Any], line: str) -> None:
+    """Update job status from one SAVING/PROGRESS/DONE/ERROR progress line."""
+    kind, _, rest = line.rstrip("\n").partition("\t")
+    fields = rest.split("\t")
+    if kind == "SAVING":
+        job.update(state="saving", filename=fields[0])
+    elif kind == "PROGRESS":
+        job["written"] = int(fields[0])
+        job["total"] = int(fields[1]) if len(fields) > 1 and fields[1] else None
+    elif kind == "DONE":
+        job.update(state="done", filename=fields[0], written=int(fields[1]))
+    elif kind == "ERROR":
+        job.update(state="error", error=rest)
+
+
+def _run_download_job(
+    job_id: str,
+    url: str,
+    folder_path_str: str,
+    drpid: int,
+    referrer: Optional[str],
+) -> None:
+    """Run one download on a pool thread, recording progress in _jobs[job_id]."""
+    try:
+        for line in generate_download_progress(url, folder_path_str, drpid, referrer):
+            with _jobs_lock:
+                _apply_progress_line(_jobs[job_id], line)
+    except Exception as e:
+        with _jobs_lock:
+            _jobs[job_id].update(state="error", error=str(e)[:200])
+    finally:
+        with _jobs_lock:
+            if job_id in _jobs:  # not already evicted by a poll
+                _finished_at[job_id] = time.monotonic()
+
+
+def _prune_finished_jobs() -> None:
+    """Drop finished jobs older than _FINISHED_JOB_TTL_S. Caller holds _jobs_lock."""
+    cutoff = time.monotonic() - _FINISHED_JOB_TTL_S
+    for job_id in [j for j, t in _finished_at.items() if t < cutoff]:
+        del _finished_at[job_id]
+        _jobs.pop(job_id, None)
+
+
+def start_download_job(
+    url: str,
+    folder_path_str: str,
+    drpid: int,
+    referrer: Optional[str],
+) -> str:
+    """Queue a download on the background pool and return its job id."""
+    job_id = uuid.uuid4().hex
+    with _jobs_lock:
+        _prune_finished_jobs()
+        _jobs[job_id] = {"state": "queued", "written": 0, "total": None, "filename": None, "error": None}
+    _DOWNLOAD_POOL.submit(_run_download_job, job_id, url, folder_path_str, drpid, referrer)
+    return job_id
+
+
+def get_download_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Return a copy of the job status, or None if the job id is unknown.
+
+    A done or failed job is removed once returned, so each finished status is
+    reported to exactly one poll.
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+        if job["state"] in _TERMINAL_STATES:
+            del _jobs[job_id]
+            _finished_at.pop(job_id, None)
+        return dict(job)
@@ -8,10 +8,13 @@ keepalives that do not appear in the log. Stderr still receives raw log lines on
 so the Flask terminal matches the SPA without blank keepalive lines.
 
 Subprocess stdout is read as binary with an incremental UTF-8 decoder so Windows pipes do not
-drop or merge lines the way text-mode iteration can.
+drop or merge lines the way text-mode iteration can. Reads are large (``os.read`` up to 64 KiB)
+and every complete line in a read is forwarded as one ``{"line": ...}`` record, so chatty
+modules cost one queue hand-off, stderr write and WSGI yield per read rather than per line.
 """
 
 import codecs
+import functools
 import json
 import os
 import queue
@@ -19,7 +22,8 @@ import subprocess
 import sys
 import threading
 from pathlib import Path
-from typing import Any, Generator, Optional
+from types import MappingProxyType
+from typing import Any, Generator, Mapping, Optional
 
 from flask import Blueprint, Response, current_app, request, stream_with_context
 
@@ -28,8 +32,13 @@ _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 _MAIN_PY = _PROJECT_ROOT / "main.py"
 _STOP_FILE = _PROJECT_ROOT / ".drp_pipeline_stop"
 
+# Max bytes per read from the subprocess pipe
+_READ_CHUNK_BYTES = 65536
+# Seconds a terminated run gets to exit before it is killed
+_TERMINATE_GRACE_SEC = 3.0
+
 # Current run (so POST /stop can terminate it)
-_current_proc: Optional[subprocess.Popen[str]] = None
+_current_proc: Optional[subprocess.Popen[bytes]] = None
 
 pipeline_bp = Blueprint("pipeline", __name__, url_prefix="/api/pipeline")
 
@@ -44,10 +53,50 @@ def _normalize_log_line(s: str) -> str:
     return s.replace("\r\n", "\n").replace("\r", "\n")
 
 
-def _modules() -> dict[str, dict[str, Any]]:
-    """Return the MODULES registry from the orchestrator."""
+def _kill_after(proc: "subprocess.Popen[bytes]", grace_sec: float) -> None:
+    """Wait up to grace_sec for proc to exit, then kill it."""
+    try:
+        proc.wait(grace_sec)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def _terminate(proc: "subprocess.Popen[bytes]") -> None:
+    """
+    Send SIGTERM to proc and kill it if it has not exited after _TERMINATE_GRACE_SEC.
+
+    The escalation runs on a daemon thread so the caller (a request thread) returns at once.
+    """
+    proc.terminate()
+    threading.Thread(
+        target=_kill_after, args=(proc, _TERMINATE_GRACE_SEC), daemon=True
+    ).start()
+
+
+def _split_complete_lines(text: str) -> tuple[str, str]:
+    """
+    Split text into (complete lines, trailing partial line).
+
+    The first part ends with a newline (or is empty) and is CRLF-normalized;
+    the second is carried over until the rest of its line arrives.
+    """
+    idx = text.rfind("\n")
+    if idx < 0:
+        return "", text
+    return _normalize_log_line(text[: idx + 1]), text[idx + 1 :]
+
+
+@functools.lru_cache(maxsize=1)
+def _modules() -> Mapping[str, dict[str, Any]]:
+    """Return a read-only view of the orchestrator's static MODULES registry (imported once)."""
     from orchestration.Orchestrator import MODULES
-    return dict(MODULES)
+    return MappingProxyType(MODULES)
+
+
+@functools.lru_cache(maxsize=1)
+def _module_names() -> tuple[str, ...]:
+    """Module names for the UI in MODULES order, without noop."""
+    return tuple(m for m in _modules() if m != "noop")
 
 
 @pipeline_bp.route("/modules", methods=["GET"])
@@ -58,9 +107,7 @@ def list_modules() -> Any:
     Returns:
         JSON: { "modules": ["noop", "sourcing", "collector", ...] }
     """
-    # Preserve MODULES order (no noop in list for UI)
-    mods = [m for m in _modules().keys() if m != "noop"]
-    return {"modules": mods}
+    return {"modules": list(_module_names())}
 
 
 def _log(msg: str) -> None:
@@ -160,7 +207,11 @@ def run_module() -> Any:
                 pass
             env = os.environ.copy()
             env["DRP_STOP_FILE"] = str(_STOP_FILE)
+            # Logger writes to stdout, which Python block-buffers on a pipe; stay unbuffered so
+            # lines arrive live (the reader already coalesces bursts into large reads).
             env["PYTHONUNBUFFERED"] = "1"
+            # Match the reader's UTF-8 decoder regardless of the platform's locale encoding.
+            env["PYTHONIOENCODING"] = "utf-8"
             proc = subprocess.Popen(
                 argv,
                 cwd=str(_PROJECT_ROOT),
@@ -176,18 +227,16 @@ def run_module() -> Any:
 
             def reader() -> None:
                 decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                fd = proc.stdout.fileno()
                 remainder = ""
                 try:
                     while True:
-                        raw = proc.stdout.read(8192)
+                        raw = os.read(fd, _READ_CHUNK_BYTES)
                         if raw == b"":
                             break
-                        remainder += decoder.decode(raw)
-                        while "\n" in remainder:
-                            idx = remainder.index("\n")
-                            line = _normalize_log_line(remainder[: idx + 1])
-                            remainder = remainder[idx + 1 :]
-                            out_queue.put(line)
+                        lines, remainder = _split_complete_lines(remainder + decoder.decode(raw))
+                        if lines:
+                            out_queue.put(lines)
                     remainder += decoder.decode(b"", final=True)
                     if remainder:
                         tail = (
@@ -236,7 +285,7 @@ def run_module() -> Any:
                 except OSError:
                     pass
             if proc is not None and proc.poll() is None:
-                proc.terminate()
+                _terminate(proc)
 
     return Response(
         stream_with_context(stream()),
@@ -251,13 +300,15 @@ def stop_run() -> Any:
     Request the current pipeline run to stop.
 
     Writes the stop file (so the orchestrator's inner loop can exit cleanly)
-    and terminates the subprocess so work halts promptly.
+    and terminates the subprocess so work halts promptly, killing it if it
+    has not exited after a short grace period.
     """
     global _current_proc
     try:
         _STOP_FILE.touch()
     except OSError:
         pass
-    if _current_proc is not None and _current_proc.poll() is None:
-        _current_proc.terminate()
+    proc = _current_proc
+    if proc is not None and proc.poll() is None:
+        _terminate(proc)
     return {"ok": True}
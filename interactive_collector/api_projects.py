@@ -6,24 +6,35 @@ Provides project listing, next-eligible lookup, and output folder creation
 for the Interactive Collector SPA.
 """
 
+import shutil
 import sqlite3
+import threading
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from storage import Storage
+from utils.file_utils import create_output_folder
 from utils.url_utils import is_valid_url
 
 from interactive_collector.collector_state import get_base_output_dir, get_db_path, get_result_by_drpid
 
 
+_storage_init_lock = threading.Lock()
+
+
 def _ensure_storage() -> None:
     """
     Initialize Storage if not already, using Args.db_path or default.
     Ensures Logger is initialized first. Idempotent.
+
+    Checks Storage's own initialized flag rather than probing with a query, so
+    requests after the first do no database work here.
     """
-    from storage import Storage
-    try:
-        Storage.list_eligible_projects(None, 0)
-    except RuntimeError:
+    if Storage.is_initialized():
+        return
+    with _storage_init_lock:
+        if Storage.is_initialized():
+            return
         try:
             from utils.Logger import Logger
             if not getattr(Logger, "_initialized", False):
@@ -42,7 +53,6 @@ def get_first_eligible() -> Optional[Dict[str, Any]]:
         Project dict with DPRID, source_url, etc., or None.
     """
     _ensure_storage()
-    from storage import Storage
     projects = Storage.list_eligible_projects("sourced", 1)
     return projects[0] if projects else None
 
@@ -58,12 +68,9 @@ def get_next_eligible_after(current_drpid: int) -> Optional[Dict[str, Any]]:
         Next project dict or None.
     """
     _ensure_storage()
-    from storage import Storage
-    projects = Storage.list_eligible_projects("sourced", 200)
-    for proj in projects:
-        if proj["DRPID"] > current_drpid:
-            return proj
-    return None
+    # DRPID filter runs in SQL (status index + rowid range), so any DRPID is reachable
+    projects = Storage.list_eligible_projects("sourced", 1, min_drpid=current_drpid + 1)
+    return projects[0] if projects else None
 
 
 def get_project_by_drpid(drpid: int) -> Optional[Dict[str, Any]]:
@@ -77,11 +84,15 @@ def get_project_by_drpid(drpid: int) -> Optional[Dict[str, Any]]:
         Project dict or None.
     """
     _ensure_storage()
-    from storage import Storage
     return Storage.get(drpid)
 
 
-def ensure_output_folder(drpid: int, *, recreate: bool = False) -> Optional[str]:
+def ensure_output_folder(
+    drpid: int,
+    *,
+    recreate: bool = False,
+    record: Optional[Dict[str, Any]] = None,
+) -> Optional[str]:
     """
     Create or resolve the output folder for this DRPID; store in result state.
 
@@ -93,49 +104,38 @@ def ensure_output_folder(drpid: int, *, recreate: bool = False) -> Optional[str]
     Args:
         drpid: Project identifier.
         recreate: When True, empty the folder before use.
+        record: The project's Storage record when the caller already has it;
+            fetched from Storage when None.
 
     Returns:
         folder_path string or None if creation failed.
     """
-    import shutil
-
-    from utils.file_utils import create_output_folder
-
     result = get_result_by_drpid()
     if recreate:
         result.pop(drpid, None)
 
-    _ensure_storage()
-    from storage import Storage
-
-    record = Storage.get(drpid) or {}
+    if record is None:
+        _ensure_storage()
+        record = Storage.get(drpid) or {}
     stored = (record.get("folder_path") or "").strip()
 
+    folder_path: Optional[Path]
     if stored:
         folder_path = Path(stored)
-        if not recreate and folder_path.is_dir():
-            path_str = str(folder_path)
-            result[drpid] = {"folder_path": path_str}
-            return path_str
-        if recreate and folder_path.exists():
-            try:
-                shutil.rmtree(folder_path)
-            except OSError:
-                return None
         try:
-            folder_path.mkdir(parents=True, exist_ok=True)
+            if recreate and folder_path.exists():
+                shutil.rmtree(folder_path)
+            if recreate or not folder_path.is_dir():
+                folder_path.mkdir(parents=True, exist_ok=True)
         except OSError:
             return None
-        path_str = str(folder_path)
-        result[drpid] = {"folder_path": path_str}
-        return path_str
+    else:
+        folder_path = create_output_folder(get_base_output_dir(), drpid, recreate=recreate)
+        if not folder_path:
+            return None
 
-    base_path = get_base_output_dir()
-    folder_path = create_output_folder(base_path, drpid, recreate=recreate)
-    if not folder_path:
-        return None
     path_str = str(folder_path)
-    result[drpid] = {"folder_path": path_str}
+    result.setdefault(drpid, {})["folder_path"] = path_str
     return path_str
 
 
@@ -159,14 +159,14 @@ def add_project_with_source_url(source_url: str) -> Dict[str, Any]:
         raise ValueError("valid source_url is required")
 
     _ensure_storage()
-    from storage import Storage
-
+    # Insert and status update commit together, so a row is never left without a status
     try:
-        drpid = Storage.create_record(url)
+        with Storage.transaction():
+            drpid = Storage.create_record(url)
+            Storage.update_record(drpid, {"status": "sourced"})
     except sqlite3.IntegrityError as e:
         raise ValueError("duplicate_source_url") from e
 
-    Storage.update_record(drpid, {"status": "sourced"})
     rec = Storage.get(drpid) or {}
     stored_url = (rec.get("source_url") or url).strip()
     return {"DRPID": drpid, "source_url": stored_url}
@@ -0,0 +1,120 @@
+"""
+In-process cache for /api/proxy responses.
+
+Iframe reloads re-request the same third-party CSS/JS/images through the proxy.
+Small successful responses are kept in a bounded LRU keyed by URL with a TTL
+taken from Cache-Control max-age (default 5 minutes). Expired entries that
+carry an ETag stay in the LRU so the next fetch can revalidate them with
+If-None-Match; a 304 refreshes the entry instead of re-downloading it.
+
+State is process-local and shared by request threads (guarded by a lock).
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Iterator, Mapping, NamedTuple, Optional
+
+MAX_ENTRIES = 512
+DEFAULT_TTL_SEC = 300.0
+MAX_BODY_BYTES = 2 * 1024 * 1024
+
+_MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+class ProxyCacheEntry(NamedTuple):
+    """Cached proxy response body and validators."""
+
+    body: bytes
+    content_type: str
+    etag: Optional[str]
+    expires_at: float
+
+    def is_fresh(self) -> bool:
+        """True while the entry is within its TTL."""
+        return time.monotonic() < self.expires_at
+
+
+_entries: "OrderedDict[str, ProxyCacheEntry]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def ttl_from_headers(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Return the cache TTL in seconds for a response, or None if it must not be cached.
+
+    Cache-Control no-store disables caching; max-age sets the TTL; otherwise
+    DEFAULT_TTL_SEC is used.
+    """
+    cache_control = headers.get("Cache-Control") or ""
+    if "no-store" in cache_control.lower():
+        return None
+    m = _MAX_AGE_RE.search(cache_control)
+    return float(m.group(1)) if m else DEFAULT_TTL_SEC
+
+
+def lookup(url: str) -> Optional[ProxyCacheEntry]:
+    """Return the entry for url (fresh or stale) and mark it recently used, or None."""
+    with _lock:
+        entry = _entries.get(url)
+        if entry is not None:
+            _entries.move_to_end(url)
+        return entry
+
+
+def store(url: str, body: bytes, content_type: str, etag: Optional[str], ttl: float) -> None:
+    """Cache body for url for ttl seconds, evicting the least recently used entries."""
+    if len(body) > MAX_BODY_BYTES:
+        return
+    entry = ProxyCacheEntry(body, content_type, etag, time.monotonic() + ttl)
+    with _lock:
+        _entries[url] = entry
+        _entries.move_to_end(url)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def refresh(url: str, ttl: float) -> Optional[ProxyCacheEntry]:
+    """Extend the entry for url by ttl seconds (after a 304); return it, or None if gone."""
+    with _lock:
+        entry = _entries.get(url)
+        if entry is None:
+            return None
+        entry = entry._replace(expires_at=time.monotonic() + ttl)
+        _entries[url] = entry
+        _entries.move_to_end(url)
+        return entry
+
+
+def tee_into_cache(
+    url: str,
+    chunks: Iterable[bytes],
+    content_type: str,
+    etag: Optional[str],
+    ttl: float,
+) -> Iterator[bytes]:
+    """
+    Yield chunks unchanged while buffering them; cache the body once fully read.
+
+    Buffering stops (and nothing is cached) once the body exceeds MAX_BODY_BYTES
+    or the stream ends early.
+    """
+    parts: Optional[list[bytes]] = []
+    size = 0
+    for chunk in chunks:
+        if parts is not None:
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                parts = None
+            else:
+                parts.append(chunk)
+        yield chunk
+    if parts is not None:
+        store(url, b"".join(parts), content_type, etag, ttl)
+
+
+def clear() -> None:
+    """Drop all cached entries."""
+    with _lock:
+        _entries.clear()
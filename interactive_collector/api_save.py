@@ -7,17 +7,22 @@ Streams progress as SAVING, DONE, ERROR lines. Yields comment lines (#) as
 heartbeats during long operations so the connection is not dropped by timeouts.
 """
 
+import asyncio
 import json
 import os
 import queue
 import threading
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional, Tuple
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
 
+from storage import Storage
 from utils.file_utils import folder_extensions_and_size, format_file_size, sanitize_filename
 from utils.url_utils import is_valid_url
 
-from interactive_collector.pdf_utils import page_title_or_h1, unique_pdf_basename
+from interactive_collector.api_projects import _ensure_storage
+from interactive_collector.collector_state import get_pdf_profile_dir, get_scoreboard
+from interactive_collector.pdf_utils import async_page_title_or_h1, unique_pdf_basename
 
 
 def save_metadata(
@@ -45,11 +50,7 @@ def save_metadata(
         download_date: When data was downloaded.
         status_override: If set, use instead of default "collected" (e.g. "collector_hold - reason").
     """
-    from interactive_collector.api_projects import _ensure_storage
-
     _ensure_storage()
-    from storage import Storage
-
     values: Dict[str, Any] = {
         "status": (status_override or "collected").strip() or "collected",
         "errors": None,
@@ -85,116 +86,251 @@ def save_metadata(
         raise
 
 
+def scoreboard_status_notes() -> Optional[str]:
+    """Return status_notes text ("  url -> status" per scoreboard entry), or None if empty."""
+    notes_lines = [f"  {n.get('url', '')} -> {n.get('status_label', '')}" for n in get_scoreboard() if n.get("url")]
+    return "\n".join(notes_lines) if notes_lines else None
+
+
+def deferred_metadata_save(drpid: int, folder_path_str: str, metadata: Dict[str, str]) -> Callable[[], None]:
+    """
+    Return a callable that performs the one metadata save for a /save request.
+
+    metadata holds the save_metadata text fields (title, summary, ...). Status notes and
+    folder stats are read when the callable runs, so it can be invoked now (metadata-only
+    save) or after PDF generation without a second Storage write.
+    """
+
+    def save() -> None:
+        save_metadata(drpid, folder_path_str, status_notes=scoreboard_status_notes(), **metadata)
+
+    return save
+
+
 # PDF generation: use "commit" so we only wait for the navigation to commit (response received).
 # Some pages never fire domcontentloaded in headless (e.g. FDA REMS); commit avoids that.
 # Default is headed (visible browser); set DRP_PDF_HEADLESS=1 to run headless.
 _PDF_NAVIGATION_WAIT = "commit"
 _PDF_NAVIGATION_TIMEOUT_MS = 30000  # commit is fast; this covers slow servers only
-_PDF_SETTLE_MS = 5000  # initial pause after commit
-_PDF_WAIT_FOR_CONTENT_MS = 35000  # wait for load event; then print
+_PDF_WAIT_FOR_CONTENT_MS = 35000  # wait for load event
+_PDF_NETWORK_IDLE_MS = 8000  # then for late XHR-rendered content to settle; print either way
 
 
 def _pdf_headless() -> bool:
     """False = headed (default, visible browser); True only when DRP_PDF_HEADLESS=1 (or true, etc.)."""
     v = (os.environ.get("DRP_PDF_HEADLESS") or "").strip().lower()
     return v in ("1", "true", "yes", "on")
+
+
+# Audio/video never appear in a printed page; with DRP_PDF_LEAN=1 images, fonts and CSS are
+# skipped too (faster load events, but plain-looking PDFs).
+_PDF_BLOCKED_RESOURCE_TYPES = frozenset({"media"})
+_PDF_LEAN_BLOCKED_RESOURCE_TYPES = frozenset({"media", "image", "font", "stylesheet"})
+
+
+def _pdf_blocked_resource_types() -> frozenset[str]:
+    """Resource types aborted during PDF navigation; the lean set when DRP_PDF_LEAN=1 (or true, etc.)."""
+    v = (os.environ.get("DRP_PDF_LEAN") or "").strip().lower()
+    return _PDF_LEAN_BLOCKED_RESOURCE_TYPES if v in ("1", "true", "yes", "on") else _PDF_BLOCKED_RESOURCE_TYPES
+
+
 _PDF_PRINT_TIMEOUT_MS = 90000
+_PDF_CONCURRENCY = 4  # pages printing at once; most of each URL is spent waiting on timers
 _HEARTBEAT_INTERVAL = 15.0  # seconds; yield a comment line so connection is not dropped
 
 
+def _url_host(url: str) -> str:
+    """Lowercased hostname of url, or "" if it has none or cannot be parsed."""
+    try:
+        return urlparse(url).hostname or ""
+    except ValueError:
+        return ""
+
+
+def parse_save_indices(values: Iterable[str], url_count: int) -> List[int]:
+    """
+    Convert posted save_url values to scoreboard indices, once, before the worker runs.
+
+    Keeps submission order; drops non-integers, out-of-range indices and repeats.
+    """
+    seen: set[int] = set()
+    indices: List[int] = []
+    for value in values:
+        try:
+            idx = int(value)
+        except (TypeError, ValueError):
+            continue
+        if 0 <= idx < url_count and idx not in seen:
+            seen.add(idx)
+            indices.append(idx)
+    return indices
+
+
 def _run_pdf_worker(
     folder_path: Path,
     urls: List[str],
-    indices: List[str],
+    indices: List[int],
     progress_queue: "queue.Queue[Tuple[str, ...]]",
     *,
     source_url: str = "",
     metadata_title: str = "",
 ) -> None:
     """Run Playwright PDF generation and put progress items on the queue."""
-    from playwright.sync_api import sync_playwright
+    saved: List[str] = []
+    try:
+        asyncio.run(
+            _save_pdfs(
+                folder_path,
+                urls,
+                indices,
+                progress_queue,
+                saved,
+                source_url=source_url,
+                metadata_title=metadata_title,
+            )
+        )
+    except Exception as e:
+        msg = str(e).strip() or type(e).__name__
+        progress_queue.put(("ERROR", msg[:200]))
+    progress_queue.put(("DONE", str(len(saved))))
+
+
+async def _open_pdf_context(p: Any) -> Tuple[Any, Any]:
+    """
+    Return (context, browser) for PDF printing; browser is None for the persistent profile.
+
+    Prefers a persistent Chromium profile (get_pdf_profile_dir) so the HTTP cache, cookies
+    and HSTS state carry over between saves. Chromium allows one process per profile, so
+    when it is locked by a concurrent save (or cannot be created) a throwaway browser is used.
+    """
+    profile_dir = get_pdf_profile_dir()
+    try:
+        context = await p.chromium.launch_persistent_context(str(profile_dir), headless=_pdf_headless())
+        return context, None
+    except Exception:
+        browser = await p.chromium.launch(headless=_pdf_headless())
+        return await browser.new_context(), browser
+
+
+async def _save_pdfs(
+    folder_path: Path,
+    urls: List[str],
+    indices: List[int],
+    progress_queue: "queue.Queue[Tuple[str, ...]]",
+    saved: List[str],
+    *,
+    source_url: str,
+    metadata_title: str,
+) -> None:
+    """
+    Print the selected URLs to PDF, up to _PDF_CONCURRENCY at a time, appending names to saved.
+
+    Uses async Playwright (sync Playwright objects cannot be shared across threads) with
+    one browser context. Each worker keeps one page for all of its URLs (goto replaces
+    the document) and only opens a new page after a URL fails, in case the failure left
+    the page unusable. Basenames are reserved between awaits, so concurrent pages with
+    the same title still get distinct files.
+    """
+    from playwright.async_api import async_playwright
 
     total = len(indices)
-    saved: List[str] = []
+    # Visit same-host URLs back to back so the context's DNS/TLS/HTTP connections are reused.
+    # The sort is stable (submission order within a host) and each job keeps its submitted position.
+    jobs = iter(sorted(enumerate(indices, 1), key=lambda job: _url_host(urls[job[1]])))
     used_basenames: Dict[str, int] = {}
+    # Listed once; unique_pdf_basename checks and extends it instead of a stat per candidate.
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=_pdf_headless())
-            for current, idx_str in enumerate(indices, 1):
+        existing_names = {name.lower() for name in os.listdir(folder_path)}
+    except OSError:
+        existing_names = set()
+
+    async def print_pdf(page: Any, url: str) -> str:
+        await page.goto(url, wait_until=_PDF_NAVIGATION_WAIT, timeout=_PDF_NAVIGATION_TIMEOUT_MS)
+        # Wait on page events rather than fixed sleeps, so fast pages print at once: the load
+        # event (JS-rendered content and <title>, e.g. FDA REMS), then network idle, each capped.
+        for state, timeout_ms in (("load", _PDF_WAIT_FOR_CONTENT_MS), ("networkidle", _PDF_NETWORK_IDLE_MS)):
+            try:
+                await page.wait_for_load_state(state, timeout=timeout_ms)
+            except Exception:
+                pass
+        if source_url and url.strip() == source_url.strip() and metadata_title.strip():
+            base = sanitize_filename(metadata_title.strip(), max_length=80) or "page"
+        else:
+            base = await async_page_title_or_h1(page, url)
+        pdf_name = unique_pdf_basename(base or "page", used_basenames, existing=existing_names)
+        await page.pdf(path=str(folder_path / pdf_name), print_background=True)
+        return pdf_name
+
+    async def worker(context: Any) -> None:
+        page = None
+        try:
+            # jobs is shared: each worker takes the next URL when its page is free.
+            for current, idx in jobs:
+                url = urls[idx]
+                if not url or not is_valid_url(url):
+                    continue
+                progress_queue.put(("SAVING", url, str(current), str(total)))
                 try:
-                    idx = int(idx_str)
-                    if idx < 0 or idx >= len(urls):
-                        continue
-                    url = urls[idx]
-                    if not url or not is_valid_url(url):
-                        continue
-                    progress_queue.put(("SAVING", url, str(current), str(total)))
-                    page = browser.new_page()
-                    try:
+                    if page is None:
+                        page = await context.new_page()
                         page.set_default_timeout(_PDF_PRINT_TIMEOUT_MS)
-                        page.goto(
-                            url,
-                            wait_until=_PDF_NAVIGATION_WAIT,
-                            timeout=_PDF_NAVIGATION_TIMEOUT_MS,
-                        )
-                        page.wait_for_timeout(_PDF_SETTLE_MS)
-                        # Wait for load event so JS-rendered content and <title> are ready (e.g. FDA REMS)
+                    saved.append(await print_pdf(page, url))
+                except Exception as e:
+                    msg = str(e).strip() or type(e).__name__
+                    progress_queue.put(("ERROR", msg[:200]))
+                    if page is not None:
                         try:
-                            page.wait_for_load_state("load", timeout=_PDF_WAIT_FOR_CONTENT_MS)
+                            await page.close()
                         except Exception:
                             pass
-                        page.wait_for_timeout(2000)  # extra for post-load paint
-                        if (
-                            source_url
-                            and url.strip() == source_url.strip()
-                            and metadata_title.strip()
-                        ):
-                            base = sanitize_filename(metadata_title.strip(), max_length=80) or "page"
-                        else:
-                            base = page_title_or_h1(page, url)
-                        if not base:
-                            base = "page"
-                        pdf_name = unique_pdf_basename(base, used_basenames, folder_path)
-                        pdf_path = folder_path / pdf_name
-                        page.pdf(path=str(pdf_path), print_background=True)
-                        saved.append(pdf_name)
-                    finally:
-                        page.close()
-                except (ValueError, Exception) as e:
-                    msg = str(e).strip() or type(e).__name__
-                    progress_queue.put(("ERROR", msg[:200]))
-            browser.close()
-    except Exception as e:
-        msg = str(e).strip() or type(e).__name__
-        progress_queue.put(("ERROR", msg[:200]))
-    progress_queue.put(("DONE", str(len(saved))))
+                        page = None
+        finally:
+            if page is not None:
+                await page.close()
+
+    blocked_types = _pdf_blocked_resource_types()
+
+    async def block_unprinted_resources(route: Any) -> None:
+        if route.request.resource_type in blocked_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async with async_playwright() as p:
+        context, browser = await _open_pdf_context(p)
+        try:
+            await context.route("**/*", block_unprinted_resources)
+            await asyncio.gather(*(worker(context) for _ in range(min(_PDF_CONCURRENCY, total))))
+        finally:
+            await context.close()
+            if browser is not None:
+                await browser.close()
 
 
 def generate_save_progress(
     folder_path: Path,
     urls: List[str],
-    indices: List[str],
+    indices: List[int],
     *,
     drpid: int | None = None,
-    folder_path_str: str = "",
-    metadata: Dict[str, str] | None = None,
+    metadata_title: str = "",
+    on_done: Callable[[], None] | None = None,
 ) -> Generator[str, None, None]:
     """
     Generator that yields progress lines for the PDF save operation.
 
+    indices are scoreboard positions already validated by parse_save_indices.
+
     Yields: SAVING\\t{url}\\t{current}\\t{total}\\n then DONE\\t{count}\\n or ERROR\\t{msg}\\n.
     Yields #\\n as a heartbeat during long operations so the connection is not dropped.
 
-    If drpid, folder_path_str, and metadata are provided, saves metadata (including folder
-    stats) to Storage after PDFs are written, so one save happens after the folder is final.
+    on_done (e.g. from deferred_metadata_save) runs once after PDFs are written and before
+    DONE is yielded, so the single metadata save sees the final folder.
     """
     progress_queue: queue.Queue[Tuple[str, ...]] = queue.Queue()
     source_url = ""
-    metadata_title = (metadata or {}).get("title", "") if metadata else ""
     if drpid is not None:
         try:
-            from storage import Storage
-
             record = Storage.get(drpid) or {}
             source_url = (record.get("source_url") or "").strip()
         except Exception:
@@ -209,35 +345,28 @@ def generate_save_progress(
     done_sent = False
     while not done_sent:
         try:
-            item = progress_queue.get(timeout=_HEARTBEAT_INTERVAL)
+            items = [progress_queue.get(timeout=_HEARTBEAT_INTERVAL)]
         except queue.Empty:
             yield "#\n"
             continue
-        kind = item[0]
-        if kind == "SAVING":
-            yield f"SAVING\t{item[1]}\t{item[2]}\t{item[3]}\n"
-        elif kind == "ERROR":
-            yield f"ERROR\t{item[1]}\n"
-        elif kind == "DONE":
-            done_sent = True
-            worker.join(timeout=1.0)
-            if drpid is not None and folder_path_str and metadata:
-                from interactive_collector.collector_state import get_scoreboard
-
-                board = get_scoreboard()
-                notes_lines = [f"  {n.get('url', '')} -> {n.get('status_label', '')}" for n in board if n.get("url")]
-                status_notes = "\n".join(notes_lines) if notes_lines else None
-                save_metadata(
-                    drpid,
-                    folder_path_str,
-                    title=metadata.get("title", ""),
-                    summary=metadata.get("summary", ""),
-                    keywords=metadata.get("keywords", ""),
-                    agency=metadata.get("agency", ""),
-                    office=metadata.get("office", ""),
-                    time_start=metadata.get("time_start", ""),
-                    time_end=metadata.get("time_end", ""),
-                    download_date=metadata.get("download_date", ""),
-                    status_notes=status_notes,
-                )
-            yield f"DONE\t{item[1]}\n"
+        # Concurrent pages report in bursts: drain what has already arrived and send it as one chunk.
+        while True:
+            try:
+                items.append(progress_queue.get_nowait())
+            except queue.Empty:
+                break
+        lines: List[str] = []
+        for item in items:
+            kind = item[0]
+            if kind == "SAVING":
+                lines.append(f"SAVING\t{item[1]}\t{item[2]}\t{item[3]}\n")
+            elif kind == "ERROR":
+                lines.append(f"ERROR\t{item[1]}\n")
+            elif kind == "DONE":
+                done_sent = True
+                worker.join(timeout=1.0)
+                if on_done is not None:
+                    on_done()
+                lines.append(f"DONE\t{item[1]}\n")
+                break
+        yield "".join(lines)
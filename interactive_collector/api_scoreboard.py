@@ -1,14 +1,25 @@
 """
 API module for scoreboard operations.
 
-Serves: GET /api/scoreboard, POST /api/scoreboard/add.
+Serves: GET /api/scoreboard (conditional on ETag), POST /api/scoreboard/add.
 The scoreboard tracks visited URLs and their status (OK, 404, DL).
 Tree structure supports parent-child relationships via referrer for display.
 """
 
+import uuid
 from typing import Any, Dict, List, Optional
 
-from interactive_collector.collector_state import get_scoreboard
+from interactive_collector.collector_state import (
+    bump_scoreboard_version,
+    get_scoreboard,
+    get_scoreboard_version,
+    reset_scoreboard,
+    scoreboard_url_index,
+    state_lock,
+)
+
+# Distinguishes this process's versions from a previous server run's.
+_ETAG_PREFIX = uuid.uuid4().hex[:8]
 
 
 def add_to_scoreboard(
@@ -29,16 +40,16 @@ def add_to_scoreboard(
         status_label: "OK", "404", etc.
         title: Optional page title for display.
     """
-    board = get_scoreboard()
-    existing_urls = {n["url"] for n in board}
-    is_dupe = url in existing_urls
-    board.append({
-        "url": url,
-        "referrer": referrer,
-        "status_label": status_label,
-        "is_dupe": is_dupe,
-        "title": (title or "").strip() or None,
-    })
+    with state_lock():
+        is_dupe = url in scoreboard_url_index()
+        get_scoreboard().append({
+            "url": url,
+            "referrer": referrer,
+            "status_label": status_label,
+            "is_dupe": is_dupe,
+            "title": (title or "").strip() or None,
+        })
+        bump_scoreboard_version()
 
 
 def add_download(
@@ -60,23 +71,71 @@ def add_download(
         extension: File extension (e.g. "pdf").
         filename: Display filename.
     """
-    board = get_scoreboard()
-    board.append({
-        "url": url,
-        "referrer": referrer,
-        "status_label": "DL",
-        "is_dupe": False,
-        "is_download": True,
-        "file_path": file_path,
-        "file_size": file_size,
-        "extension": extension or "",
-        "filename": filename or "",
-    })
+    with state_lock():
+        get_scoreboard().append({
+            "url": url,
+            "referrer": referrer,
+            "status_label": "DL",
+            "is_dupe": False,
+            "is_download": True,
+            "file_path": file_path,
+            "file_size": file_size,
+            "extension": extension or "",
+            "filename": filename or "",
+        })
+        bump_scoreboard_version()
 
 
 def clear_scoreboard() -> None:
     """Clear the scoreboard (e.g. on initial source load)."""
-    get_scoreboard().clear()
+    reset_scoreboard()
+
+
+def scoreboard_etag() -> str:
+    """Return an opaque (unquoted) ETag for the current scoreboard contents."""
+    return f"sb-{_ETAG_PREFIX}-{get_scoreboard_version()}"
+
+
+def _node_for_entry(i: int, n: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the display node for scoreboard entry n at index i."""
+    return {
+        "url": n["url"],
+        "referrer": n["referrer"],
+        "status_label": n["status_label"],
+        "is_dupe": n.get("is_dupe", False),
+        "idx": i,
+        "children": [],
+        "is_download": n.get("is_download", False),
+        "file_path": n.get("file_path"),
+        "file_size": n.get("file_size", 0),
+        "extension": n.get("extension", ""),
+        "filename": n.get("filename", ""),
+        "title": n.get("title") or None,
+    }
+
+
+def get_scoreboard_snapshot() -> Dict[str, Any]:
+    """
+    Return both the scoreboard tree and the flat URL list from one pass.
+
+    Returns:
+        {"tree": same as get_scoreboard_tree(), "urls": same as get_scoreboard_urls()}.
+    """
+    # Held throughout: background downloads append, and a reset clears the index.
+    with state_lock():
+        board = get_scoreboard()
+        first_idx = scoreboard_url_index()
+        nodes = [_node_for_entry(i, n) for i, n in enumerate(board)]
+        urls = [node["url"] for node in nodes]
+        roots = []
+        for node in nodes:
+            ref = node["referrer"]
+            parent = first_idx.get(ref) if ref else None
+            if parent is None:
+                roots.append(node)
+            else:
+                nodes[parent]["children"].append(node)
+    return {"tree": roots, "urls": urls}
 
 
 def get_scoreboard_tree() -> List[Dict[str, Any]]:
@@ -86,41 +145,15 @@ def get_scoreboard_tree() -> List[Dict[str, Any]]:
     One node per entry; dupes shown separately. Nodes have: url, referrer,
     status_label, is_dupe, idx, children, is_download, file_path, etc.
     """
-    board = get_scoreboard()
-    nodes = [
-        {
-            "url": n["url"],
-            "referrer": n["referrer"],
-            "status_label": n["status_label"],
-            "is_dupe": n.get("is_dupe", False),
-            "idx": i,
-            "children": [],
-            "is_download": n.get("is_download", False),
-            "file_path": n.get("file_path"),
-            "file_size": n.get("file_size", 0),
-            "extension": n.get("extension", ""),
-            "filename": n.get("filename", ""),
-            "title": n.get("title") or None,
-        }
-        for i, n in enumerate(board)
-    ]
-    url_to_first_idx: Dict[str, int] = {}
-    for i, n in enumerate(nodes):
-        if n["url"] not in url_to_first_idx:
-            url_to_first_idx[n["url"]] = i
-    for n in nodes:
-        ref = n["referrer"]
-        if ref and ref in url_to_first_idx:
-            nodes[url_to_first_idx[ref]]["children"].append(n)
-    roots = [n for n in nodes if n["referrer"] is None or n["referrer"] not in url_to_first_idx]
-    return roots
+    return get_scoreboard_snapshot()["tree"]
 
 
 def get_scoreboard_urls() -> List[str]:
     """Return flat list of URLs in scoreboard order (for save indices)."""
-    return [n["url"] for n in get_scoreboard()]
+    with state_lock():
+        return [n["url"] for n in get_scoreboard()]
 
 
 def has_url(url: str) -> bool:
     """Return True if url is already in the scoreboard."""
-    return any(n["url"] == url for n in get_scoreboard())
+    return url in scoreboard_url_index()
@@ -19,18 +19,27 @@ import logging
 import os
 import re
 import sys
+import threading
+from collections import OrderedDict
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
 from urllib.parse import quote, urljoin
 
 import requests
 from flask import Flask, Response, redirect, request, render_template_string, send_from_directory, url_for
 
+from interactive_collector.api_projects import _ensure_storage as _ensure_storage_once
+from interactive_collector.api_projects import ensure_output_folder as _ensure_output_folder
 from interactive_collector.collector_state import get_result_by_drpid as _get_result_by_drpid
+from interactive_collector.collector_state import bump_scoreboard_version as _bump_scoreboard_version
+from interactive_collector.collector_state import reset_scoreboard as _reset_scoreboard
+from interactive_collector.collector_state import scoreboard_url_index as _scoreboard_url_index
 from interactive_collector.collector_state import get_scoreboard as _get_scoreboard
+from storage import Storage
 from utils.Args import Args
-from utils.file_utils import create_output_folder, sanitize_filename
+from utils.file_utils import sanitize_filename
 from utils.url_utils import (
     body_looks_like_html,
     body_looks_like_xml,
@@ -38,6 +47,7 @@ from utils.url_utils import (
     is_non_html_response,
     is_valid_url,
     is_displayable_content_type,
+    is_catalog_url,
     resolve_catalog_resource_url,
     BROWSER_HEADERS,
 )
@@ -50,6 +60,8 @@ if not getattr(Args, "_initialized", False):
 
 app = Flask(__name__)
 app.config["MAX_CONTENT_LENGTH"] = 100 * 1024 * 1024  # 100MB for extension PDF uploads
+from interactive_collector.json_provider import install_json_provider
+install_json_provider(app)
 # Register API blueprints for SPA.
 from interactive_collector.api import api_bp
 from interactive_collector.api_chat import chat_bp
@@ -78,11 +90,6 @@ logging.getLogger("werkzeug").addFilter(_QuietRequestLogFilter())
 _scoreboard = _get_scoreboard()
 _result_by_drpid = _get_result_by_drpid()
 
-# Default DB path when not set by orchestrator (standalone run).
-DEFAULT_DB_PATH = "drp_pipeline.db"
-# Default base output dir when not set by orchestrator (Windows).
-DEFAULT_BASE_OUTPUT_DIR = r"C:\Documents\DataRescue\DRPData"
-
 # Content-Type to file extension for downloads (lowercase type -> extension with dot).
 _CONTENT_TYPE_EXT: Dict[str, str] = {
     "application/pdf": ".pdf",
@@ -103,53 +110,18 @@ _CONTENT_TYPE_EXT: Dict[str, str] = {
 }
 
 
-def _get_db_path() -> Path:
-    """Return db path from Args (when pipeline has initialized it) or default."""
-    try:
-        from utils.Args import Args
-        if getattr(Args, "_initialized", False):
-            return Path(Args.db_path)
-    except Exception:
-        pass
-    return Path(DEFAULT_DB_PATH)
-
-
-def _get_base_output_dir() -> Path:
-    """Return base output dir from Args (when pipeline has initialized it) or default."""
-    try:
-        from utils.Args import Args
-        if getattr(Args, "_initialized", False):
-            return Path(Args.base_output_dir)
-    except Exception:
-        pass
-    return Path(DEFAULT_BASE_OUTPUT_DIR)
-
-
 def _ensure_storage(flask_app: Flask) -> None:
     """
     Initialize Storage if not already, using Args.db_path or default.
     Ensures Logger is initialized first (Storage implementations use Logger).
-    Idempotent; safe to call on every request that needs Storage.
+    Idempotent; safe to call on every request that needs Storage (no query once initialized).
     """
-    from storage import Storage
-    try:
-        Storage.list_eligible_projects(None, 0)
-    except RuntimeError:
-        # Logger is used by StorageSQLLite; initialize if not already (e.g. standalone run)
-        try:
-            from utils.Logger import Logger
-            if not getattr(Logger, "_initialized", False):
-                Logger.initialize(log_level="WARNING")
-        except Exception:
-            pass
-        path = _get_db_path()
-        Storage.initialize("StorageSQLLite", db_path=path)
+    _ensure_storage_once()
 
 
 def _get_first_eligible(flask_app: Flask) -> Optional[Dict[str, Any]]:
     """Return the first eligible project (prereq=sourcing, no errors) or None."""
     _ensure_storage(flask_app)
-    from storage import Storage
     projects = Storage.list_eligible_projects("sourced", 1)
     return projects[0] if projects else None
 
@@ -157,19 +129,13 @@ def _get_first_eligible(flask_app: Flask) -> Optional[Dict[str, Any]]:
 def _get_next_eligible_after(flask_app: Flask, current_drpid: int) -> Optional[Dict[str, Any]]:
     """Return the next eligible project after current_drpid, or None."""
     _ensure_storage(flask_app)
-    from storage import Storage
-    # Fetch a chunk and find first with DRPID > current_drpid
-    projects = Storage.list_eligible_projects("sourced", 200)
-    for proj in projects:
-        if proj["DRPID"] > current_drpid:
-            return proj
-    return None
+    projects = Storage.list_eligible_projects("sourced", 1, min_drpid=current_drpid + 1)
+    return projects[0] if projects else None
 
 
 def _get_project_by_drpid(flask_app: Flask, drpid: int) -> Optional[Dict[str, Any]]:
     """Return the project record for the given DRPID, or None."""
     _ensure_storage(flask_app)
-    from storage import Storage
     return Storage.get(drpid)
 
 
@@ -185,45 +151,11 @@ def _ensure_output_folder_for_drpid(
     Defaults to preserving an existing folder; pass ``recreate=True`` to empty first.
     Returns folder_path string or None if creation failed.
     """
-    import shutil
+    return _ensure_output_folder(drpid, recreate=recreate)
 
-    from utils.file_utils import create_output_folder
 
-    if recreate:
-        _result_by_drpid.pop(drpid, None)
-
-    _ensure_storage(flask_app)
-    from storage import Storage
-
-    record = Storage.get(drpid) or {}
-    stored = (record.get("folder_path") or "").strip()
-
-    if stored:
-        folder_path = Path(stored)
-        if not recreate and folder_path.is_dir():
-            path_str = str(folder_path)
-            _result_by_drpid[drpid] = {"folder_path": path_str}
-            return path_str
-        if recreate and folder_path.exists():
-            try:
-                shutil.rmtree(folder_path)
-            except OSError:
-                return None
-        try:
-            folder_path.mkdir(parents=True, exist_ok=True)
-        except OSError:
-            return None
-        path_str = str(folder_path)
-        _result_by_drpid[drpid] = {"folder_path": path_str}
-        return path_str
-
-    base_path = _get_base_output_dir()
-    folder_path = create_output_folder(base_path, drpid, recreate=recreate)
-    if not folder_path:
-        return None
-    path_str = str(folder_path)
-    _result_by_drpid[drpid] = {"folder_path": path_str}
-    return path_str
+_YEAR_ONLY_RE = re.compile(r"^\d{4}$")
+_YMD_PREFIX_RE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})")
 
 
 def _normalize_date_yyyy_mm_dd(s: str) -> Optional[str]:
@@ -231,9 +163,9 @@ def _normalize_date_yyyy_mm_dd(s: str) -> Optional[str]:
     s = (s or "").strip()
     if not s:
         return None
-    if re.match(r"^\d{4}$", s):
+    if _YEAR_ONLY_RE.match(s):
         return f"{s}-01-01"
-    m = re.match(r"^(\d{4})-(\d{1,2})-(\d{1,2})", s)
+    m = _YMD_PREFIX_RE.match(s)
     if m:
         try:
             y, mo, d = int(m.group(1)), int(m.group(2)), int(m.group(3))
@@ -963,9 +895,15 @@ def _base_url_for_page(page_url: str) -> str:
     return urljoin(page_url + "/", "..")
 
 
-def _inject_base_into_html(html_body: str, page_url: str) -> str:
+_HEAD_OPEN_RE = re.compile(r"<head[^>]*>", re.IGNORECASE)
+# First <head ...> or <html ...> tag; group 1 is set when it is <head>
+_HEAD_OR_HTML_OPEN_RE = re.compile(r"<h(?:(ead)|tml)[^>]*>", re.IGNORECASE)
+_A_HREF_RE = re.compile(r"<a\s+([^>]*?)href\s*=\s*([\"'])([^\"']*)\2([^>]*)>", re.IGNORECASE)
+
+
+def _base_tag_splice(html_body: str, page_url: str) -> tuple[int, str]:
     """
-    Inject <base href="..."> so relative CSS/JS/images load in the iframe.
+    Return (index, markup) for inserting <base href="..."> into html_body.
 
     Tries: (1) inside first <head>; (2) after <html> as new <head>; (3) prepend at start.
     """
@@ -975,40 +913,37 @@ def _inject_base_into_html(html_body: str, page_url: str) -> str:
     base_escaped = base_href.replace("&", "&amp;").replace('"', "&quot;")
     base_tag = f'<base href="{base_escaped}">'
 
-    # (1) Inject into existing <head>
-    with_head = re.sub(r"(<head[^>]*>)", r"\1" + base_tag, html_body, count=1, flags=re.IGNORECASE)
-    if with_head != html_body:
-        return with_head
-
-    # (2) No <head>: insert <head><base...></head> after <html>
-    with_html_head = re.sub(
-        r"(<html[^>]*>)",
-        r"\1<head>" + base_tag + "</head>",
-        html_body,
-        count=1,
-        flags=re.IGNORECASE,
-    )
-    if with_html_head != html_body:
-        return with_html_head
+    # One scan finds whichever of <head>/<html> comes first; <head> follows <html>, so
+    # only an <html> hit needs a further search, and that starts where <html> ends.
+    m = _HEAD_OR_HTML_OPEN_RE.search(html_body)
+    if m and not m.group(1):
+        head = _HEAD_OPEN_RE.search(html_body, m.end())
+        if head is None:
+            # (2) <html> without <head>: add one after <html>
+            return m.end(), "<head>" + base_tag + "</head>"
+        m = head
+    if m:
+        # (1) Inject into existing <head>
+        return m.end(), base_tag
 
     # (3) No <html>: prepend base at start so relative URLs still resolve
-    return base_tag + html_body
+    return 0, base_tag
 
 
-def _rewrite_links_to_app(
-    html_body: str,
+def _inject_base_into_html(html_body: str, page_url: str) -> str:
+    """Inject <base href="..."> so relative CSS/JS/images load in the iframe."""
+    index, markup = _base_tag_splice(html_body, page_url)
+    return html_body[:index] + markup + html_body[index:]
+
+
+def _app_link_replacer(
     page_url: str,
     app_root_url: str,
     source_url: str,
     current_page_url: str,
     drpid: Optional[str] = None,
-) -> str:
-    """
-    Rewrite <a href="..."> so clicks load in the Linked pane. Builds
-    ?source_url=...&linked_url=...&referrer=... so the new page opens in Linked
-    and both panes are re-rendered. If drpid is set, appends it to preserve current project.
-    Only rewrites http/https links.
-    """
+) -> Callable[[re.Match], str]:
+    """Return the _A_HREF_RE replacement function used by _rewrite_links_to_app."""
     def repl(match: re.Match) -> str:
         before_href = match.group(1)
         quote_char = match.group(2)
@@ -1033,12 +968,56 @@ def _rewrite_links_to_app(
         escaped = app_url.replace("&", "&amp;").replace('"', "&quot;")
         return f'<a {before_href} target="_top" href={quote_char}{escaped}{quote_char} {after_href}>'
 
-    return re.sub(
-        r"<a\s+([^>]*?)href\s*=\s*([\"'])([^\"']*)\2([^>]*)>",
-        repl,
-        html_body,
-        flags=re.IGNORECASE,
-    )
+    return repl
+
+
+def _rewrite_links_to_app(
+    html_body: str,
+    page_url: str,
+    app_root_url: str,
+    source_url: str,
+    current_page_url: str,
+    drpid: Optional[str] = None,
+) -> str:
+    """
+    Rewrite <a href="..."> so clicks load in the Linked pane. Builds
+    ?source_url=...&linked_url=...&referrer=... so the new page opens in Linked
+    and both panes are re-rendered. If drpid is set, appends it to preserve current project.
+    Only rewrites http/https links.
+    """
+    repl = _app_link_replacer(page_url, app_root_url, source_url, current_page_url, drpid)
+    return _A_HREF_RE.sub(repl, html_body)
+
+
+def _inject_base_and_rewrite_links(
+    html_body: str,
+    page_url: str,
+    app_root_url: str,
+    source_url: str,
+    drpid: Optional[str] = None,
+) -> str:
+    """
+    Same result as _rewrite_links_to_app(_inject_base_into_html(...)), built in one walk.
+
+    The base tag is spliced in while the rewritten pieces are collected, so the page
+    is copied once instead of once per step.
+    """
+    index, markup = _base_tag_splice(html_body, page_url)
+    repl = _app_link_replacer(page_url, app_root_url, source_url, page_url, drpid)
+    parts: list[str] = []
+    last = 0
+    for m in _A_HREF_RE.finditer(html_body):
+        # The splice point follows a '>' so it never falls inside an <a ...> match.
+        if last <= index <= m.start():
+            parts += (html_body[last:index], markup)
+            last, index = index, -1
+        parts += (html_body[last:m.start()], repl(m))
+        last = m.end()
+    if index >= 0:
+        parts += (html_body[last:index], markup)
+        last = index
+    parts.append(html_body[last:])
+    return "".join(parts)
 
 
 def _extension_from_content_type(content_type: Optional[str]) -> str:
@@ -1113,9 +1092,9 @@ def _status_label(status_code: int, is_logical_404: bool) -> str:
 
 def _scoreboard_add(url: str, referrer: Optional[str], status_label: str) -> None:
     """Append a node to the in-memory scoreboard. Marks as dupe if this URL is already present at any level."""
-    existing_urls = {n["url"] for n in _scoreboard}
-    is_dupe = url in existing_urls
+    is_dupe = url in _scoreboard_url_index()
     _scoreboard.append({"url": url, "referrer": referrer, "status_label": status_label, "is_dupe": is_dupe})
+    _bump_scoreboard_version()
 
 
 def _scoreboard_add_download(
@@ -1138,6 +1117,7 @@ def _scoreboard_add_download(
         "extension": extension or "",
         "filename": filename or "",
     })
+    _bump_scoreboard_version()
 
 
 def _scoreboard_tree() -> List[Dict[str, Any]]:
@@ -1226,26 +1206,30 @@ def _scoreboard_render_html(
     return f"<ul>{items}</ul>"
 
 
+# Shared stand-in when no project is loaded, so lookups need no per-field None checks.
+_NO_PROJECT: Mapping[str, Any] = MappingProxyType({})
+
+
 def _metadata_for_template(flask_app: Flask, display_drpid: Optional[str], src_h1: Optional[str] = None) -> Dict[str, str]:
     """Build metadata dict for the index template (title, summary, keywords, agency, office, download_date)."""
-    project: Optional[Dict[str, Any]] = None
+    project: Mapping[str, Any] = _NO_PROJECT
     if display_drpid:
         try:
-            project = _get_project_by_drpid(flask_app, int(display_drpid))
+            project = _get_project_by_drpid(flask_app, int(display_drpid)) or _NO_PROJECT
         except (ValueError, TypeError):
             pass
-    title = (src_h1 or "").strip() or ((project.get("title") or "") if project else "") or ""
-    summary = (project.get("summary") or "") if project else ""
-    keywords = (project.get("keywords") or "") if project else ""
-    agency = (project.get("agency") or "") if project else ""
-    office = (project.get("office") or "") if project else ""
-    download_date = (project.get("download_date") or "") if project else ""
+    title = (src_h1 or "").strip() or project.get("title") or ""
+    summary = project.get("summary") or ""
+    keywords = project.get("keywords") or ""
+    agency = project.get("agency") or ""
+    office = project.get("office") or ""
+    download_date = project.get("download_date") or ""
     if not download_date and display_drpid:
         download_date = date.today().isoformat()
     else:
         download_date = _normalize_date_yyyy_mm_dd(download_date) or download_date
-    time_start = (project.get("time_start") or "") if project else ""
-    time_end = (project.get("time_end") or "") if project else ""
+    time_start = project.get("time_start") or ""
+    time_end = project.get("time_end") or ""
     return {
         "metadata_title": title,
         "metadata_summary": summary,
@@ -1258,18 +1242,55 @@ def _metadata_for_template(flask_app: Flask, display_drpid: Optional[str], src_h
     }
 
 
+# Open and close tags are located with separate linear searches; a single
+# <h1[^>]*>(.*?)</h1> rescans to the end of the page for every unclosed <h1>.
+_H1_OPEN_RE = re.compile(r"<h1[^>]*>", re.IGNORECASE)
+_H1_CLOSE_RE = re.compile(r"</h1>", re.IGNORECASE)
+_H1_OPEN_RE_BYTES = re.compile(rb"<h1[^>]*>", re.IGNORECASE)
+_H1_CLOSE_RE_BYTES = re.compile(rb"</h1>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
 def _h1_from_html(html_body: Any) -> str:
-    """Extract text of the first <h1> in the HTML; empty string if none."""
-    if isinstance(html_body, bytes):
-        html_body = html_body.decode("utf-8", errors="replace")
-    if not (html_body or "").strip():
+    """
+    Extract text of the first <h1> in the HTML; empty string if none.
+
+    Bytes bodies are searched as bytes so only the matched heading is decoded,
+    not the whole page.
+    """
+    if not html_body:
+        return ""
+    is_bytes = isinstance(html_body, bytes)
+    open_re, close_re = (_H1_OPEN_RE_BYTES, _H1_CLOSE_RE_BYTES) if is_bytes else (_H1_OPEN_RE, _H1_CLOSE_RE)
+    m_open = open_re.search(html_body)
+    if not m_open:
         return ""
-    m = re.search(r"<h1[^>]*>(.*?)</h1>", html_body, re.DOTALL | re.IGNORECASE)
-    if not m:
+    # If the first <h1> is unclosed, every later one is too.
+    m_close = close_re.search(html_body, m_open.end())
+    if not m_close:
         return ""
-    inner = m.group(1).strip()
-    inner = re.sub(r"<[^>]+>", "", inner)
-    return (inner or "").strip()
+    inner = html_body[m_open.end():m_close.start()]
+    if is_bytes:
+        inner = inner.decode("utf-8", errors="replace")
+    return _TAG_RE.sub("", inner).strip()
+
+
+# Prepared pane results for pages that loaded OK, so a link click does not refetch the
+# Source pane (and the referrer, for binary links) the user is already viewing. Bounded
+# by entry count and total srcdoc size; cleared when a new source page is loaded.
+_PANE_CACHE_MAX_ENTRIES = 32
+_PANE_CACHE_MAX_CHARS = 32 * 1024 * 1024
+_pane_cache: "OrderedDict[tuple, tuple[Optional[str], Optional[str], str, str, bool]]" = OrderedDict()
+_pane_cache_chars = 0
+_pane_cache_lock = threading.Lock()
+
+
+def _clear_pane_cache() -> None:
+    """Drop all cached pane results."""
+    global _pane_cache_chars
+    with _pane_cache_lock:
+        _pane_cache.clear()
+        _pane_cache_chars = 0
 
 
 def _prepare_pane_content(
@@ -1277,6 +1298,40 @@ def _prepare_pane_content(
     app_root: str,
     source_url: str,
     drpid: Optional[str] = None,
+) -> tuple[Optional[str], Optional[str], str, str, bool]:
+    """
+    Return _fetch_pane_content's result for these arguments, reusing a cached OK result.
+
+    Returns (safe_srcdoc, body_message, status_label, h1_text, is_binary).
+    """
+    global _pane_cache_chars
+    key = (url_param, app_root, source_url, drpid)
+    with _pane_cache_lock:
+        hit = _pane_cache.get(key)
+        if hit is not None:
+            _pane_cache.move_to_end(key)
+            return hit
+    result = _fetch_pane_content(url_param, app_root, source_url, drpid=drpid)
+    size = len(result[0] or "")
+    if result[2] != "OK" or size > _PANE_CACHE_MAX_CHARS:
+        return result
+    with _pane_cache_lock:
+        old = _pane_cache.pop(key, None)
+        if old is not None:
+            _pane_cache_chars -= len(old[0] or "")
+        _pane_cache[key] = result
+        _pane_cache_chars += size
+        while len(_pane_cache) > _PANE_CACHE_MAX_ENTRIES or _pane_cache_chars > _PANE_CACHE_MAX_CHARS:
+            _, evicted = _pane_cache.popitem(last=False)
+            _pane_cache_chars -= len(evicted[0] or "")
+    return result
+
+
+def _fetch_pane_content(
+    url_param: str,
+    app_root: str,
+    source_url: str,
+    drpid: Optional[str] = None,
 ) -> tuple[Optional[str], Optional[str], str, str, bool]:
     """
     Fetch url_param, inject base, rewrite links. Uses url_utils.is_non_html_response.
@@ -1284,7 +1339,6 @@ def _prepare_pane_content(
     """
     status_code, body, content_type, is_logical_404 = fetch_page_body(url_param)
     status_label = _status_label(status_code, is_logical_404)
-    h1_text = _h1_from_html(body or "") if body else ""
     pane_is_binary = is_non_html_response(content_type, body)
 
     # If body is actually HTML (e.g. NCBI pages served as XML), display it
@@ -1294,13 +1348,17 @@ def _prepare_pane_content(
         return None, f"Binary content ({html.escape(content_type)}). Not displayed.", status_label, "", True
     elif body_looks_like_xml(body):
         return None, "XML content. Not displayed.", status_label, "", True
-    if (body or "").strip() == "" and is_displayable_content_type(content_type):
+    if (not body or body.isspace()) and is_displayable_content_type(content_type):
         return None, "Content could not be displayed (possibly binary or wrong encoding).", status_label, "", False
 
-    body_with_base = _inject_base_into_html(body or "", url_param)
-    body_rewritten = _rewrite_links_to_app(
-        body_with_base, url_param, app_root, source_url, url_param, drpid=drpid
+    # Only displayed pages report an h1, so skip the search for binary/XML bodies.
+    h1_text = _h1_from_html(body)
+    body_rewritten = _inject_base_and_rewrite_links(
+        body or "", url_param, app_root, source_url, drpid=drpid
     )
+    # srcdoc is rendered into a double-quoted attribute, so & and " must be escaped (the
+    # browser unescapes them before parsing). Two str.replace passes beat html.escape,
+    # which makes five, and markupsafe on full pages.
     safe_srcdoc = body_rewritten.replace("&", "&amp;").replace('"', "&quot;")
     return safe_srcdoc, None, status_label, h1_text, False
 
@@ -1429,7 +1487,8 @@ def legacy_index() -> str:
 
     # Initial load: single url=
     if url_param and not source_url_param and not linked_url_param:
-        _scoreboard.clear()
+        _reset_scoreboard()
+        _clear_pane_cache()
         if not is_valid_url(url_param):
             folder_path = _folder_path_for_drpid(display_drpid)
             return render_template_string(
@@ -1509,7 +1568,7 @@ def legacy_index() -> str:
         linked_url_for_fetch = linked_url_param
         linked_display_url = linked_url_param
         resolved_linked: Optional[str] = None
-        if linked_url_param.startswith("https://catalog.data.gov"):
+        if is_catalog_url(linked_url_param):
             resolved_linked = resolve_catalog_resource_url(linked_url_param)
             if resolved_linked:
                 linked_url_for_fetch = resolved_linked
@@ -1517,7 +1576,7 @@ def legacy_index() -> str:
         linked_srcdoc, linked_pane_message, linked_status, _, linked_is_binary = _prepare_pane_content(
             linked_url_for_fetch, app_root, source_url_param, drpid=display_drpid
         )
-        if not any(n["url"] == source_url_param for n in _scoreboard):
+        if source_url_param not in _scoreboard_url_index():
             _scoreboard_add(source_url_param, None, src_status)
         if not from_scoreboard and not linked_is_binary:
             _scoreboard_add(linked_url_for_fetch, referrer_param, linked_status)
@@ -1608,6 +1667,22 @@ def legacy_index() -> str:
     )
 
 
+# Launcher page split around the redirect URL literal, so each request only encodes the URL.
+_LAUNCHER_PAGE = (
+    """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Redirecting...</title></head>
+<body><p>Redirecting...</p>
+<script>setTimeout(function(){ window.location.href = """,
+    """; }, 500);</script>
+</body></html>""",
+)
+
+
+def _js_string_literal(value: str) -> str:
+    """JSON-encode value for inline <script>, escaping '<' so it cannot close the tag."""
+    return json.dumps(value).replace("<", "\\u003c")
+
+
 @app.route("/extension/launcher")
 def extension_launcher() -> Any:
     """
@@ -1643,11 +1718,7 @@ def extension_launcher() -> Any:
     if not folder_path:
         return "<!DOCTYPE html><html><body><p>Could not create output folder.</p></body></html>", 500
     # Extension reads drpid and url from window.location.search; we redirect after short delay
-    return f"""<!DOCTYPE html>
-<html><head><meta charset="utf-8"><title>Redirecting...</title></head>
-<body><p>Redirecting...</p>
-<script>setTimeout(function(){{ window.location.href = {json.dumps(url_param)}; }}, 500);</script>
-</body></html>"""
+    return _LAUNCHER_PAGE[0] + _js_string_literal(url_param) + _LAUNCHER_PAGE[1]
 
 
 @app.route("/")
@@ -1671,8 +1742,8 @@ def _generate_save_progress(
     Generator that yields progress lines for the save operation (legacy route).
     Delegates to api_save.generate_save_progress so heartbeats and timeouts are shared.
     """
-    from interactive_collector.api_save import generate_save_progress
-    yield from generate_save_progress(folder_path, urls, indices)
+    from interactive_collector.api_save import generate_save_progress, parse_save_indices
+    yield from generate_save_progress(folder_path, urls, parse_save_indices(indices, len(urls)))
 
 
 # Progress report interval for large file downloads (MB).
@@ -1812,7 +1883,6 @@ def _save_metadata_from_request() -> None:
     except (ValueError, TypeError):
         return
     _ensure_storage(app)
-    from storage import Storage
     values: Dict[str, Any] = {
         "status": "collected",
         "errors": None,
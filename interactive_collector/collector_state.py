@@ -7,29 +7,85 @@ Holds the scoreboard (list of visited URLs with status) and per-DRPID results
 State is process-local; it does not persist across server restarts.
 """
 
+import threading
 from pathlib import Path
 from typing import Any, Dict, List
 
 # Default paths when not set by orchestrator (standalone run).
 DEFAULT_DB_PATH = "drp_pipeline.db"
 DEFAULT_BASE_OUTPUT_DIR = r"C:\Documents\DataRescue\DRPData"
+# Chromium profile reused across PDF saves; kept outside the project-folder tree.
+DEFAULT_PDF_PROFILE_DIR = "~/.drp/pdf-profile"
 
 # In-memory scoreboard: list of {url, referrer, status_label, is_dupe, ...}.
 # Referrer None = root (source) URL.
 _scoreboard: List[Dict[str, Any]] = []
 
+# Bumped on every scoreboard mutation; GET /api/scoreboard derives its ETag from it.
+_scoreboard_version = 0
+
+# URL -> index of its first scoreboard entry, covering the first _scoreboard_indexed entries.
+# Extended lazily from appended entries, so building a tree or checking for dupes does not
+# rescan the whole scoreboard; reset together with the scoreboard.
+_scoreboard_url_index: Dict[str, int] = {}
+_scoreboard_indexed = 0
+
 # Per-DRPID result: folder_path, downloads list, dataset_size for Save.
 _result_by_drpid: Dict[int, Dict[str, Any]] = {}
 
+# Serializes scoreboard and per-DRPID result mutations; background download jobs
+# record their results from pool threads. Reentrant so helpers can nest.
+_state_lock = threading.RLock()
+
 # One-time metadata from Copy & Open page (title, summary, keywords, agency, office, etc.), keyed by drpid.
 _metadata_from_page: Dict[int, Dict[str, str]] = {}
 
 
+def state_lock() -> threading.RLock:
+    """Return the lock held while mutating the scoreboard or per-DRPID results."""
+    return _state_lock
+
+
 def get_scoreboard() -> List[Dict[str, Any]]:
     """Return the in-memory scoreboard list."""
     return _scoreboard
 
 
+def get_scoreboard_version() -> int:
+    """Return the scoreboard version (changes whenever the scoreboard is mutated)."""
+    return _scoreboard_version
+
+
+def bump_scoreboard_version() -> None:
+    """Record a scoreboard mutation; call after appending to or clearing the scoreboard."""
+    global _scoreboard_version
+    _scoreboard_version += 1
+
+
+def scoreboard_url_index() -> Dict[str, int]:
+    """Return {url: index of first scoreboard entry with that url}, caught up with any appends."""
+    global _scoreboard_indexed
+    with _state_lock:
+        if len(_scoreboard) < _scoreboard_indexed:
+            # Cleared without reset_scoreboard(); rebuild from scratch.
+            _scoreboard_url_index.clear()
+            _scoreboard_indexed = 0
+        for i in range(_scoreboard_indexed, len(_scoreboard)):
+            _scoreboard_url_index.setdefault(_scoreboard[i]["url"], i)
+        _scoreboard_indexed = len(_scoreboard)
+    return _scoreboard_url_index
+
+
+def reset_scoreboard() -> None:
+    """Empty the scoreboard and its URL index and bump the version."""
+    global _scoreboard_indexed
+    with _state_lock:
+        _scoreboard.clear()
+        _scoreboard_url_index.clear()
+        _scoreboard_indexed = 0
+        bump_scoreboard_version()
+
+
 def get_result_by_drpid() -> Dict[int, Dict[str, Any]]:
     """Return the per-DRPID result dict."""
     return _result_by_drpid
@@ -69,3 +125,15 @@ def get_base_output_dir() -> Path:
     except Exception:
         pass
     return Path(DEFAULT_BASE_OUTPUT_DIR)
+
+
+def get_pdf_profile_dir() -> Path:
+    """Return the PDF printing browser profile dir from Args.pdf_profile_dir, or the default under ~/.drp."""
+    path = DEFAULT_PDF_PROFILE_DIR
+    try:
+        from utils.Args import Args
+        if getattr(Args, "_initialized", False) and Args.pdf_profile_dir:
+            path = Args.pdf_profile_dir
+    except Exception:
+        pass
+    return Path(path).expanduser()
@@ -0,0 +1,52 @@
+"""
+Flask JSON provider backed by orjson for the Interactive Collector API.
+
+Routes return plain dicts (implicit jsonify); with this provider installed the
+scoreboard/project payloads are serialized by orjson straight to bytes.
+"""
+
+from typing import Any
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider that uses orjson for dumps/loads and responses."""
+
+    def _options(self) -> int:
+        """orjson option flags matching the provider settings (sort_keys)."""
+        opts = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            opts |= orjson.OPT_SORT_KEYS
+        return opts
+
+    def _dumps_bytes(self, obj: Any) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes, using Flask's default() for extra types."""
+        return orjson.dumps(obj, default=self.default, option=self._options())
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize obj to a JSON string; custom json.dumps kwargs use the stdlib path."""
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Deserialize JSON; custom json.loads kwargs use the stdlib path."""
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Any:
+        """Build a JSON response from orjson bytes (pretty-printed debug output uses the default path)."""
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self._dumps_bytes(obj) + b"\n", mimetype=self.mimetype
+        )
+
+
+def install_json_provider(app: Any) -> None:
+    """Use OrjsonProvider as app's JSON provider."""
+    app.json = OrjsonProvider(app)
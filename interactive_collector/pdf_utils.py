@@ -5,11 +5,52 @@ Page title extraction and unique PDF basename generation.
 """
 
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Generator, Optional, Set
+from urllib.parse import urlparse
 
 from utils.file_utils import sanitize_filename
 
 
+# One round trip for what page.title() plus a <title> fallback would take two for
+_TITLE_JS = "() => (document.title || document.querySelector('title')?.textContent || '').trim()"
+# Only reached for untitled pages, after the page has loaded: a missing <h1> is not coming.
+_H1_WAIT_MS = 1000
+
+
+def _title_from_url(url: str) -> str:
+    """Last path segment (if short) or first hostname label of url; "" if neither."""
+    parsed = urlparse(url)
+    path = (parsed.path or "").rstrip("/")
+    if path:
+        segment = path.split("/")[-1]
+        if segment and len(segment) < 80:
+            return segment
+    if parsed.netloc:
+        return parsed.netloc.split(".")[0] or parsed.netloc
+    return ""
+
+
+def _title_or_h1_steps(page: Any, url: str) -> Generator[Callable[[], Any], Optional[str], str]:
+    """
+    The title fallback chain shared by page_title_or_h1 and async_page_title_or_h1.
+
+    Yields each page lookup (document title, then first <h1>) for the caller to run,
+    sync or awaited, and is sent its result (None if it raised). Returns the first
+    non-blank text, else the URL-derived title, else "".
+    """
+    for lookup in (
+        lambda: page.evaluate(_TITLE_JS),
+        lambda: page.locator("h1").first.text_content(timeout=_H1_WAIT_MS),
+    ):
+        text = yield lookup
+        if text and text.strip():
+            return text.strip()
+    try:
+        return _title_from_url(url) if url else ""
+    except ValueError:
+        return ""
+
+
 def page_title_or_h1(page: Any, url: str = "") -> str:
     """
     Get page <title> or first <h1> text from a Playwright page.
@@ -24,54 +65,53 @@ def page_title_or_h1(page: Any, url: str = "") -> str:
     Returns:
         Non-empty string when available, else ""
     """
-    try:
-        title = page.title()
-        if title and title.strip():
-            return title.strip()
+    steps = _title_or_h1_steps(page, url)
+    lookup = next(steps)
+    while True:
         try:
-            title = page.evaluate(
-                "() => document.querySelector('title')?.textContent?.trim() || document.title?.trim() || ''"
-            )
-            if title:
-                return title
+            text = lookup()
         except Exception:
-            pass
+            text = None
         try:
-            h1 = page.locator("h1").first.text_content(timeout=2000)
-            if h1 and h1.strip():
-                return h1.strip()
+            lookup = steps.send(text)
+        except StopIteration as done:
+            return done.value
+
+
+async def async_page_title_or_h1(page: Any, url: str = "") -> str:
+    """Async counterpart of page_title_or_h1 for playwright.async_api pages."""
+    steps = _title_or_h1_steps(page, url)
+    lookup = next(steps)
+    while True:
+        try:
+            text = await lookup()
         except Exception:
-            pass
-        if url:
-            from urllib.parse import urlparse
-
-            parsed = urlparse(url)
-            path = (parsed.path or "").rstrip("/")
-            if path:
-                segment = path.split("/")[-1]
-                if segment and len(segment) < 80:
-                    return segment
-            if parsed.netloc:
-                return parsed.netloc.split(".")[0] or parsed.netloc
-    except Exception:
-        pass
-    return ""
+            text = None
+        try:
+            lookup = steps.send(text)
+        except StopIteration as done:
+            return done.value
 
 
 def unique_pdf_basename(
     base: str,
     used: Dict[str, int],
     folder_path: Optional[Path] = None,
+    existing: Optional[Set[str]] = None,
 ) -> str:
     """
     Return a unique sanitized basename: base.pdf or base_1.pdf, base_2.pdf, etc.
 
     When folder_path is set, skips names that already exist in the folder (no overwrite).
+    Callers naming many files in one folder can instead pass existing, the folder's
+    lowercased names listed once; candidates are checked against it (case-insensitively,
+    like Windows/macOS folders) and the returned name is added to it.
 
     Args:
         base: Base name (e.g. page title)
         used: Mutable dict tracking usage counts per key (by lowercase base)
         folder_path: Optional; when set, also skips existing files in folder
+        existing: Optional mutable set of lowercased names in the folder; used instead of folder_path
 
     Returns:
         Unique filename like "My_Page.pdf" or "Dataset_1.pdf"
@@ -83,8 +123,14 @@ def unique_pdf_basename(
     n = used.get(key, 0)
     while True:
         name = f"{safe}.pdf" if n == 0 else f"{safe}_{n}.pdf"
-        if folder_path is not None and (folder_path / name).exists():
+        if existing is not None:
+            taken = name.lower() in existing
+        else:
+            taken = folder_path is not None and (folder_path / name).exists()
+        if taken:
             n += 1
             continue
         used[key] = n + 1
+        if existing is not None:
+            existing.add(name.lower())
         return name
@@ -2,14 +2,33 @@
 Unit tests for the Interactive Collector JSON API.
 """
 
+import asyncio
+import gzip
 import json
+import os
+import queue
 import shutil
+import subprocess
 import tempfile
+import time
 import unittest
+import zlib
 from pathlib import Path
-from unittest.mock import patch
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from interactive_collector import api_proxy_cache
 from interactive_collector.app import app
+from interactive_collector.api import (
+    _basename_for_saved_page,
+    _metadata_fields,
+    _normalize,
+    _output_folder_for,
+    _progress_response,
+    _unique_basename_for_folder,
+)
+from interactive_collector.api_pipeline import _kill_after, _modules, _split_complete_lines
+from interactive_collector.api_save import _run_pdf_worker, generate_save_progress, parse_save_indices
 from interactive_collector.api_scoreboard import add_to_scoreboard, clear_scoreboard
 from pipeline_chat.schemas import ChatQueryResponse
 
@@ -108,7 +127,7 @@ class TestApiProjectsLoad(unittest.TestCase):
                     content_type="application/json",
                 )
         self.assertEqual(resp.status_code, 200)
-        mock_ensure.assert_called_once_with(1, recreate=False)
+        mock_ensure.assert_called_once_with(1, recreate=False, record=proj)
 
     def test_projects_load_delete_folder_on_load_true(self) -> None:
         """POST /api/projects/load with delete_folder_on_load true empties the folder."""
@@ -122,7 +141,7 @@ class TestApiProjectsLoad(unittest.TestCase):
                     content_type="application/json",
                 )
         self.assertEqual(resp.status_code, 200)
-        mock_ensure.assert_called_once_with(1, recreate=True)
+        mock_ensure.assert_called_once_with(1, recreate=True, record=proj)
 
     def test_projects_load_omitted_delete_folder_preserves(self) -> None:
         """POST /api/projects/load without delete_folder_on_load preserves the folder."""
@@ -136,7 +155,7 @@ class TestApiProjectsLoad(unittest.TestCase):
                     content_type="application/json",
                 )
         self.assertEqual(resp.status_code, 200)
-        mock_ensure.assert_called_once_with(1, recreate=False)
+        mock_ensure.assert_called_once_with(1, recreate=False, record=proj)
 
     def test_projects_load_invalid_drpid_returns_400(self) -> None:
         """POST /api/projects/load with invalid drpid returns 400."""
@@ -252,6 +271,17 @@ class TestAddProjectWithSourceUrlIntegration(unittest.TestCase):
             add_project_with_source_url("https://dup-integration.example/b")
         self.assertEqual(str(cm.exception), "duplicate_source_url")
 
+    def test_next_eligible_after_past_first_200_rows(self) -> None:
+        """get_next_eligible_after finds the next project even beyond the 200th eligible row."""
+        from interactive_collector.api_projects import add_project_with_source_url, get_next_eligible_after
+        from storage import Storage
+
+        drpids = [add_project_with_source_url(f"https://next-integration.example/{i}")["DRPID"] for i in range(205)]
+        Storage.update_record(drpids[202], {"status": "collected"})
+
+        self.assertEqual(get_next_eligible_after(drpids[201])["DRPID"], drpids[203])
+        self.assertIsNone(get_next_eligible_after(drpids[-1]))
+
 
 class TestApiMetadataFromPage(unittest.TestCase):
     """Tests for /api/metadata-from-page (Copy & Open page preload)."""
@@ -288,6 +318,10 @@ class TestApiProxy(unittest.TestCase):
 
     def setUp(self) -> None:
         self.client = app.test_client()
+        api_proxy_cache.clear()
+
+    def tearDown(self) -> None:
+        api_proxy_cache.clear()
 
     def test_proxy_requires_valid_url(self) -> None:
         """GET /api/proxy without url or with invalid url returns 400."""
@@ -297,14 +331,76 @@ class TestApiProxy(unittest.TestCase):
         self.assertEqual(resp.status_code, 400)
 
     def test_proxy_returns_502_on_request_error(self) -> None:
-        """GET /api/proxy returns 502 when requests.get raises."""
+        """GET /api/proxy returns 502 when the upstream GET raises."""
         import requests as req
-        with patch("interactive_collector.api.requests.get", side_effect=req.RequestException("timeout")):
+        with patch("interactive_collector.api._SESSION.get", side_effect=req.RequestException("timeout")):
             resp = self.client.get("/api/proxy?url=https://example.com/style.css")
         self.assertEqual(resp.status_code, 502)
         data = json.loads(resp.data)
         self.assertIn("error", data)
 
+    def test_proxy_streams_body_and_closes_upstream(self) -> None:
+        """GET /api/proxy streams upstream chunks and closes the upstream response."""
+        upstream = MagicMock(status_code=200, headers={"Content-Type": "text/css; charset=utf-8"})
+        upstream.iter_content.return_value = iter([b"body{", b"}"])
+        with patch("interactive_collector.api._SESSION.get", return_value=upstream) as mock_get:
+            resp = self.client.get("/api/proxy?url=https://example.com/style.css", buffered=True)
+            self.assertEqual(resp.data, b"body{}")
+            self.assertEqual(resp.mimetype, "text/css")
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+        upstream.close.assert_called_once()
+
+    def test_proxy_gzips_text_when_accepted(self) -> None:
+        """Text assets are gzip-encoded for clients that accept gzip; binary assets are not."""
+        with patch("interactive_collector.api._SESSION.get", return_value=self._upstream(body=b"p{}" * 100)):
+            resp = self.client.get(
+                "/api/proxy?url=https://example.com/a.css", headers={"Accept-Encoding": "gzip"}, buffered=True
+            )
+        self.assertEqual(resp.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(resp.data), b"p{}" * 100)
+        png = self._upstream(body=b"\x89PNG")
+        png.headers["Content-Type"] = "image/png"
+        with patch("interactive_collector.api._SESSION.get", return_value=png):
+            resp = self.client.get(
+                "/api/proxy?url=https://example.com/a.png", headers={"Accept-Encoding": "gzip"}, buffered=True
+            )
+        self.assertNotIn("Content-Encoding", resp.headers)
+        self.assertEqual(resp.data, b"\x89PNG")
+
+    def _upstream(self, status: int = 200, headers: dict | None = None, body: bytes = b"x") -> MagicMock:
+        upstream = MagicMock(status_code=status, headers={"Content-Type": "text/css", **(headers or {})})
+        upstream.iter_content.return_value = iter([body])
+        return upstream
+
+    def test_proxy_serves_repeat_request_from_cache(self) -> None:
+        """A second GET for the same URL is served from the cache without a fetch."""
+        with patch("interactive_collector.api._SESSION.get", return_value=self._upstream(body=b"a{}")) as mock_get:
+            first = self.client.get("/api/proxy?url=https://example.com/a.css", buffered=True)
+            second = self.client.get("/api/proxy?url=https://example.com/a.css", buffered=True)
+        self.assertEqual((first.data, second.data), (b"a{}", b"a{}"))
+        self.assertEqual(second.mimetype, "text/css")
+        mock_get.assert_called_once()
+
+    def test_proxy_skips_cache_for_no_store(self) -> None:
+        """Responses with Cache-Control: no-store are fetched every time."""
+        with patch(
+            "interactive_collector.api._SESSION.get",
+            side_effect=lambda *a, **k: self._upstream(headers={"Cache-Control": "no-store"}),
+        ) as mock_get:
+            self.client.get("/api/proxy?url=https://example.com/a.css", buffered=True)
+            self.client.get("/api/proxy?url=https://example.com/a.css", buffered=True)
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_proxy_revalidates_stale_entry_with_etag(self) -> None:
+        """A stale entry with an ETag is revalidated and served on 304."""
+        api_proxy_cache.store("https://example.com/a.css", b"old", "text/css", '"v1"', ttl=-1)
+        with patch("interactive_collector.api._SESSION.get", return_value=self._upstream(status=304)) as mock_get:
+            resp = self.client.get("/api/proxy?url=https://example.com/a.css", buffered=True)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, b"old")
+        self.assertEqual(mock_get.call_args.kwargs["headers"]["If-None-Match"], '"v1"')
+        self.assertTrue(api_proxy_cache.lookup("https://example.com/a.css").is_fresh())
+
 
 class TestApiScoreboard(unittest.TestCase):
     """Tests for /api/scoreboard."""
@@ -352,6 +448,474 @@ class TestApiScoreboard(unittest.TestCase):
         self.assertIn("urls", data)
         self.assertEqual(data["urls"], ["https://example.com/page"])
 
+    def test_scoreboard_routes_walk_once_and_use_orjson(self) -> None:
+        """Scoreboard routes build tree and urls in one snapshot and serialize via orjson."""
+        from interactive_collector.json_provider import OrjsonProvider
+        self.assertIsInstance(app.json, OrjsonProvider)
+        with patch(
+            "interactive_collector.api.get_scoreboard_snapshot",
+            return_value={"tree": [], "urls": []},
+        ) as mock_snap:
+            self.client.get("/api/scoreboard")
+            self.client.post("/api/scoreboard/add", json={"url": "https://example.com"})
+        self.assertEqual(mock_snap.call_count, 2)
+
+    def test_scoreboard_get_conditional_on_etag(self) -> None:
+        """GET /api/scoreboard returns 304 for a matching If-None-Match until the scoreboard changes."""
+        first = self.client.get("/api/scoreboard")
+        etag = first.headers["ETag"]
+        self.assertEqual(first.headers["Cache-Control"], "no-cache")
+
+        with patch("interactive_collector.api.get_scoreboard_snapshot") as mock_snap:
+            again = self.client.get("/api/scoreboard", headers={"If-None-Match": etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.data, b"")
+        mock_snap.assert_not_called()
+
+        add_to_scoreboard("https://example.com/new", None, "OK")
+        changed = self.client.get("/api/scoreboard", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+        self.assertEqual(json.loads(changed.data)["urls"], ["https://example.com/new"])
+
+    def test_scoreboard_add_accepts_form(self) -> None:
+        """POST /api/scoreboard/add with form data strips fields and defaults status_label."""
+        resp = self.client.post("/api/scoreboard/add", data={"url": "  https://example.com/f ", "referrer": ""})
+        self.assertEqual(resp.status_code, 200)
+        data = json.loads(resp.data)
+        self.assertEqual(data["urls"], ["https://example.com/f"])
+        self.assertEqual(data["scoreboard"][0]["status_label"], "OK")
+        self.assertIsNone(data["scoreboard"][0]["referrer"])
+
+
+class TestApiDownloadFile(unittest.TestCase):
+    """Tests for POST /api/download-file request validation."""
+
+    def setUp(self) -> None:
+        """Use test client for each test."""
+        self.client = app.test_client()
+
+    def test_invalid_url_returns_text_400(self) -> None:
+        """Missing or non-http url returns plain-text "Invalid URL"."""
+        for form in ({"drpid": "1"}, {"url": "ftp://x", "drpid": "1"}):
+            resp = self.client.post("/api/download-file", data=form)
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(resp.get_data(as_text=True), "Invalid URL")
+
+    def test_invalid_drpid_returns_text_400(self) -> None:
+        """Missing drpid returns plain-text "Invalid DRPID"."""
+        resp = self.client.post("/api/download-file", data={"url": "https://example.com/a.csv"})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.get_data(as_text=True), "Invalid DRPID")
+
+    def test_streams_progress_lines_as_bytes(self) -> None:
+        """Progress lines from the download generator are streamed to the client."""
+        lines = ["SAVING\ta.csv\n", "DONE\ta.csv\t3\tcsv\n"]
+        with patch("interactive_collector.api.get_result_by_drpid", return_value={1: {"folder_path": "/tmp"}}), \
+                patch("interactive_collector.api_download.generate_download_progress", return_value=iter(lines)), \
+                patch("sys.stderr") as mock_stderr, \
+                self.assertLogs("interactive_collector.api", level="DEBUG") as logs:
+            resp = self.client.post("/api/download-file", data={"url": "https://example.com/a.csv", "drpid": "1"})
+            self.assertEqual(resp.get_data(as_text=True), "".join(lines))
+        mock_stderr.write.assert_not_called()
+        self.assertEqual(len(logs.records), 2)
+
+    def test_background_returns_job_and_status(self) -> None:
+        """background=1 returns 202 with a job id whose status can be polled."""
+        with patch("interactive_collector.api.get_result_by_drpid", return_value={1: {"folder_path": "/tmp"}}), \
+                patch("interactive_collector.api_download_jobs.start_download_job", return_value="abc") as mock_start, \
+                patch("interactive_collector.api_download_jobs.get_download_job", return_value={"state": "saving"}):
+            resp = self.client.post(
+                "/api/download-file",
+                data={"url": "https://example.com/a.csv", "drpid": "1", "background": "1"},
+            )
+            self.assertEqual(resp.status_code, 202)
+            self.assertEqual(json.loads(resp.data), {"job_id": "abc", "poll": "/api/download-status/abc"})
+            mock_start.assert_called_once_with("https://example.com/a.csv", "/tmp", 1, None)
+            status = self.client.get("/api/download-status/abc")
+            self.assertEqual(json.loads(status.data), {"state": "saving"})
+
+    def test_download_status_unknown_job_404(self) -> None:
+        """GET /api/download-status/<id> for an unknown id returns 404."""
+        resp = self.client.get("/api/download-status/nope")
+        self.assertEqual(resp.status_code, 404)
+
+    def test_progress_response_passthrough_bytes(self) -> None:
+        """_progress_response yields encoded chunks with direct_passthrough set."""
+        with app.test_request_context():
+            resp = _progress_response(["DONE\t0\n"], echo=False)
+        self.assertTrue(resp.direct_passthrough)
+        self.assertEqual(list(resp.response), [b"DONE\t0\n"])
+
+    def test_progress_response_gzip_when_accepted(self) -> None:
+        """Progress lines are gzip-compressed and each line is decodable as it arrives."""
+        with app.test_request_context(headers={"Accept-Encoding": "gzip, deflate"}):
+            resp = _progress_response(["SAVING\ta\n", "DONE\t0\n"], echo=False)
+        self.assertEqual(resp.headers["Content-Encoding"], "gzip")
+        chunks = list(resp.response)
+        decomp = zlib.decompressobj(31)
+        self.assertEqual(decomp.decompress(chunks[0]), b"SAVING\ta\n")
+        self.assertEqual(decomp.decompress(b"".join(chunks[1:])), b"DONE\t0\n")
+
+
+class TestBasenameForSavedPage(unittest.TestCase):
+    """Tests for _basename_for_saved_page (extension save filenames)."""
+
+    def test_title_wins(self) -> None:
+        self.assertEqual(_basename_for_saved_page("My Page", "https://x.org/a"), "My_Page")
+
+    def test_last_path_segment(self) -> None:
+        self.assertEqual(_basename_for_saved_page("", "https://data.example.gov/a/report/"), "report")
+
+    def test_netloc_stem_when_no_path_or_long_segment(self) -> None:
+        self.assertEqual(_basename_for_saved_page("", "https://data.example.gov"), "data")
+        self.assertEqual(_basename_for_saved_page("", "https://data.example.gov/" + "x" * 81), "data")
+
+    def test_default_when_url_empty(self) -> None:
+        self.assertEqual(_basename_for_saved_page("", ""), "page")
+
+
+class TestUniqueBasenameForFolder(unittest.TestCase):
+    """Tests for _unique_basename_for_folder."""
+
+    def setUp(self) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp())
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_skips_existing_names_case_insensitively(self) -> None:
+        """Existing files (any case) are skipped; the first free suffix is used."""
+        (self.tmpdir / "Report.pdf").write_bytes(b"")
+        (self.tmpdir / "report_1.PDF").write_bytes(b"")
+        self.assertEqual(_unique_basename_for_folder("Report", self.tmpdir, ".pdf"), "Report_2.pdf")
+        self.assertEqual(_unique_basename_for_folder("Report", self.tmpdir, ".md"), "Report.md")
+
+    def test_listdir_called_once(self) -> None:
+        """The folder is listed once rather than stat'ed per candidate."""
+        with patch("interactive_collector.api.os.listdir", return_value=["a.pdf", "a_1.pdf"]) as mock_ls:
+            self.assertEqual(_unique_basename_for_folder("a.pdf", self.tmpdir, ".pdf"), "a_2.pdf")
+        mock_ls.assert_called_once_with(self.tmpdir)
+
+
+class TestOutputFolderFor(unittest.TestCase):
+    """Tests for _output_folder_for (extension/download folder resolution)."""
+
+    def test_recorded_folder_skips_ensure(self) -> None:
+        """A folder already recorded for the DRPID is returned without creating one."""
+        with patch("interactive_collector.api.get_result_by_drpid", return_value={7: {"folder_path": "/out/7"}}), \
+                patch("interactive_collector.api.ensure_output_folder") as mock_ensure:
+            self.assertEqual(_output_folder_for(7), "/out/7")
+        mock_ensure.assert_not_called()
+
+    def test_missing_folder_falls_back_to_ensure(self) -> None:
+        """Unknown DRPIDs (or blank folders) resolve through ensure_output_folder."""
+        with patch("interactive_collector.api.get_result_by_drpid", return_value={8: {"folder_path": ""}}), \
+                patch("interactive_collector.api.ensure_output_folder", return_value="/out/new") as mock_ensure:
+            self.assertEqual(_output_folder_for(8), "/out/new")
+            self.assertEqual(_output_folder_for(9), "/out/new")
+        self.assertEqual(mock_ensure.call_count, 2)
+
+
+class TestNormalize(unittest.TestCase):
+    """Tests for _normalize (request field normalization)."""
+
+    def test_strings_stripped_and_empty_to_none(self) -> None:
+        """String fields are stripped; missing, None, and blank become None."""
+        ns = _normalize({"a": "  x ", "b": "   ", "c": None, "n": 5}, str_fields=("a", "b", "c", "d", "n"))
+        self.assertEqual((ns.a, ns.b, ns.c, ns.d, ns.n), ("x", None, None, None, "5"))
+
+    def test_bools_accept_true_and_form_one(self) -> None:
+        """Bool fields are True only for JSON true or "1"."""
+        ns = _normalize({"a": True, "b": "1", "c": "true", "d": 1}, bool_fields=("a", "b", "c", "d", "e"))
+        self.assertEqual((ns.a, ns.b, ns.c, ns.d, ns.e), (True, True, False, False, False))
+
+    def test_metadata_fields_prefixed_and_stripped(self) -> None:
+        """_metadata_fields reads metadata_<field>, strips values, and fills missing fields with ""."""
+        meta = _metadata_fields({"metadata_title": " T ", "metadata_keywords": None, "title": "ignored"})
+        self.assertEqual(meta["title"], "T")
+        self.assertEqual(meta["keywords"], "")
+        self.assertEqual(len(meta), 8)
+        self.assertEqual(_metadata_fields({"agency": " A "}, prefix="")["agency"], "A")
+
+
+class TestRunPdfWorker(unittest.TestCase):
+    """Tests for the Playwright PDF worker."""
+
+    def setUp(self) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp())
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _fake_playwright(self, pages: list, persistent: bool = False) -> tuple[MagicMock, MagicMock, MagicMock]:
+        """
+        Return (async_playwright mock, browser, context) handing out pages in order.
+
+        The persistent profile is refused (as when another save holds it) unless persistent is set.
+        """
+        context = MagicMock()
+        context.new_page = AsyncMock(side_effect=pages)
+        context.close = AsyncMock()
+        context.route = AsyncMock()
+        browser = MagicMock()
+        browser.new_context = AsyncMock(return_value=context)
+        browser.close = AsyncMock()
+        p = MagicMock()
+        p.chromium.launch = AsyncMock(return_value=browser)
+        if persistent:
+            p.chromium.launch_persistent_context = AsyncMock(return_value=context)
+        else:
+            p.chromium.launch_persistent_context = AsyncMock(side_effect=RuntimeError("profile in use"))
+        manager = MagicMock()
+        manager.__aenter__ = AsyncMock(return_value=p)
+        manager.__aexit__ = AsyncMock(return_value=False)
+        return MagicMock(return_value=manager), browser, context
+
+    def _fake_page(self, goto_side_effect: object = None) -> MagicMock:
+        page = MagicMock()
+        for name in ("goto", "wait_for_timeout", "wait_for_load_state", "pdf", "close"):
+            setattr(page, name, AsyncMock())
+        page.goto.side_effect = goto_side_effect
+        return page
+
+    @patch("interactive_collector.api_save.async_page_title_or_h1", new_callable=AsyncMock, return_value="Page")
+    def test_pages_reused_per_worker_and_replaced_after_error(self, _mock_title: AsyncMock) -> None:
+        """URLs share one context; a worker keeps its page and only replaces it after a failure."""
+        first = self._fake_page([None, RuntimeError("net::ERR_FAILED"), None])
+        second = self._fake_page()
+        async_playwright, browser, context = self._fake_playwright([first, second])
+        progress: "queue.Queue[tuple]" = queue.Queue()
+        with patch("interactive_collector.api_save._PDF_CONCURRENCY", 1), patch(
+            "playwright.async_api.async_playwright", async_playwright
+        ):
+            _run_pdf_worker(self.tmpdir, ["https://a", "https://b", "https://c"], [0, 1, 2], progress)
+
+        items = list(progress.queue)
+        browser.new_context.assert_awaited_once()
+        self.assertEqual(context.new_page.await_count, 2)
+        first.close.assert_awaited_once()
+        second.goto.assert_awaited_once()
+        context.close.assert_awaited_once()
+        self.assertIn(("ERROR", "net::ERR_FAILED"), items)
+        self.assertEqual(items[-1], ("DONE", "2"))
+
+    @patch("interactive_collector.api_save.async_page_title_or_h1", new_callable=AsyncMock, return_value="Page")
+    def test_pages_print_concurrently_with_unique_names(self, _mock_title: AsyncMock) -> None:
+        """Several pages wait on their timers at once; identical titles still get distinct files."""
+        in_flight = {"now": 0, "max": 0}
+
+        async def slow_settle(_state: str, timeout: int) -> None:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+
+        pages = [self._fake_page() for _ in range(3)]
+        for page in pages:
+            page.wait_for_load_state.side_effect = slow_settle
+        async_playwright, _browser, context = self._fake_playwright(pages)
+        progress: "queue.Queue[tuple]" = queue.Queue()
+        with patch("interactive_collector.api_save._PDF_CONCURRENCY", 3), patch(
+            "playwright.async_api.async_playwright", async_playwright
+        ):
+            _run_pdf_worker(self.tmpdir, ["https://a", "https://b", "https://c"], [0, 1, 2], progress)
+
+        self.assertEqual(context.new_page.await_count, 3)
+        self.assertEqual(in_flight["max"], 3)
+        pages[0].wait_for_timeout.assert_not_awaited()
+        self.assertEqual(
+            [c.args[0] for c in pages[0].wait_for_load_state.await_args_list], ["load", "networkidle"]
+        )
+        paths = sorted(Path(c.kwargs["path"]).name for p in pages for c in p.pdf.await_args_list)
+        self.assertEqual(paths, ["Page.pdf", "Page_1.pdf", "Page_2.pdf"])
+        self.assertEqual(list(progress.queue)[-1], ("DONE", "3"))
+
+    def test_default_profile_dir_outside_output_tree(self) -> None:
+        """Without Args.pdf_profile_dir the profile lives under ~/.drp, not in base_output_dir."""
+        from interactive_collector.collector_state import get_base_output_dir, get_pdf_profile_dir
+
+        with patch("utils.Args.Args._initialized", False):
+            profile_dir = get_pdf_profile_dir()
+        self.assertEqual(profile_dir, Path.home() / ".drp" / "pdf-profile")
+        self.assertNotIn(get_base_output_dir(), profile_dir.parents)
+
+    @patch("interactive_collector.api_save.async_page_title_or_h1", new_callable=AsyncMock, return_value="Page")
+    def test_persistent_profile_from_pdf_profile_dir(self, _mock_title: AsyncMock) -> None:
+        """The shared profile is used when available; no separate browser is launched or closed."""
+        page = self._fake_page()
+        async_playwright, browser, context = self._fake_playwright([page], persistent=True)
+        progress: "queue.Queue[tuple]" = queue.Queue()
+        with patch("interactive_collector.api_save.get_pdf_profile_dir", return_value=self.tmpdir / "profile"), patch(
+            "playwright.async_api.async_playwright", async_playwright
+        ):
+            _run_pdf_worker(self.tmpdir, ["https://a"], [0], progress)
+
+        launch_persistent = async_playwright.return_value.__aenter__.return_value.chromium.launch_persistent_context
+        self.assertEqual(launch_persistent.await_args.args[0], str(self.tmpdir / "profile"))
+        browser.new_context.assert_not_awaited()
+        browser.close.assert_not_awaited()
+        context.close.assert_awaited_once()
+        self.assertEqual(list(progress.queue)[-1], ("DONE", "1"))
+
+    def _route_handler(self, env: dict) -> Any:
+        """Run the worker for one URL with env set and return the handler registered on the context."""
+        async_playwright, _browser, context = self._fake_playwright([self._fake_page()])
+        with patch.dict(os.environ, env), patch(
+            "interactive_collector.api_save.async_page_title_or_h1", new_callable=AsyncMock, return_value="Page"
+        ), patch("playwright.async_api.async_playwright", async_playwright):
+            _run_pdf_worker(self.tmpdir, ["https://a"], [0], queue.Queue())
+        self.assertEqual(context.route.await_args.args[0], "**/*")
+        return context.route.await_args.args[1]
+
+    def _aborted(self, handler: Any, resource_type: str) -> bool:
+        route = MagicMock()
+        route.request.resource_type = resource_type
+        route.abort = AsyncMock()
+        route.continue_ = AsyncMock()
+        asyncio.run(handler(route))
+        return route.abort.await_count == 1 and route.continue_.await_count == 0
+
+    def test_media_blocked_and_images_kept_by_default(self) -> None:
+        """Audio/video are always aborted; images, fonts and CSS load unless DRP_PDF_LEAN is set."""
+        handler = self._route_handler({"DRP_PDF_LEAN": ""})
+        self.assertTrue(self._aborted(handler, "media"))
+        for kept in ("image", "font", "stylesheet", "document", "script"):
+            self.assertFalse(self._aborted(handler, kept), kept)
+
+    def test_lean_mode_blocks_images_fonts_and_css(self) -> None:
+        """DRP_PDF_LEAN=1 also aborts images, fonts and stylesheets."""
+        handler = self._route_handler({"DRP_PDF_LEAN": "1"})
+        for blocked in ("media", "image", "font", "stylesheet"):
+            self.assertTrue(self._aborted(handler, blocked), blocked)
+        self.assertFalse(self._aborted(handler, "document"))
+
+    @patch("interactive_collector.api_save.async_page_title_or_h1", new_callable=AsyncMock, return_value="Page")
+    def test_urls_grouped_by_host_keeping_submitted_position(self, _mock_title: AsyncMock) -> None:
+        """Same-host URLs are visited back to back; SAVING still reports each URL's submitted position."""
+        page = self._fake_page()
+        async_playwright, _browser, _context = self._fake_playwright([page])
+        urls = ["https://b.example/1", "https://a.example/1", "https://b.example/2", "https://a.example/2"]
+        progress: "queue.Queue[tuple]" = queue.Queue()
+        with patch("interactive_collector.api_save._PDF_CONCURRENCY", 1), patch(
+            "playwright.async_api.async_playwright", async_playwright
+        ):
+            _run_pdf_worker(self.tmpdir, urls, [0, 1, 2, 3], progress)
+
+        visited = [c.args[0] for c in page.goto.await_args_list]
+        self.assertEqual(
+            visited, ["https://a.example/1", "https://a.example/2", "https://b.example/1", "https://b.example/2"]
+        )
+        saving = [item[1:3] for item in progress.queue if item[0] == "SAVING"]
+        self.assertEqual(saving[0], ("https://a.example/1", "2"))
+        self.assertEqual(saving[-1], ("https://b.example/2", "3"))
+
+
+class TestGenerateSaveProgress(unittest.TestCase):
+    """Tests for the streamed save progress generator."""
+
+    def test_burst_sent_as_one_chunk_with_on_done_before_done(self) -> None:
+        """Items already queued are drained into one chunk; on_done runs before DONE is yielded."""
+        calls: list[str] = []
+
+        def fake_worker(_folder, _urls, _indices, progress_queue, **_kwargs) -> None:
+            progress_queue.put(("SAVING", "https://a", "1", "2"))
+            progress_queue.put(("ERROR", "boom"))
+            progress_queue.put(("SAVING", "https://b", "2", "2"))
+            progress_queue.put(("DONE", "1"))
+
+        class InlineThread:
+            """Runs the worker on start() so every item is queued before the generator reads."""
+
+            def __init__(self, target, args, kwargs, daemon) -> None:
+                self._run = lambda: target(*args, **kwargs)
+
+            def start(self) -> None:
+                self._run()
+
+            def join(self, timeout: float | None = None) -> None:
+                pass
+
+        with patch("interactive_collector.api_save._run_pdf_worker", side_effect=fake_worker), patch(
+            "interactive_collector.api_save.threading.Thread", InlineThread
+        ):
+            chunks = list(
+                generate_save_progress(Path("."), ["https://a", "https://b"], [0, 1], on_done=lambda: calls.append("saved"))
+            )
+
+        self.assertEqual(
+            chunks,
+            ["SAVING\thttps://a\t1\t2\nERROR\tboom\nSAVING\thttps://b\t2\t2\nDONE\t1\n"],
+        )
+        self.assertEqual(calls, ["saved"])
+
+
+class TestApiSave(unittest.TestCase):
+    """Tests for /api/save request parsing."""
+
+    def setUp(self) -> None:
+        self.client = app.test_client()
+        self.tmpdir = Path(tempfile.mkdtemp())
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_invalid_scoreboard_json_returns_400(self) -> None:
+        """POST /api/save with malformed or non-array scoreboard_urls_json returns 400."""
+        for urls_json in ("[not json", '{"a": 1}'):
+            resp = self.client.post(
+                "/api/save",
+                data={"folder_path": str(self.tmpdir), "scoreboard_urls_json": urls_json, "save_url": "0"},
+            )
+            self.assertEqual(resp.status_code, 400)
+
+    def test_indices_parsed_once_before_generation(self) -> None:
+        """Posted save_url values reach generate_save_progress as validated ints."""
+        with patch(
+            "interactive_collector.api_save.generate_save_progress", return_value=iter(["DONE\t0\n"])
+        ) as mock_gen:
+            resp = self.client.post(
+                "/api/save",
+                data={
+                    "folder_path": str(self.tmpdir),
+                    "scoreboard_urls_json": json.dumps(["https://a", "https://b"]),
+                    "save_url": ["1", "x", "1", "5", "0"],
+                },
+            )
+            resp.get_data()
+        self.assertEqual(mock_gen.call_args.args[2], [1, 0])
+
+    def test_metadata_only_save_writes_once(self) -> None:
+        """Without checked pages, metadata is saved immediately, once."""
+        with patch("interactive_collector.api_save.save_metadata") as mock_save:
+            resp = self.client.post("/api/save", data={"drpid": "3", "metadata_title": " T "})
+            self.assertEqual(resp.get_data(as_text=True), "DONE\t0\n")
+        mock_save.assert_called_once()
+        self.assertEqual(mock_save.call_args.args, (3, ""))
+        self.assertEqual(mock_save.call_args.kwargs["title"], "T")
+
+    def test_pdf_save_defers_metadata_to_done(self) -> None:
+        """With checked pages, metadata is saved by the progress generator, not up front."""
+        with patch("interactive_collector.api_save.save_metadata") as mock_save, \
+                patch("interactive_collector.api_save.generate_save_progress", return_value=iter([])) as mock_gen:
+            self.client.post(
+                "/api/save",
+                data={
+                    "drpid": "3",
+                    "folder_path": str(self.tmpdir),
+                    "scoreboard_urls_json": json.dumps(["https://a"]),
+                    "save_url": "0",
+                },
+            ).get_data()
+            mock_save.assert_not_called()
+            mock_gen.call_args.kwargs["on_done"]()
+        mock_save.assert_called_once()
+        self.assertEqual(mock_save.call_args.args, (3, str(self.tmpdir)))
+
+    def test_parse_save_indices(self) -> None:
+        """parse_save_indices keeps order and drops invalid, out-of-range, and repeated values."""
+        self.assertEqual(parse_save_indices(["2", "-1", "a", "0", "2", "3"], 3), [2, 0])
+
 
 class TestApiNoLinks(unittest.TestCase):
     """Tests for /api/no-links."""
@@ -366,7 +930,7 @@ class TestApiNoLinks(unittest.TestCase):
 
     def test_no_links_success(self) -> None:
         """POST /api/no-links with valid drpid updates storage and returns 200."""
-        with patch("storage.Storage") as mock_storage:
+        with patch("interactive_collector.api.Storage") as mock_storage:
             resp = self.client.post(
                 "/api/no-links",
                 json={"drpid": 1},
@@ -375,6 +939,7 @@ class TestApiNoLinks(unittest.TestCase):
         self.assertEqual(resp.status_code, 200)
         data = json.loads(resp.data)
         self.assertEqual(data.get("ok"), True)
+        mock_storage.update_record.assert_called_once_with(1, {"status": "no_links"})
 
 
 class TestApiSkip(unittest.TestCase):
@@ -434,6 +999,27 @@ class TestApiSkip(unittest.TestCase):
         self.assertEqual(row["status"], "no dataset")
         self.assertEqual(row["title"], "Site Title")
 
+    def test_skip_form_body_saves_metadata(self) -> None:
+        from storage import Storage
+
+        drpid = Storage.create_record("https://skip-test.example/form")
+        folder = Path(self.tmpdir) / "out_form"
+        folder.mkdir()
+        resp = self.client.post(
+            "/api/skip",
+            data={
+                "drpid": str(drpid),
+                "skip_type": "No Dataset",
+                "folder_path": str(folder),
+                "metadata_title": "  Form Title ",
+                "metadata_agency": "EPA",
+            },
+        )
+        self.assertEqual(resp.status_code, 200)
+        row = Storage.get(drpid)
+        assert row is not None
+        self.assertEqual((row["status"], row["title"], row["agency"]), ("no dataset", "Form Title", "EPA"))
+
     def test_skip_gigantic_upload_status(self) -> None:
         from storage import Storage
 
@@ -707,6 +1293,41 @@ class TestApiPipeline(unittest.TestCase):
         self.assertIn("interactive_collector", mods)
         self.assertNotIn("noop", mods)
 
+    def test_modules_registry_is_cached_and_read_only(self) -> None:
+        """_modules returns the same read-only view on every call."""
+        self.assertIs(_modules(), _modules())
+        with self.assertRaises(TypeError):
+            _modules()["extra"] = {}  # type: ignore[index]
+
+    def test_kill_after_escalates_only_on_timeout(self) -> None:
+        """_kill_after kills a process that ignores SIGTERM, and leaves one that exits alone."""
+        stuck = MagicMock()
+        stuck.wait.side_effect = subprocess.TimeoutExpired("main.py", 3.0)
+        _kill_after(stuck, 3.0)
+        stuck.kill.assert_called_once()
+
+        exited = MagicMock()
+        _kill_after(exited, 3.0)
+        exited.kill.assert_not_called()
+
+    def test_stop_terminates_then_kills_hung_run(self) -> None:
+        """POST /api/pipeline/stop sends SIGTERM and escalates to kill after the grace period."""
+        proc = MagicMock()
+        proc.poll.return_value = None
+        proc.wait.side_effect = subprocess.TimeoutExpired("main.py", 0.0)
+        with patch("interactive_collector.api_pipeline._current_proc", proc), patch(
+            "interactive_collector.api_pipeline._TERMINATE_GRACE_SEC", 0.0
+        ), patch("interactive_collector.api_pipeline._STOP_FILE") as stop_file:
+            resp = self.client.post("/api/pipeline/stop")
+            for _ in range(200):
+                if proc.kill.called:
+                    break
+                time.sleep(0.01)
+        self.assertEqual(resp.status_code, 200)
+        stop_file.touch.assert_called_once()
+        proc.terminate.assert_called_once()
+        proc.kill.assert_called_once()
+
     def test_pipeline_run_requires_module(self) -> None:
         """POST /api/pipeline/run without module returns 400."""
         resp = self.client.post(
@@ -756,16 +1377,15 @@ class TestApiPipeline(unittest.TestCase):
             b"",
         ]
 
-        def _read(_n: int = 8192) -> bytes:
+        def _read(_fd: int, _n: int) -> bytes:
             return _reads.pop(0) if _reads else b""
 
-        proc.stdout.read = _read
         proc.poll.return_value = 0
         proc.wait.return_value = 0
         with patch(
             "interactive_collector.api_pipeline.subprocess.Popen",
             return_value=proc,
-        ) as mock_popen:
+        ) as mock_popen, patch("interactive_collector.api_pipeline.os.read", side_effect=_read):
             resp = self.client.post(
                 "/api/pipeline/run",
                 json={"module": "noop"},
@@ -779,6 +1399,36 @@ class TestApiPipeline(unittest.TestCase):
             call_args = mock_popen.call_args[0][0]
             self.assertIn("noop", call_args)
 
+    def test_pipeline_run_batches_lines_per_read(self) -> None:
+        """Each pipe read becomes one NDJSON frame; partial lines wait for their newline."""
+        proc = unittest.mock.MagicMock()
+        reads = [b"a\nb\r\nc", b"d\ne\n", b"tail", b""]
+        proc.poll.return_value = 0
+        with patch("interactive_collector.api_pipeline.subprocess.Popen", return_value=proc), patch(
+            "interactive_collector.api_pipeline.os.read", side_effect=lambda _fd, _n: reads.pop(0)
+        ):
+            resp = self.client.post("/api/pipeline/run", json={"module": "noop"})
+            frames = [json.loads(r) for r in resp.data.decode("utf-8").splitlines()]
+        self.assertEqual([f["line"] for f in frames[2:]], ["a\nb\n", "cd\ne\n", "tail\n"])
+
+    def test_pipeline_run_child_env(self) -> None:
+        """The child writes unbuffered UTF-8 so the decoder sees live, correctly encoded lines."""
+        proc = unittest.mock.MagicMock()
+        proc.poll.return_value = 0
+        with patch(
+            "interactive_collector.api_pipeline.subprocess.Popen", return_value=proc
+        ) as mock_popen, patch("interactive_collector.api_pipeline.os.read", return_value=b""):
+            self.client.post("/api/pipeline/run", json={"module": "noop"}).get_data()
+        env = mock_popen.call_args.kwargs["env"]
+        self.assertEqual(env["PYTHONUNBUFFERED"], "1")
+        self.assertEqual(env["PYTHONIOENCODING"], "utf-8")
+
+    def test_split_complete_lines(self) -> None:
+        """_split_complete_lines keeps the trailing partial line for the next read."""
+        self.assertEqual(_split_complete_lines("a\r\nb"), ("a\n", "b"))
+        self.assertEqual(_split_complete_lines("abc"), ("", "abc"))
+        self.assertEqual(_split_complete_lines("a\n"), ("a\n", ""))
+
 
 class TestApiChat(unittest.TestCase):
     """Tests for /api/chat/* endpoints."""
@@ -0,0 +1,192 @@
+"""Tests for interactive_collector.api_download."""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import requests
+import urllib3
+
+from interactive_collector.api_download import (
+    _create_unique_download_file,
+    _extension_from_content_type,
+    _filename_from_content_disposition,
+    generate_download_progress,
+)
+from interactive_collector.api_scoreboard import clear_scoreboard
+from interactive_collector.collector_state import get_result_by_drpid, get_scoreboard
+
+
+class TestFilenameFromContentDisposition(unittest.TestCase):
+    def test_quoted_and_plain(self) -> None:
+        self.assertEqual(_filename_from_content_disposition('attachment; filename="a b.pdf"'), "a b.pdf")
+        self.assertEqual(_filename_from_content_disposition("inline; filename=plain.txt;"), "plain.txt")
+
+    def test_rfc5987_preferred_and_decoded(self) -> None:
+        self.assertEqual(
+            _filename_from_content_disposition("attachment; filename=x.csv; filename*=UTF-8''%E2%82%AC%20rates.csv"),
+            "\u20ac rates.csv",
+        )
+
+    def test_missing(self) -> None:
+        self.assertIsNone(_filename_from_content_disposition(None))
+        self.assertIsNone(_filename_from_content_disposition("attachment"))
+
+
+class TestExtensionFromContentType(unittest.TestCase):
+    def test_parameters_and_case_are_ignored(self) -> None:
+        self.assertEqual(_extension_from_content_type("text/csv; charset=utf-8"), ".csv")
+        self.assertEqual(_extension_from_content_type("Application/PDF"), ".pdf")
+
+    def test_unknown_or_missing(self) -> None:
+        self.assertEqual(_extension_from_content_type("application/octet-stream"), "")
+        self.assertEqual(_extension_from_content_type(None), "")
+
+
+class TestCreateUniqueDownloadFile(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp())
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _create(self, base: str, ext: str) -> str:
+        name, fd = _create_unique_download_file(self.tmpdir, base, ext)
+        os.close(fd)
+        return name
+
+    def test_first_name_is_base_with_ext(self) -> None:
+        self.assertEqual(self._create("report", ".pdf"), "report.pdf")
+        self.assertTrue((self.tmpdir / "report.pdf").is_file())
+
+    def test_collisions_get_numeric_suffix(self) -> None:
+        (self.tmpdir / "data.csv").write_bytes(b"x")
+        self.assertEqual(self._create("data", ".csv"), "data_1.csv")
+        self.assertEqual(self._create("data", ".csv"), "data_2.csv")
+        self.assertEqual((self.tmpdir / "data.csv").read_bytes(), b"x")
+
+    def test_no_extension_and_default_base(self) -> None:
+        self.assertEqual(self._create("", ""), "download")
+        self.assertEqual(self._create("download", ""), "download_1")
+
+    def test_fd_is_writable(self) -> None:
+        name, fd = _create_unique_download_file(self.tmpdir, "f", ".bin")
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"abc")
+        self.assertEqual((self.tmpdir / name).read_bytes(), b"abc")
+
+
+class TestGenerateDownloadProgress(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp())
+        get_result_by_drpid().clear()
+        clear_scoreboard()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+        get_result_by_drpid().clear()
+        clear_scoreboard()
+
+    @patch("interactive_collector.api_download._SESSION")
+    def test_reads_raw_blocks_and_records_download(self, mock_session: MagicMock) -> None:
+        resp = MagicMock(headers={"Content-Type": "text/csv", "Content-Length": "6"})
+        resp.raw = io.BytesIO(b"a,b\n1\n")
+        mock_session.get.return_value = resp
+
+        lines = list(generate_download_progress("https://x.example/d.csv", str(self.tmpdir), 3, None))
+
+        self.assertEqual(lines[0], "SAVING\td.csv\n")
+        self.assertEqual(lines[-1], "DONE\td.csv\t6\tcsv\n")
+        self.assertTrue(resp.raw.decode_content)
+        self.assertEqual((self.tmpdir / "d.csv").read_bytes(), b"a,b\n1\n")
+        self.assertEqual(get_result_by_drpid()[3]["downloads"][0]["size"], 6)
+
+    @patch("interactive_collector.api_download._SESSION")
+    def test_download_recorded_before_done(self, mock_session: MagicMock) -> None:
+        resp = MagicMock(headers={"Content-Type": "text/csv"})
+        resp.raw = io.BytesIO(b"a,b\n")
+        mock_session.get.return_value = resp
+
+        for line in generate_download_progress("https://x.example/o.csv", str(self.tmpdir), 3, None):
+            if line.startswith("DONE"):
+                break
+
+        self.assertEqual(get_scoreboard()[-1]["filename"], "o.csv")
+        self.assertEqual(len(get_result_by_drpid()[3]["downloads"]), 1)
+
+    @patch("interactive_collector.api_download._SESSION")
+    def test_read_error_yields_error_line(self, mock_session: MagicMock) -> None:
+        resp = MagicMock(headers={"Content-Type": "application/pdf"})
+        resp.raw.read.side_effect = urllib3.exceptions.ProtocolError("connection reset")
+        mock_session.get.return_value = resp
+
+        lines = list(generate_download_progress("https://x.example/r.pdf", str(self.tmpdir), 3, None))
+
+        self.assertTrue(lines[-1].startswith("ERROR\t"))
+
+    @unittest.skipUnless(hasattr(os, "posix_fallocate"), "posix_fallocate not available")
+    @patch("interactive_collector.api_download._PREALLOCATE_MIN_BYTES", 1)
+    @patch("interactive_collector.api_download._SESSION")
+    def test_preallocated_file_trimmed_to_body(self, mock_session: MagicMock) -> None:
+        resp = MagicMock(headers={"Content-Type": "text/csv", "Content-Length": "64"})
+        resp.raw = io.BytesIO(b"a,b\n1\n")
+        mock_session.get.return_value = resp
+
+        with patch("interactive_collector.api_download.os.posix_fallocate", wraps=os.posix_fallocate) as mock_alloc:
+            lines = list(generate_download_progress("https://x.example/p.csv", str(self.tmpdir), 3, None))
+
+        mock_alloc.assert_called_once()
+        self.assertEqual(lines[-1], "DONE\tp.csv\t6\tcsv\n")
+        self.assertEqual((self.tmpdir / "p.csv").read_bytes(), b"a,b\n1\n")
+
+    @patch("interactive_collector.api_download._SESSION")
+    def test_response_closed_on_http_error_read_error_and_disconnect(self, mock_session: MagicMock) -> None:
+        http_error = MagicMock(headers={})
+        http_error.raise_for_status.side_effect = requests.HTTPError("503 Server Error")
+        read_error = MagicMock(headers={"Content-Type": "text/csv"})
+        read_error.raw.read.side_effect = urllib3.exceptions.ProtocolError("connection reset")
+        for resp in (http_error, read_error):
+            mock_session.get.return_value = resp
+            lines = list(generate_download_progress("https://x.example/c.csv", str(self.tmpdir), 3, None))
+            self.assertTrue(lines[-1].startswith("ERROR\t"))
+            resp.close.assert_called_once()
+
+        disconnected = MagicMock(headers={"Content-Type": "text/csv"})
+        disconnected.raw = io.BytesIO(b"a,b\n")
+        mock_session.get.return_value = disconnected
+        gen = generate_download_progress("https://x.example/d.csv", str(self.tmpdir), 3, None)
+        self.assertTrue(next(gen).startswith("SAVING\t"))
+        gen.close()
+        disconnected.close.assert_called_once()
+
+    @patch("interactive_collector.api_download._PREALLOCATE_MIN_BYTES", 1)
+    @patch("interactive_collector.api_download._SESSION")
+    def test_read_error_removes_partial_file(self, mock_session: MagicMock) -> None:
+        resp = MagicMock(headers={"Content-Type": "text/csv", "Content-Length": "64"})
+        resp.raw.read.side_effect = [b"a,b\n", urllib3.exceptions.ProtocolError("connection reset")]
+        mock_session.get.return_value = resp
+
+        lines = list(generate_download_progress("https://x.example/e.csv", str(self.tmpdir), 3, None))
+
+        self.assertTrue(lines[-1].startswith("ERROR\t"))
+        self.assertEqual(list(self.tmpdir.iterdir()), [])
+        self.assertNotIn(3, get_result_by_drpid())
+
+    @patch("interactive_collector.api_download._SESSION")
+    def test_encoded_downloads_not_preallocated(self, mock_session: MagicMock) -> None:
+        resp = MagicMock(headers={"Content-Length": str(64 * 1024 * 1024), "Content-Encoding": "gzip"})
+        resp.raw = io.BytesIO(b"x")
+        mock_session.get.return_value = resp
+
+        with patch("interactive_collector.api_download._preallocate") as mock_prealloc:
+            list(generate_download_progress("https://x.example/g.bin", str(self.tmpdir), 3, None))
+        mock_prealloc.assert_not_called()
+        self.assertEqual((self.tmpdir / "g.bin").stat().st_size, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Tests for interactive_collector.api_download_jobs."""
+
+import time
+import unittest
+from unittest.mock import patch
+
+from interactive_collector import api_download_jobs
+from interactive_collector.api_download_jobs import _apply_progress_line, get_download_job, start_download_job
+
+
+class TestApplyProgressLine(unittest.TestCase):
+    def test_lines_update_state(self) -> None:
+        job = {"state": "queued", "written": 0, "total": None, "filename": None, "error": None}
+        _apply_progress_line(job, "SAVING\ta.pdf\n")
+        self.assertEqual((job["state"], job["filename"]), ("saving", "a.pdf"))
+        _apply_progress_line(job, "PROGRESS\t10\t20\n")
+        self.assertEqual((job["written"], job["total"]), (10, 20))
+        _apply_progress_line(job, "PROGRESS\t15\t\n")
+        self.assertEqual((job["written"], job["total"]), (15, None))
+        _apply_progress_line(job, "DONE\ta.pdf\t20\tpdf\n")
+        self.assertEqual((job["state"], job["written"]), ("done", 20))
+
+    def test_error_line(self) -> None:
+        job = {"state": "saving"}
+        _apply_progress_line(job, "ERROR\tboom\n")
+        self.assertEqual((job["state"], job["error"]), ("error", "boom"))
+
+
+class TestDownloadJobs(unittest.TestCase):
+    def tearDown(self) -> None:
+        api_download_jobs._jobs.clear()
+        api_download_jobs._finished_at.clear()
+
+    def test_job_runs_on_pool_and_reports_done_once(self) -> None:
+        lines = ["SAVING\td.csv\n", "DONE\td.csv\t6\tcsv\n"]
+        with patch("interactive_collector.api_download_jobs.generate_download_progress", return_value=iter(lines)):
+            job_id = start_download_job("https://x/d.csv", "/tmp", 1, None)
+            for _ in range(500):
+                status = get_download_job(job_id)
+                if status["state"] == "done":
+                    break
+                time.sleep(0.01)
+        self.assertEqual((status["state"], status["written"]), ("done", 6))
+        self.assertIsNone(get_download_job(job_id))
+
+    def test_exception_marks_job_error(self) -> None:
+        with patch("interactive_collector.api_download_jobs.generate_download_progress", side_effect=RuntimeError("x")):
+            job_id = "j"
+            api_download_jobs._jobs[job_id] = {"state": "queued"}
+            api_download_jobs._run_download_job(job_id, "u", "/tmp", 1, None)
+        self.assertIn(job_id, api_download_jobs._finished_at)
+        self.assertEqual(get_download_job(job_id), {"state": "error", "error": "x"})
+        self.assertEqual((api_download_jobs._jobs, api_download_jobs._finished_at), ({}, {}))
+
+    def test_running_job_kept_after_poll(self) -> None:
+        api_download_jobs._jobs["j"] = {"state": "saving"}
+        self.assertEqual(get_download_job("j"), {"state": "saving"})
+        self.assertIn("j", api_download_jobs._jobs)
+
+    def test_unpolled_finished_jobs_expire(self) -> None:
+        api_download_jobs._jobs.update(old={"state": "done"}, recent={"state": "done"}, running={"state": "saving"})
+        now = time.monotonic()
+        api_download_jobs._finished_at.update(old=now - api_download_jobs._FINISHED_JOB_TTL_S - 1, recent=now)
+        with patch("interactive_collector.api_download_jobs._DOWNLOAD_POOL"):
+            job_id = start_download_job("https://x/d.csv", "/tmp", 1, None)
+        self.assertEqual(set(api_download_jobs._jobs), {"recent", "running", job_id})
+        self.assertEqual(set(api_download_jobs._finished_at), {"recent"})
+
+    def test_unknown_job(self) -> None:
+        self.assertIsNone(get_download_job("missing"))
+
+if __name__ == "__main__":
+    unittest.main()
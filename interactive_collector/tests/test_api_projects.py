@@ -68,7 +68,7 @@ class TestEnsureOutputFolder(unittest.TestCase):
         marker = folder / "data.zip"
         marker.write_bytes(b"zip")
 
-        with patch("storage.Storage") as mock_storage, patch(
+        with patch("interactive_collector.api_projects.Storage") as mock_storage, patch(
             "interactive_collector.api_projects.get_base_output_dir"
         ) as mock_base:
             mock_storage.get.return_value = {"folder_path": str(folder)}
@@ -87,7 +87,7 @@ class TestEnsureOutputFolder(unittest.TestCase):
         marker = folder / "data.zip"
         marker.write_bytes(b"zip")
 
-        with patch("storage.Storage") as mock_storage, patch(
+        with patch("interactive_collector.api_projects.Storage") as mock_storage, patch(
             "interactive_collector.api_projects.get_base_output_dir"
         ) as mock_base:
             mock_storage.get.return_value = {"folder_path": str(folder)}
@@ -97,6 +97,27 @@ class TestEnsureOutputFolder(unittest.TestCase):
         self.assertTrue(folder.is_dir())
         self.assertFalse(marker.exists())
 
+    def test_record_passed_in_skips_storage_lookup(self) -> None:
+        """A caller that already loaded the project record does not trigger a second Storage.get."""
+        folder = self.tmpdir / "custom" / "DRP000012"
+        folder.mkdir(parents=True)
+
+        with patch("interactive_collector.api_projects.Storage") as mock_storage:
+            path = ensure_output_folder(12, record={"DRPID": 12, "folder_path": str(folder)})
+            mock_storage.get.assert_not_called()
+        self.assertEqual(path, str(folder))
+
+    def test_existing_result_entry_keeps_other_fields(self) -> None:
+        """Resolving the folder updates folder_path in place instead of replacing the result entry."""
+        folder = self.tmpdir / "custom" / "DRP000013"
+        folder.mkdir(parents=True)
+        get_result_by_drpid()[13] = {"downloads": ["a.csv"]}
+
+        path = ensure_output_folder(13, record={"DRPID": 13, "folder_path": str(folder)})
+
+        self.assertEqual(path, str(folder))
+        self.assertEqual(get_result_by_drpid()[13], {"downloads": ["a.csv"], "folder_path": str(folder)})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,59 @@
+"""Tests for interactive_collector.api_proxy_cache."""
+
+import unittest
+from unittest.mock import patch
+
+from interactive_collector import api_proxy_cache
+
+
+class TestProxyCache(unittest.TestCase):
+    def setUp(self) -> None:
+        api_proxy_cache.clear()
+
+    def tearDown(self) -> None:
+        api_proxy_cache.clear()
+
+    def test_ttl_from_headers(self) -> None:
+        self.assertEqual(api_proxy_cache.ttl_from_headers({}), api_proxy_cache.DEFAULT_TTL_SEC)
+        self.assertEqual(api_proxy_cache.ttl_from_headers({"Cache-Control": "public, max-age=60"}), 60.0)
+        self.assertIsNone(api_proxy_cache.ttl_from_headers({"Cache-Control": "No-Store"}))
+
+    def test_store_and_lookup(self) -> None:
+        api_proxy_cache.store("u", b"body", "text/css", '"e"', ttl=60)
+        entry = api_proxy_cache.lookup("u")
+        self.assertEqual((entry.body, entry.content_type, entry.etag), (b"body", "text/css", '"e"'))
+        self.assertTrue(entry.is_fresh())
+        self.assertIsNone(api_proxy_cache.lookup("other"))
+
+    def test_lru_eviction(self) -> None:
+        with patch.object(api_proxy_cache, "MAX_ENTRIES", 2):
+            api_proxy_cache.store("a", b"1", "t", None, 60)
+            api_proxy_cache.store("b", b"2", "t", None, 60)
+            api_proxy_cache.lookup("a")
+            api_proxy_cache.store("c", b"3", "t", None, 60)
+        self.assertIsNotNone(api_proxy_cache.lookup("a"))
+        self.assertIsNone(api_proxy_cache.lookup("b"))
+
+    def test_refresh_extends_stale_entry(self) -> None:
+        api_proxy_cache.store("u", b"body", "t", '"e"', ttl=-1)
+        self.assertFalse(api_proxy_cache.lookup("u").is_fresh())
+        self.assertTrue(api_proxy_cache.refresh("u", 60).is_fresh())
+        self.assertIsNone(api_proxy_cache.refresh("missing", 60))
+
+    def test_tee_caches_complete_small_body(self) -> None:
+        out = list(api_proxy_cache.tee_into_cache("u", [b"ab", b"c"], "t", None, 60))
+        self.assertEqual(out, [b"ab", b"c"])
+        self.assertEqual(api_proxy_cache.lookup("u").body, b"abc")
+
+    def test_tee_skips_oversized_and_partial_bodies(self) -> None:
+        with patch.object(api_proxy_cache, "MAX_BODY_BYTES", 2):
+            self.assertEqual(list(api_proxy_cache.tee_into_cache("big", [b"ab", b"c"], "t", None, 60)), [b"ab", b"c"])
+        self.assertIsNone(api_proxy_cache.lookup("big"))
+        gen = api_proxy_cache.tee_into_cache("partial", [b"a", b"b"], "t", None, 60)
+        next(gen)
+        gen.close()
+        self.assertIsNone(api_proxy_cache.lookup("partial"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for interactive_collector.api_scoreboard."""
+
+import threading
+import unittest
+
+from interactive_collector.api_scoreboard import (
+    add_download,
+    add_to_scoreboard,
+    clear_scoreboard,
+    get_scoreboard_snapshot,
+    get_scoreboard_tree,
+    get_scoreboard_urls,
+    has_url,
+    scoreboard_etag,
+)
+from interactive_collector.collector_state import get_scoreboard, scoreboard_url_index, state_lock
+
+
+class TestScoreboardSnapshot(unittest.TestCase):
+    """Tests for get_scoreboard_snapshot."""
+
+    def setUp(self) -> None:
+        clear_scoreboard()
+
+    def tearDown(self) -> None:
+        clear_scoreboard()
+
+    def test_snapshot_matches_tree_and_urls(self) -> None:
+        """The one-pass snapshot equals the separately built tree and URL list."""
+        add_to_scoreboard("https://src", None, "OK")
+        add_to_scoreboard("https://src/a", "https://src", "OK")
+        add_to_scoreboard("https://src/a", "https://src", "OK")
+        add_to_scoreboard("https://orphan", "https://elsewhere", "404")
+        add_download("https://src/f.csv", "https://src/a", "/tmp/f.csv", 10, "csv", "f.csv")
+
+        snap = get_scoreboard_snapshot()
+
+        self.assertEqual(snap["tree"], get_scoreboard_tree())
+        self.assertEqual(snap["urls"], get_scoreboard_urls())
+        self.assertEqual([n["url"] for n in snap["tree"]], ["https://src", "https://orphan"])
+        children = snap["tree"][0]["children"]
+        self.assertEqual([c["idx"] for c in children], [1, 2])
+        self.assertEqual(children[0]["children"][0]["filename"], "f.csv")
+
+    def test_snapshot_waits_for_state_lock(self) -> None:
+        """The snapshot is built under state_lock, so it never sees a half-applied mutation."""
+        add_to_scoreboard("https://src", None, "OK")
+        result: list = []
+        with state_lock():
+            worker = threading.Thread(target=lambda: result.append(get_scoreboard_snapshot()))
+            worker.start()
+            worker.join(0.1)
+            self.assertTrue(worker.is_alive())
+            add_download("https://src/f.csv", "https://src", "/tmp/f.csv", 1, "csv", "f.csv")
+        worker.join(5)
+        self.assertEqual(result[0]["urls"], ["https://src", "https://src/f.csv"])
+
+    def test_snapshot_empty(self) -> None:
+        """An empty scoreboard gives an empty tree and URL list."""
+        self.assertEqual(get_scoreboard_snapshot(), {"tree": [], "urls": []})
+
+
+class TestScoreboardEtag(unittest.TestCase):
+    """Tests for scoreboard_etag."""
+
+    def setUp(self) -> None:
+        clear_scoreboard()
+
+    def tearDown(self) -> None:
+        clear_scoreboard()
+
+    def test_every_mutation_changes_etag(self) -> None:
+        """Adding a page, adding a download and clearing each produce a new ETag."""
+        seen = {scoreboard_etag()}
+        add_to_scoreboard("https://a", None, "OK")
+        seen.add(scoreboard_etag())
+        add_download("https://a/f.csv", "https://a", "/tmp/f.csv", 1, "csv")
+        seen.add(scoreboard_etag())
+        clear_scoreboard()
+        seen.add(scoreboard_etag())
+        self.assertEqual(len(seen), 4)
+
+    def test_etag_stable_without_mutation(self) -> None:
+        """The ETag does not change between reads when nothing is mutated."""
+        add_to_scoreboard("https://a", None, "OK")
+        self.assertEqual(scoreboard_etag(), scoreboard_etag())
+
+
+class TestScoreboardUrlIndex(unittest.TestCase):
+    """Tests for the scoreboard URL index behind dupe checks and has_url."""
+
+    def setUp(self) -> None:
+        clear_scoreboard()
+
+    def tearDown(self) -> None:
+        clear_scoreboard()
+
+    def test_dupes_and_has_url_follow_clears(self) -> None:
+        """Dupe flags and has_url reflect the scoreboard after it is cleared."""
+        add_to_scoreboard("https://a", None, "OK")
+        add_to_scoreboard("https://a", None, "OK")
+        self.assertEqual([n["is_dupe"] for n in get_scoreboard()], [False, True])
+        clear_scoreboard()
+        self.assertFalse(has_url("https://a"))
+        add_to_scoreboard("https://a", None, "OK")
+        self.assertFalse(get_scoreboard()[0]["is_dupe"])
+
+    def test_index_catches_up_with_direct_appends_and_clears(self) -> None:
+        """The index picks up entries appended or cleared directly on the list."""
+        board = get_scoreboard()
+        board.append({"url": "https://x", "referrer": None, "status_label": "OK"})
+        board.append({"url": "https://x/c", "referrer": "https://x", "status_label": "OK"})
+        self.assertEqual(scoreboard_url_index(), {"https://x": 0, "https://x/c": 1})
+        self.assertEqual([c["url"] for c in get_scoreboard_tree()[0]["children"]], ["https://x/c"])
+        board.clear()
+        board.append({"url": "https://y", "referrer": None, "status_label": "OK"})
+        self.assertEqual(scoreboard_url_index(), {"https://y": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,13 @@
 Unit tests for the Interactive Collector Flask app.
 """
 
+import html
+import json
+import re
 import tempfile
+import time
 import unittest
+from datetime import date
 from pathlib import Path
 from typing import Dict
 from unittest.mock import MagicMock, patch
@@ -13,7 +18,10 @@ from interactive_collector.app import (
     _base_url_for_page,
     _folder_extensions_and_size,
     _format_file_size,
+    _h1_from_html,
+    _inject_base_and_rewrite_links,
     _inject_base_into_html,
+    _metadata_for_template,
     _normalize_date_yyyy_mm_dd,
     _rewrite_links_to_app,
     _status_label,
@@ -54,6 +62,20 @@ class TestBaseInjection(unittest.TestCase):
         self.assertIn("<head>", result)
         self.assertIn("<body>", result)
 
+    def test_inject_base_into_html_only_first_head(self) -> None:
+        """Base is inserted once, right after the first (case-insensitive) <head> tag."""
+        html_body = '<HTML><HEAD lang="en"><title>t</title></HEAD><body><head></head></body></HTML>'
+        result = _inject_base_into_html(html_body, "https://example.com/dir/")
+        self.assertTrue(result.startswith('<HTML><HEAD lang="en"><base href="https://example.com/dir/">'))
+        self.assertEqual(result.count("<base "), 1)
+
+    def test_inject_base_into_html_head_after_html(self) -> None:
+        """When <html> precedes <head>, base goes into the existing head, not a new one."""
+        html_body = '<html lang="en"><!-- x --><Head><title>t</title></Head><body></body></html>'
+        result = _inject_base_into_html(html_body, "https://example.com/dir/")
+        self.assertIn('<Head><base href="https://example.com/dir/">', result)
+        self.assertEqual(result.lower().count("<head"), 1)
+
     def test_inject_base_into_html_fragment_prepends(self) -> None:
         """When there is no <html>, base is prepended at start."""
         html_body = "<div><p>Fragment</p></div>"
@@ -154,6 +176,28 @@ class TestRewriteLinks(unittest.TestCase):
         self.assertIn("linked_url=", result)
 
 
+class TestInjectBaseAndRewriteLinks(unittest.TestCase):
+    """Tests for _inject_base_and_rewrite_links."""
+
+    def test_matches_two_step_result(self) -> None:
+        """The fused walk returns exactly what base injection followed by rewriting does."""
+        page_url = "https://example.com/dir/page"
+        bodies = [
+            '<html><head><title>t</title></head><body><a href="/x">x</a><a href="#top">t</a></body></html>',
+            '<a href="/before">b</a><HTML lang="en"><body><a href=\'https://o.org/\'>o</a></body></HTML>',
+            '<div><a class="c" href="rel/path">r</a></div>',
+            '<a href="/x">x</a>',
+            "",
+        ]
+        for body in bodies:
+            expected = _rewrite_links_to_app(
+                _inject_base_into_html(body, page_url), page_url, "http://app", "https://src", page_url, drpid="7"
+            )
+            self.assertEqual(
+                _inject_base_and_rewrite_links(body, page_url, "http://app", "https://src", drpid="7"), expected
+            )
+
+
 class TestUniquePdfBasename(unittest.TestCase):
     """Tests for _unique_pdf_basename."""
 
@@ -190,6 +234,59 @@ class TestStatusLabel(unittest.TestCase):
         self.assertEqual(_status_label(-1, False), "Error (-1)")
 
 
+class TestH1FromHtml(unittest.TestCase):
+    """Tests for _h1_from_html helper."""
+
+    def test_str_and_bytes_bodies(self) -> None:
+        """Test the first h1 text is returned with inner tags removed, for str and bytes."""
+        body = '<html><H1 class="x">\n <span>Data \u20ac</span> set </H1><h1>Second</h1></html>'
+        self.assertEqual(_h1_from_html(body), "Data \u20ac set")
+        self.assertEqual(_h1_from_html(body.encode("utf-8")), "Data \u20ac set")
+
+    def test_many_unclosed_h1_is_linear(self) -> None:
+        """Test a page of unclosed <h1> tags returns "" quickly instead of rescanning per tag."""
+        body = "<h1>x" * 50000
+        start = time.monotonic()
+        self.assertEqual(_h1_from_html(body), "")
+        self.assertEqual(_h1_from_html(body.encode()), "")
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_stray_close_before_first_h1(self) -> None:
+        """Test a </h1> before the first <h1> is ignored."""
+        self.assertEqual(_h1_from_html("</h1><p>a</p><h1>Title</h1>"), "Title")
+
+    def test_missing_or_empty(self) -> None:
+        """Test bodies without an h1 (or empty) return an empty string."""
+        for body in ("", b"", None, "<p>no heading</p>", b"   "):
+            self.assertEqual(_h1_from_html(body), "")
+
+
+class TestMetadataForTemplate(unittest.TestCase):
+    """Tests for _metadata_for_template."""
+
+    def test_no_drpid_gives_empty_fields_and_h1_title(self) -> None:
+        """Without a project every field is empty except the title taken from the h1."""
+        meta = _metadata_for_template(app, None, " Heading ")
+        self.assertEqual(meta["metadata_title"], "Heading")
+        self.assertEqual({k for k, v in meta.items() if v}, {"metadata_title"})
+
+    @patch("interactive_collector.app._get_project_by_drpid", return_value=None)
+    def test_missing_project_falls_back_to_today(self, _mock_get: MagicMock) -> None:
+        """An unknown DRPID yields empty fields and today's download date."""
+        meta = _metadata_for_template(app, "42")
+        self.assertEqual(meta["metadata_title"], "")
+        self.assertEqual(meta["metadata_download_date"], date.today().isoformat())
+
+    @patch("interactive_collector.app._get_project_by_drpid")
+    def test_project_fields_and_none_values(self, mock_get: MagicMock) -> None:
+        """Project values fill the fields; None values become empty strings."""
+        mock_get.return_value = {"title": "T", "agency": None, "download_date": "2024-1-5"}
+        meta = _metadata_for_template(app, "1")
+        self.assertEqual(meta["metadata_title"], "T")
+        self.assertEqual(meta["metadata_agency"], "")
+        self.assertEqual(meta["metadata_download_date"], "2024-01-05")
+
+
 class TestNormalizeDate(unittest.TestCase):
     """Tests for _normalize_date_yyyy_mm_dd (preload download_date as YYYY-MM-DD)."""
 
@@ -225,6 +322,14 @@ class TestFormatFileSize(unittest.TestCase):
         self.assertEqual(_format_file_size(1024 * 1024), "1.0 MB")
         self.assertEqual(_format_file_size(1024 * 1024 * 2), "2.0 MB")
 
+    def test_unit_boundaries_and_cap(self) -> None:
+        self.assertEqual(_format_file_size(1023), "1023 B")
+        self.assertEqual(_format_file_size(-5), "0 B")
+        self.assertEqual(_format_file_size(1024 * 1024 - 1), "1024.0 KB")
+        self.assertEqual(_format_file_size(3 * 1024**3), "3.0 GB")
+        self.assertEqual(_format_file_size(1024**4), "1.0 TB")
+        self.assertEqual(_format_file_size(5 * 1024**5), "5120.0 TB")
+
 
 class TestFolderExtensionsAndSize(unittest.TestCase):
     """Tests for _folder_extensions_and_size."""
@@ -254,13 +359,23 @@ class TestAppRoutes(unittest.TestCase):
     def setUp(self) -> None:
         """Create test client and clear scoreboard so tests don't affect each other."""
         import interactive_collector.app as app_module
-        app_module._scoreboard = []
+        app_module._reset_scoreboard()
+        app_module._clear_pane_cache()
+        # Route tests never open a real database: Storage is an empty mock (counts as
+        # initialized) unless a test patches interactive_collector.app.Storage itself.
+        storage = MagicMock()
+        storage.get.return_value = None
+        storage.list_eligible_projects.return_value = []
+        for target in ("interactive_collector.api_projects.Storage", "interactive_collector.app.Storage"):
+            storage_patcher = patch(target, storage)
+            storage_patcher.start()
+            self.addCleanup(storage_patcher.stop)
         self.client = app.test_client()
 
-    @patch("storage.Storage")
+    @patch("interactive_collector.app.Storage")
     def test_index_no_url_returns_form(self, mock_storage_cls: MagicMock) -> None:
         """GET / with no url param returns form and empty panes when no eligible project in Storage."""
-        mock_storage_cls.list_eligible_projects.side_effect = [[], []]  # ensure_storage, get_first_eligible
+        mock_storage_cls.list_eligible_projects.return_value = []  # get_first_eligible
         response = self.client.get("/legacy/")
         self.assertEqual(response.status_code, 200)
         self.assertIn(b"Interactive Collector", response.data)
@@ -271,7 +386,7 @@ class TestAppRoutes(unittest.TestCase):
         self.assertNotIn(b'class="drpid"', response.data)
 
     @patch("interactive_collector.app.fetch_page_body")
-    @patch("storage.Storage")
+    @patch("interactive_collector.app.Storage")
     def test_index_first_eligible_from_storage_loads_url_and_shows_drpid(
         self, mock_storage_cls: MagicMock, mock_fetch_page_body: unittest.mock.Mock
     ) -> None:
@@ -283,8 +398,8 @@ class TestAppRoutes(unittest.TestCase):
             False,
         )
         project = {"DRPID": 7, "source_url": "https://catalog.data.gov/dataset/foo"}
-        # list_eligible_projects: _ensure_storage (index), first eligible, _ensure_output_folder, metadata
-        mock_storage_cls.list_eligible_projects.side_effect = [[], [project], [], []]
+        # list_eligible_projects: first eligible, _ensure_output_folder, metadata
+        mock_storage_cls.list_eligible_projects.side_effect = [[project], [], []]
         mock_storage_cls.get.return_value = project
 
         response = self.client.get("/legacy/")
@@ -295,20 +410,14 @@ class TestAppRoutes(unittest.TestCase):
         self.assertIn(b"Dataset page", response.data)
         mock_fetch_page_body.assert_called_once_with("https://catalog.data.gov/dataset/foo")
 
-    @patch("storage.Storage")
+    @patch("interactive_collector.app.Storage")
     def test_index_next_eligible_redirects_to_next_project(
         self, mock_storage_cls: MagicMock
     ) -> None:
         """GET /?next=1&current_drpid=1 redirects to URL and drpid of next eligible project."""
         next_project = {"DRPID": 5, "source_url": "https://example.com/next"}
-        # First call: _ensure_storage (None, 0); second: _get_next_eligible_after ("sourced", 200)
-        mock_storage_cls.list_eligible_projects.side_effect = [
-            [],
-            [
-                {"DRPID": 1, "source_url": "https://example.com/first"},
-                next_project,
-            ],
-        ]
+        # _get_next_eligible_after asks SQL for the first eligible DRPID > current
+        mock_storage_cls.list_eligible_projects.return_value = [next_project]
 
         response = self.client.get("/legacy/", query_string={"next": "1", "current_drpid": "1"})
 
@@ -316,8 +425,9 @@ class TestAppRoutes(unittest.TestCase):
         self.assertIn("url=", response.location)
         self.assertIn("drpid=5", response.location)
         self.assertIn("example.com/next", response.location)
+        mock_storage_cls.list_eligible_projects.assert_called_once_with("sourced", 1, min_drpid=2)
 
-    @patch("storage.Storage")
+    @patch("interactive_collector.app.Storage")
     def test_index_load_drpid_redirects_to_project_url(
         self, mock_storage_cls: MagicMock
     ) -> None:
@@ -446,6 +556,24 @@ class TestAppRoutes(unittest.TestCase):
         self.assertIn(b"example.com/linked", response.data)
         self.assertEqual(mock_fetch_page_body.call_count, 2)
 
+    @patch("interactive_collector.app.fetch_page_body")
+    def test_second_link_click_reuses_source_pane(
+        self, mock_fetch_page_body: unittest.mock.Mock
+    ) -> None:
+        """A second link click from the same source refetches only the new linked page."""
+        mock_fetch_page_body.return_value = (200, "<html><body>Page</body></html>", "text/html", False)
+        for linked in ("https://example.com/a", "https://example.com/b"):
+            self.client.get(
+                "/legacy/",
+                query_string={
+                    "source_url": "https://example.com/source",
+                    "linked_url": linked,
+                    "referrer": "https://example.com/source",
+                },
+            )
+        fetched = [c.args[0] for c in mock_fetch_page_body.call_args_list]
+        self.assertEqual(fetched, ["https://example.com/source", "https://example.com/a", "https://example.com/b"])
+
     @patch("interactive_collector.app.fetch_page_body")
     def test_index_link_click_with_referrer_not_source_shows_back_link(
         self, mock_fetch_page_body: unittest.mock.Mock
@@ -616,7 +744,7 @@ class TestAppRoutes(unittest.TestCase):
         self.assertIn("source_url=", response.location)
         self.assertIn("drpid=1", response.location)
 
-    @patch("storage.Storage")
+    @patch("interactive_collector.app.Storage")
     def test_save_with_metadata_and_no_indices_updates_storage(
         self, mock_storage_cls: MagicMock
     ) -> None:
@@ -667,3 +795,29 @@ class TestAppRoutes(unittest.TestCase):
         html = _scoreboard_render_html("http://127.0.0.1:5000", "https://example.com", drpid="1", for_save_form=True)
         self.assertIn(b'name="save_url"', html.encode("utf-8"))
         self.assertIn(b'value="0"', html.encode("utf-8"))
+
+    @patch("interactive_collector.app._folder_path_for_drpid", return_value="/tmp/DRP000001")
+    @patch("interactive_collector.app._get_project_by_drpid", return_value={"DRPID": 1})
+    def test_extension_launcher_redirect_script(self, _mock_proj: MagicMock, _mock_folder: MagicMock) -> None:
+        """Launcher embeds the URL as a JS string literal that cannot close the script tag."""
+        url = "https://example.com/a?q=</script><b>x"
+        resp = self.client.get("/extension/launcher", query_string={"drpid": "1", "url": url})
+        self.assertEqual(resp.status_code, 200)
+        body = resp.get_data(as_text=True)
+        self.assertEqual(body.count("</script>"), 1)
+        literal = body.split("window.location.href = ", 1)[1].split(";", 1)[0]
+        self.assertEqual(json.loads(literal), url)
+
+    @patch("interactive_collector.app.fetch_page_body")
+    def test_source_srcdoc_attribute_round_trips(self, mock_fetch_page_body: MagicMock) -> None:
+        """The srcdoc attribute unescapes back to the page with its injected base tag intact."""
+        page = '<html><head></head><body><p title="a &amp; b">x</p></body></html>'
+        mock_fetch_page_body.return_value = (200, page, "text/html", False)
+        resp = self.client.get("/legacy/", query_string={"url": "https://example.com/dir/page"})
+        m = re.search(r'<iframe name="source"[^>]*\ssrcdoc="([^"]*)"', resp.get_data(as_text=True))
+        self.assertIsNotNone(m)
+        self.assertEqual(
+            html.unescape(m.group(1)),
+            '<html><head><base href="https://example.com/dir/"></head>'
+            '<body><p title="a &amp; b">x</p></body></html>',
+        )
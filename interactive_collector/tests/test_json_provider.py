@@ -0,0 +1,58 @@
+"""Tests for interactive_collector.json_provider."""
+
+import json
+import unittest
+from datetime import date
+
+from flask import Flask, request
+
+from interactive_collector.json_provider import OrjsonProvider, install_json_provider
+
+
+class TestOrjsonProvider(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = Flask(__name__)
+        install_json_provider(self.app)
+
+        @self.app.route("/data")
+        def data() -> dict:
+            return {"b": [1, 2], "a": {"nested": "é"}, "d": date(2024, 1, 2)}
+
+        @self.app.route("/echo", methods=["POST"])
+        def echo() -> dict:
+            return {"got": request.get_json()}
+
+        self.client = self.app.test_client()
+
+    def test_installed(self) -> None:
+        self.assertIsInstance(self.app.json, OrjsonProvider)
+
+    def test_dict_response_round_trips(self) -> None:
+        resp = self.client.get("/data")
+        self.assertEqual(resp.mimetype, "application/json")
+        self.assertEqual(
+            json.loads(resp.data),
+            {"a": {"nested": "é"}, "b": [1, 2], "d": "2024-01-02"},
+        )
+
+    def test_dumps_sorts_keys_and_handles_int_keys(self) -> None:
+        self.assertEqual(self.app.json.dumps({"b": 1, "a": 2}), '{"a":2,"b":1}')
+        self.assertEqual(json.loads(self.app.json.dumps({1: "x"})), {"1": "x"})
+
+    def test_kwargs_fall_back_to_stdlib(self) -> None:
+        self.assertEqual(self.app.json.dumps({"a": 1}, indent=2), '{\n  "a": 1\n}')
+
+    def test_loads(self) -> None:
+        self.assertEqual(self.app.json.loads(b'{"a": [1, null]}'), {"a": [1, None]})
+
+    def test_request_json_parsed_by_provider(self) -> None:
+        resp = self.client.post("/echo", data=b'{"x": [1, 2]}', content_type="application/json")
+        self.assertEqual(json.loads(resp.data), {"got": {"x": [1, 2]}})
+
+    def test_malformed_request_json_is_400(self) -> None:
+        resp = self.client.post("/echo", data=b"{bad", content_type="application/json")
+        self.assertEqual(resp.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,36 +2,39 @@
 Unit tests for interactive_collector.pdf_utils.
 """
 
+import asyncio
 import unittest
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from interactive_collector.pdf_utils import page_title_or_h1, unique_pdf_basename
+from interactive_collector.pdf_utils import async_page_title_or_h1, page_title_or_h1, unique_pdf_basename
 
 
 class TestPageTitleOrH1(unittest.TestCase):
     """Tests for page_title_or_h1."""
 
     def test_returns_page_title(self) -> None:
-        """When page.title() returns non-empty, use it."""
+        """When the title script returns non-empty, use it without touching h1."""
         page = MagicMock()
-        page.title.return_value = "  My Dataset  "
+        page.evaluate.return_value = "  My Dataset  "
         self.assertEqual(page_title_or_h1(page), "My Dataset")
+        page.evaluate.assert_called_once()
+        page.title.assert_not_called()
+        page.locator.assert_not_called()
 
     def test_returns_h1_when_title_empty(self) -> None:
         """When title is empty, use first h1 text."""
         page = MagicMock()
-        page.title.return_value = ""
         page.evaluate.return_value = ""
         locator = MagicMock()
         locator.first.text_content.return_value = "  Dataset Page  "
         page.locator.return_value = locator
         self.assertEqual(page_title_or_h1(page), "Dataset Page")
+        locator.first.text_content.assert_called_once_with(timeout=1000)
 
     def test_returns_url_path_segment_when_title_and_h1_empty(self) -> None:
         """When title and h1 empty, use URL path segment."""
         page = MagicMock()
-        page.title.return_value = ""
         page.evaluate.return_value = ""
         page.locator.return_value.first.text_content.side_effect = Exception("no h1")
         self.assertEqual(
@@ -42,7 +45,6 @@ class TestPageTitleOrH1(unittest.TestCase):
     def test_returns_netloc_when_no_path(self) -> None:
         """When URL has no path segment, use hostname."""
         page = MagicMock()
-        page.title.return_value = ""
         page.evaluate.return_value = ""
         page.locator.return_value.first.text_content.side_effect = Exception("no h1")
         self.assertEqual(
@@ -53,10 +55,36 @@ class TestPageTitleOrH1(unittest.TestCase):
     def test_returns_empty_on_exception(self) -> None:
         """When all fail, return empty string."""
         page = MagicMock()
-        page.title.side_effect = Exception("error")
+        page.evaluate.side_effect = Exception("error")
+        page.locator.side_effect = Exception("error")
         self.assertEqual(page_title_or_h1(page, ""), "")
 
 
+class TestAsyncPageTitleOrH1(unittest.TestCase):
+    """Tests for async_page_title_or_h1."""
+
+    def test_title_then_h1_then_url(self) -> None:
+        """Falls back from title to h1 to the URL like the sync version."""
+        page = MagicMock()
+        page.evaluate = AsyncMock(return_value="  My Dataset  ")
+        self.assertEqual(asyncio.run(async_page_title_or_h1(page)), "My Dataset")
+
+        page.evaluate = AsyncMock(return_value="")
+        page.locator.return_value.first.text_content = AsyncMock(return_value=" Heading ")
+        self.assertEqual(asyncio.run(async_page_title_or_h1(page)), "Heading")
+
+        page.locator.return_value.first.text_content = AsyncMock(side_effect=Exception("no h1"))
+        self.assertEqual(asyncio.run(async_page_title_or_h1(page, "https://example.com/a/b-c")), "b-c")
+
+    def test_title_found_skips_h1_lookup(self) -> None:
+        """A usable title returns without waiting on the <h1> lookup."""
+        page = MagicMock()
+        page.evaluate = AsyncMock(return_value="Title")
+        page.locator.return_value.first.text_content = AsyncMock(return_value="Heading")
+        self.assertEqual(asyncio.run(async_page_title_or_h1(page)), "Title")
+        page.locator.return_value.first.text_content.assert_not_awaited()
+
+
 class TestUniquePdfBasename(unittest.TestCase):
     """Tests for unique_pdf_basename."""
 
@@ -76,6 +104,16 @@ class TestUniquePdfBasename(unittest.TestCase):
         self.assertEqual(unique_pdf_basename("Page", used), "Page_1.pdf")
         self.assertEqual(unique_pdf_basename("Page", used), "Page_2.pdf")
 
+    def test_existing_names_skip_case_insensitively_and_grow(self) -> None:
+        """A pre-listed name set is checked instead of the folder and gains each returned name."""
+        existing = {"page.pdf", "page_1.pdf"}
+        used: dict = {}
+        with patch("pathlib.Path.exists") as mock_exists:
+            self.assertEqual(unique_pdf_basename("Page", used, existing=existing), "Page_2.pdf")
+            self.assertEqual(unique_pdf_basename("PAGE", {}, existing=existing), "PAGE_3.pdf")
+        mock_exists.assert_not_called()
+        self.assertIn("page_2.pdf", existing)
+
     def test_respects_folder_path_existing_file(self) -> None:
         """When folder_path has existing file, skip to next index."""
         import tempfile
@@ -107,6 +107,11 @@ class Storage(metaclass=StorageMeta):
         cls._initialized = True
         return instance
     
+    @classmethod
+    def is_initialized(cls) -> bool:
+        """Return True once initialize() has succeeded (until reset())."""
+        return cls._initialized and cls._instance is not None
+    
     @classmethod
     def reset(cls) -> None:
         """
@@ -4,6 +4,7 @@ Storage protocol interface for DRP Pipeline.
 Defines the Storage protocol that all storage implementations must follow.
 """
 
+from contextlib import AbstractContextManager
 from pathlib import Path
 from typing import Literal, Optional, Protocol, Dict, Any
 
@@ -25,6 +26,15 @@ class StorageProtocol(Protocol):
         """
         ...
     
+    def transaction(self) -> AbstractContextManager[None]:
+        """
+        Context manager grouping several writes into one transaction.
+        
+        Writes inside the block are committed together on normal exit and
+        rolled back if the block raises. Nested blocks join the outer one.
+        """
+        ...
+    
     def create_record(self, source_url: str) -> int:
         """
         Create a new record with the given source_url.
@@ -7,8 +7,10 @@ This class should be instantiated via Storage.initialize() factory method.
 """
 
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Literal, Optional, Dict, Any, Tuple, TYPE_CHECKING
+from typing import Iterator, Literal, Optional, Dict, Any, Tuple, TYPE_CHECKING
 
 from utils.Errors import record_crash
 from utils.Logger import Logger
@@ -28,6 +30,11 @@ class StorageSQLLite:
     _connection: Optional[sqlite3.Connection] = None
     _db_path: Optional[Path] = None
     _initialized: bool = False
+    # Serializes statements on the shared connection; held for the whole of transaction()
+    _lock: threading.RLock = threading.RLock()
+    _transaction_depth: int = 0
+    # Page cache per connection, in KiB (SQLite default is about 2 MB)
+    _CACHE_SIZE_KIB = 20000
     
     # Table schema definition
     _schema_sql = """
@@ -102,13 +109,15 @@ class StorageSQLLite:
         self._ensure_initialized()
         
         try:
-            if parameters:
-                cursor = self._connection.execute(query, parameters)
-            else:
-                cursor = self._connection.execute(query)
-            
-            if commit:
-                self._connection.commit()
+            with self._lock:
+                if parameters:
+                    cursor = self._connection.execute(query, parameters)
+                else:
+                    cursor = self._connection.execute(query)
+                
+                # Inside transaction() the outermost block commits once at the end
+                if commit and self._transaction_depth == 0:
+                    self._connection.commit()
             
             return cursor
             
@@ -133,6 +142,9 @@ class StorageSQLLite:
         if self._initialized:
             return
         
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
+        
         if db_path is None:
             db_path = Path.cwd() / "drp_pipeline.db"
         
@@ -149,12 +161,19 @@ class StorageSQLLite:
                 timeout=30.0  # Wait up to 30 seconds for locks
             )
             
-            # Enable WAL mode for concurrent reads/writes
-            self._connection.execute("PRAGMA journal_mode=WAL")
+            # Enable WAL mode for concurrent reads/writes (readers don't block the writer).
+            # SQLite answers with the mode actually in effect; some filesystems refuse WAL.
+            journal_mode = self._connection.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            if str(journal_mode).lower() != "wal":
+                Logger.warning(
+                    f"SQLite WAL mode unavailable for {self._db_path} (journal_mode={journal_mode}); "
+                    "readers and writers will block each other"
+                )
             
             # Set other pragmas for better concurrency
             self._connection.execute("PRAGMA busy_timeout=30000")  # 30 second timeout
             self._connection.execute("PRAGMA synchronous=NORMAL")  # Balance between safety and speed
+            self._connection.execute(f"PRAGMA cache_size=-{self._CACHE_SIZE_KIB}")  # negative = KiB
             
             # Create schema
             self._connection.executescript(self._schema_sql)
@@ -206,6 +225,37 @@ class StorageSQLLite:
             error_msg = f"Failed to initialize database at {self._db_path}: {e}"
             record_crash(error_msg)
     
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group several writes into one transaction (one commit, one WAL sync).
+        
+        Statements issued inside the block are not committed individually; the
+        block commits on normal exit and rolls back if it raises. BEGIN IMMEDIATE
+        takes the write lock up front, so a read-then-write inside the block cannot
+        fail with SQLITE_BUSY when upgrading. Nested blocks join the outermost one.
+        Other threads' statements wait until the block finishes.
+        
+        Raises:
+            RuntimeError: If Storage is not initialized
+        """
+        self._ensure_initialized()
+        
+        with self._lock:
+            if self._transaction_depth == 0:
+                self._connection.execute("BEGIN IMMEDIATE")
+            self._transaction_depth += 1
+            try:
+                yield
+            except BaseException:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0 and self._connection is not None:
+                    self._connection.rollback()
+                raise
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0 and self._connection is not None:
+                self._connection.commit()
+    
     def create_record(self, source_url: str) -> int:
         """
         Create a new record with the given source_url.
@@ -476,10 +526,7 @@ class StorageSQLLite:
         )
         rows = cursor.fetchall()
         column_names = [d[0] for d in cursor.description]
-        result: list[Dict[str, Any]] = []
-        for row in rows:
-            result.append(dict(zip(column_names, row)))
-        return result
+        return [dict(zip(column_names, row)) for row in rows]
 
     def list_records_with_status_notes(self) -> list[Dict[str, Any]]:
         """
@@ -516,17 +563,19 @@ class StorageSQLLite:
         """
         if field not in ("warnings", "errors"):
             raise ValueError(f"field must be 'warnings' or 'errors', got: {field!r}")
-        cursor = self._execute_query(
-            f"SELECT {field} FROM projects WHERE DRPID = ?",
-            (drpid,),
-            operation_name=f"read {field} for append",
-            commit=False,
-        )
-        row = cursor.fetchone()
-        if row is None:
-            raise ValueError(f"Record with DRPID {drpid} does not exist")
-        current = row[0] or ""
-        # Preserve whitespace consistently: append with newline, only strip trailing whitespace
-        # from the entire field to avoid trailing newlines, but preserve whitespace within entries
-        new_value = (current + "\n" + text).rstrip() if current else text
-        self.update_record(drpid, {field: new_value})
+        # Read and write in one transaction so concurrent appends cannot drop an entry
+        with self.transaction():
+            cursor = self._execute_query(
+                f"SELECT {field} FROM projects WHERE DRPID = ?",
+                (drpid,),
+                operation_name=f"read {field} for append",
+                commit=False,
+            )
+            row = cursor.fetchone()
+            if row is None:
+                raise ValueError(f"Record with DRPID {drpid} does not exist")
+            current = row[0] or ""
+            # Preserve whitespace consistently: append with newline, only strip trailing whitespace
+            # from the entire field to avoid trailing newlines, but preserve whitespace within entries
+            new_value = (current + "\n" + text).rstrip() if current else text
+            self.update_record(drpid, {field: new_value})
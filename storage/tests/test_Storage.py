@@ -120,3 +120,13 @@ class TestStorage(unittest.TestCase):
         storage2 = Storage.initialize('StorageSQLLite', db_path=self.test_db_path)
         self.assertIsNot(storage1, storage2)
         storage2.close()
+    
+    def test_is_initialized_tracks_initialize_and_reset(self) -> None:
+        """Test is_initialized() is False before initialize(), True after, and False after reset()."""
+        Storage.reset()
+        self.assertFalse(Storage.is_initialized())
+        storage = Storage.initialize('StorageSQLLite', db_path=self.test_db_path)
+        self.assertTrue(Storage.is_initialized())
+        storage.close()
+        Storage.reset()
+        self.assertFalse(Storage.is_initialized())
@@ -6,6 +6,7 @@ import sqlite3
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 from utils.Args import Args
 from utils.Logger import Logger
@@ -102,6 +103,21 @@ class TestStorageSQLLite(unittest.TestCase):
         result = cursor.fetchone()
         self.assertEqual(result[0].upper(), "WAL")
     
+    def test_initialize_sets_cache_size(self) -> None:
+        """Test that the page cache size pragma is applied."""
+        self.storage.initialize(db_path=self.test_db_path)
+        
+        result = self.storage._connection.execute("PRAGMA cache_size").fetchone()
+        self.assertEqual(result[0], -StorageSQLLite._CACHE_SIZE_KIB)
+    
+    def test_initialize_warns_when_wal_unavailable(self) -> None:
+        """Test a warning is logged when SQLite keeps a non-WAL journal mode (in-memory DB)."""
+        with patch("storage.StorageSQLLite.Logger.warning") as mock_warning:
+            self.storage.initialize(db_path=Path(":memory:"))
+        
+        mock_warning.assert_called_once()
+        self.assertIn("journal_mode=memory", mock_warning.call_args[0][0])
+    
     def test_initialize_idempotent(self) -> None:
         """Test that initialize can be called multiple times safely."""
         self.storage.initialize(db_path=self.test_db_path)
@@ -649,6 +665,41 @@ class TestStorageSQLLite(unittest.TestCase):
         # Leading spaces preserved, trailing space from last entry stripped
         self.assertEqual(r["warnings"], " warning1 \n warning2")
 
+    def test_transaction_commits_once_at_end(self) -> None:
+        """Test writes inside transaction() are not visible to other connections until the block exits."""
+        self.storage.initialize(db_path=self.test_db_path)
+        other = sqlite3.connect(str(self.test_db_path))
+        try:
+            with self.storage.transaction():
+                drpid = self.storage.create_record("https://a.com")
+                self.storage.update_record(drpid, {"status": "sourced"})
+                self.assertEqual(other.execute("SELECT COUNT(*) FROM projects").fetchone()[0], 0)
+            row = other.execute("SELECT status FROM projects WHERE DRPID = ?", (drpid,)).fetchone()
+        finally:
+            other.close()
+        self.assertEqual(row, ("sourced",))
+
+    def test_transaction_rolls_back_on_error(self) -> None:
+        """Test an exception inside transaction() discards every write in the block."""
+        self.storage.initialize(db_path=self.test_db_path)
+        with self.assertRaises(ValueError):
+            with self.storage.transaction():
+                self.storage.create_record("https://a.com")
+                self.storage.update_record(999, {"status": "sourced"})
+        self.assertFalse(self.storage.exists_by_source_url("https://a.com"))
+        # Connection is usable again afterwards
+        self.assertEqual(self.storage.create_record("https://b.com"), 1)
+
+    def test_transaction_nested_joins_outer(self) -> None:
+        """Test a nested transaction() does not commit before the outer block ends."""
+        self.storage.initialize(db_path=self.test_db_path)
+        with self.assertRaises(RuntimeError):
+            with self.storage.transaction():
+                with self.storage.transaction():
+                    self.storage.create_record("https://a.com")
+                raise RuntimeError("outer fails")
+        self.assertFalse(self.storage.exists_by_source_url("https://a.com"))
+
     def test_list_records_with_status_notes(self) -> None:
         """Test list_records_with_status_notes returns only records with non-empty status_notes."""
         self.storage.initialize(db_path=self.test_db_path)
@@ -0,0 +1,230 @@
+"""
+Unit tests for export_status_notes.
+"""
+
+import csv
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Iterator, Tuple
+from unittest.mock import MagicMock, patch
+
+from export_status_notes import (
+    _SELECT_STATUS_NOTES_SQL,
+    _connect_readonly,
+    _select_status_notes,
+    expand_status_notes_to_rows,
+    parse_status_notes_line,
+    write_status_notes_csv,
+)
+
+
+class TestParseStatusNotesLine(unittest.TestCase):
+    """Test cases for parse_status_notes_line."""
+
+    def test_title_type_and_url(self) -> None:
+        """Test a full line splits into title, data_type, and url."""
+        self.assertEqual(
+            parse_status_notes_line("Data file -> csv https://example.com/a.csv"),
+            ("Data file", "csv", "https://example.com/a.csv"),
+        )
+
+    def test_title_and_type_only(self) -> None:
+        """Test a line without a URL returns an empty url."""
+        self.assertEqual(parse_status_notes_line("Landing page -> 404"), ("Landing page", "404", ""))
+
+    def test_line_without_arrow(self) -> None:
+        """Test a line without the arrow is returned as the title."""
+        self.assertEqual(parse_status_notes_line("free text note"), ("free text note", "", ""))
+
+    def test_extra_whitespace_and_later_arrows(self) -> None:
+        """Test whitespace around the arrow is trimmed and only the first arrow splits."""
+        self.assertEqual(
+            parse_status_notes_line("A  ->   csv   https://x/a -> b"),
+            ("A", "csv", "https://x/a -> b"),
+        )
+
+    def test_arrow_requires_surrounding_spaces(self) -> None:
+        """Test "->" without surrounding spaces is not treated as a separator."""
+        self.assertEqual(parse_status_notes_line("a->b"), ("a->b", "", ""))
+
+
+class TestExpandStatusNotesToRows(unittest.TestCase):
+    """Test cases for expand_status_notes_to_rows."""
+
+    def test_skips_blank_404_and_duplicate_urls(self) -> None:
+        """Test blank lines, 404 lines, and repeated URLs are dropped."""
+        notes = "\n".join([
+            "  A -> csv https://x/a.csv",
+            "",
+            "  B -> 404",
+            "  C -> csv https://x/a.csv",
+            "  D -> pdf https://x/d.pdf",
+        ])
+        rows = list(expand_status_notes_to_rows(7, "https://src", notes))
+        self.assertEqual(
+            rows,
+            [
+                (7, "https://src", "A", "csv", "https://x/a.csv"),
+                (7, "https://src", "D", "pdf", "https://x/d.pdf"),
+            ],
+        )
+
+    @patch("export_status_notes.parse_status_notes_line", wraps=parse_status_notes_line)
+    def test_bare_404_lines_skip_parse(self, mock_parse: MagicMock) -> None:
+        """Test "title -> 404" lines are dropped without being parsed."""
+        rows = list(expand_status_notes_to_rows(1, "s", "A -> 404\nB  -> 404"))
+        self.assertEqual(rows, [])
+        mock_parse.assert_not_called()
+
+    def test_404_only_in_url_is_kept(self) -> None:
+        """Test a trailing " -> 404" after the first arrow does not make the line a 404."""
+        rows = list(expand_status_notes_to_rows(1, "s", "A -> csv https://x -> 404"))
+        self.assertEqual(rows, [(1, "s", "A", "csv", "https://x -> 404")])
+
+    def test_is_lazy_generator(self) -> None:
+        """Test rows are produced lazily rather than returned as a list."""
+        rows = expand_status_notes_to_rows(1, "https://src", "A -> csv https://x/a")
+        self.assertFalse(isinstance(rows, list))
+        self.assertEqual(next(rows), (1, "https://src", "A", "csv", "https://x/a"))
+
+
+class TestWriteStatusNotesCsv(unittest.TestCase):
+    """Test cases for the database query and CSV writer."""
+
+    def setUp(self) -> None:
+        """Create a temporary database with a few projects."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_path = self.temp_dir / "drp.db"
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE projects (DRPID INTEGER PRIMARY KEY, source_url TEXT, status_notes TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO projects VALUES (?, ?, ?)",
+            [
+                (2, "https://b", "B1 -> csv https://b/1.csv\r\n\r\nB2 -> csv https://b/1.csv"),
+                (1, "https://a", "A1 -> pdf https://a/1.pdf\n  \nA2 -> 404\nA3 -> zip https://a/3.zip"),
+                (3, "https://c", "   "),
+                (4, "https://d", None),
+            ],
+        )
+        conn.commit()
+        conn.close()
+        self.output_path = self.temp_dir / "out" / "export.csv"
+
+    def tearDown(self) -> None:
+        """Remove temporary files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _export(self) -> int:
+        """Run the query + CSV write against the temporary database."""
+        conn = _connect_readonly(self.db_path)
+        try:
+            return write_status_notes_csv(_select_status_notes(conn), self.output_path)
+        finally:
+            conn.close()
+
+    def test_writes_rows_in_drpid_order(self) -> None:
+        """Test the CSV has a header and one row per kept note line, ordered by DRPID."""
+        count = self._export()
+
+        self.assertEqual(count, 3)
+        with open(self.output_path, newline="", encoding="utf-8-sig") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(
+            rows,
+            [
+                ["DRPID", "source_url", "title", "data_type", "url"],
+                ["1", "https://a", "A1", "pdf", "https://a/1.pdf"],
+                ["1", "https://a", "A3", "zip", "https://a/3.zip"],
+                ["2", "https://b", "B1", "csv", "https://b/1.csv"],
+            ],
+        )
+
+    def test_failed_export_keeps_previous_file(self) -> None:
+        """Test an error mid-export leaves the existing CSV untouched and no temp file."""
+        self.output_path.parent.mkdir(parents=True)
+        self.output_path.write_text("previous", encoding="utf-8")
+
+        def broken_records() -> Iterator[Tuple[int, str, str]]:
+            """Yield one record, then fail like a dropped database read."""
+            yield (1, "https://a", "A -> csv https://a/1")
+            raise sqlite3.OperationalError("disk I/O error")
+
+        with self.assertRaises(sqlite3.OperationalError):
+            write_status_notes_csv(broken_records(), self.output_path)
+
+        self.assertEqual(self.output_path.read_text(encoding="utf-8"), "previous")
+        self.assertEqual(list(self.output_path.parent.iterdir()), [self.output_path])
+
+    def test_query_returns_projects_with_notes_in_drpid_order(self) -> None:
+        """Test the query yields one plain tuple per project with notes, ordered by DRPID."""
+        conn = _connect_readonly(self.db_path)
+        try:
+            rows = list(_select_status_notes(conn))
+        finally:
+            conn.close()
+        self.assertTrue(all(type(r) is tuple for r in rows))
+        self.assertEqual([r[0] for r in rows], [1, 2, 3])
+
+    def test_crlf_and_cr_line_endings(self) -> None:
+        """Test CRLF and lone CR separators split lines without leaving a carriage return."""
+        notes = "E1 -> csv https://e/1.csv\r\nE2 -> pdf https://e/2.pdf\rE3 -> zip https://e/3.zip\r\n"
+        records = [(5, "https://e", notes)]
+        count = write_status_notes_csv(records, self.output_path)
+
+        self.assertEqual(count, 3)
+        with open(self.output_path, newline="", encoding="utf-8-sig") as f:
+            rows = list(csv.reader(f))[1:]
+        self.assertEqual(
+            rows,
+            [
+                ["5", "https://e", "E1", "csv", "https://e/1.csv"],
+                ["5", "https://e", "E2", "pdf", "https://e/2.pdf"],
+                ["5", "https://e", "E3", "zip", "https://e/3.zip"],
+            ],
+        )
+
+    def test_long_note_exports_every_line(self) -> None:
+        """Test a 20k-line note in the database exports one row per line, in order."""
+        notes = "\n".join(f"T{i} -> csv https://x/{i}.csv" for i in range(20000))
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("UPDATE projects SET status_notes = ? WHERE DRPID = 3", (notes,))
+        conn.commit()
+        conn.close()
+
+        count = self._export()
+
+        self.assertEqual(count, 3 + 20000)
+        with open(self.output_path, newline="", encoding="utf-8-sig") as f:
+            rows = [r for r in csv.reader(f) if r[0] == "3"]
+        self.assertEqual(len(rows), 20000)
+        self.assertEqual(rows[0][2:], ["T0", "csv", "https://x/0.csv"])
+        self.assertEqual(rows[-1][2:], ["T19999", "csv", "https://x/19999.csv"])
+
+    def test_readonly_connection_rejects_writes(self) -> None:
+        """Test the export connection is read-only."""
+        conn = _connect_readonly(self.db_path)
+        try:
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM projects")
+        finally:
+            conn.close()
+
+    def test_query_plan_has_no_sort(self) -> None:
+        """Test the export scans projects in rowid (DRPID) order without a temp sort."""
+        conn = _connect_readonly(self.db_path)
+        try:
+            plan = " ".join(
+                str(r[-1]) for r in conn.execute("EXPLAIN QUERY PLAN " + _SELECT_STATUS_NOTES_SQL)
+            )
+        finally:
+            conn.close()
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -141,9 +141,10 @@ class DataLumosFormFiller:
             title: Project title text
         """
         truncated = truncate_title_for_datalumos(title)
-        if len(truncated) < len(" ".join(title.split())):
+        normalized_len = len(" ".join(title.split()))
+        if len(truncated) < normalized_len:
             self._warn(
-                f"Title truncated from {len(' '.join(title.split()))} to "
+                f"Title truncated from {normalized_len} to "
                 f"{len(truncated)} characters for DataLumos limit"
             )
         _debug_form_field("title", truncated)
@@ -80,12 +80,17 @@ class Args(metaclass=ArgsMeta):
         "db_path": 'drp_pipeline.db',
         "storage_implementation": "StorageSQLLite",
         "base_output_dir": r"C:\Documents\DataRescue\DRPData",
+        "pdf_profile_dir": None,  # Collector PDF printing browser profile; None = ~/.drp/pdf-profile
         "delete_all_db_entries": False,
         "max_workers": 1,  # Parallel projects when > 1 (e.g. collector); 1 = sequential
         "usfs_metadata_only": False,  # USFS: harvest metadata/PDFs only; skip publication downloads; keep folder
         "download_timeout_ms": 30 * 60 * 1000,  # 30 min for large datasets; increase for 10GB+
         "use_url_download": True,  # Get URL from Playwright then download with requests (progress/resume)
         "socrata_app_token": None,  # Optional; set in config for direct Socrata API download (avoids 403)
+        # Duplicate checking: persistent cache of URLs already verified in datalumos
+        "datalumos_verify_cache": True,  # False (or --no-datalumos-cache) always re-verifies
+        "datalumos_verify_cache_path": None,  # None = ~/.drp/datalumos_verify_cache.db
+        "datalumos_verify_cache_ttl_days": 30,
         # Upload module settings
         "datalumos_username": None,  # Required for upload; set in config file
         "datalumos_password": None,  # Required for upload; set in config file
@@ -233,6 +238,11 @@ class Args(metaclass=ArgsMeta):
                 "--usfs-metadata-only",
                 help="USFS collector: update metadata and page PDFs only; skip publication file downloads and preserve the output folder",
             ),
+            no_datalumos_cache: bool = typer.Option(
+                False,
+                "--no-datalumos-cache",
+                help="Ignore the persistent datalumos verification cache and re-verify every URL",
+            ),
         ) -> None:
             """Callback to capture Typer parsed values."""
             parsed_values["module"] = module
@@ -264,6 +274,8 @@ class Args(metaclass=ArgsMeta):
                 parsed_values["sourcing_mode"] = sourcing_mode
             if usfs_metadata_only:
                 parsed_values["usfs_metadata_only"] = True
+            if no_datalumos_cache:
+                parsed_values["datalumos_verify_cache"] = False
 
         # Use a single @app.command() so the first positional (module) is not treated as a
         # subcommand. A Group would require the first token to match a subcommand.
@@ -1,14 +1,22 @@
 """
 Utilities for file and folder operations.
 
-Provides functions for sanitizing filenames and creating output folders.
+Provides functions for sanitizing filenames, creating output folders, and
+copying upload streams to disk.
 """
 
+import io
+import os
 import re
 import shutil
 import unicodedata
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
+
+# sanitize_filename patterns: invalid Windows characters, control characters, runs of _/space.
+_INVALID_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x1f\x7f]')
+_UNDERSCORE_SPACE_RUN_RE = re.compile(r'[_\s]+')
 
 
 def sanitize_filename(name: str, max_length: int = 100) -> str:
@@ -56,11 +64,10 @@ def sanitize_filename(name: str, max_length: int = 100) -> str:
         sanitized = sanitized.replace(old_char, new_char)
     
     # Remove invalid Windows characters
-    invalid_chars = r'[<>:"/\\|?*]'
-    sanitized = re.sub(invalid_chars, '_', sanitized)
+    sanitized = _INVALID_FILENAME_CHARS_RE.sub('_', sanitized)
     
     # Remove control characters
-    sanitized = re.sub(r'[\x00-\x1f\x7f]', '', sanitized)
+    sanitized = _CONTROL_CHARS_RE.sub('', sanitized)
     
     # Convert to ASCII
     try:
@@ -73,7 +80,7 @@ def sanitize_filename(name: str, max_length: int = 100) -> str:
     sanitized = sanitized.strip('. ')
     
     # Remove multiple consecutive underscores/spaces
-    sanitized = re.sub(r'[_\s]+', '_', sanitized)
+    sanitized = _UNDERSCORE_SPACE_RUN_RE.sub('_', sanitized)
     sanitized = sanitized.strip('_')
     
     # Limit length
@@ -92,10 +99,11 @@ _SIZE_UNIT_BYTES = {
     "KB": 1024,
     "MB": 1024**2,
     "GB": 1024**3,
+    "TB": 1024**4,
 }
 
 _SIZE_WITH_UNIT_RE = re.compile(
-    r"^\s*([\d.]+)\s*(B|KB|MB|GB)\s*$",
+    r"^\s*([\d.]+)\s*(B|KB|MB|GB|TB)\s*$",
     re.IGNORECASE,
 )
 
@@ -134,9 +142,12 @@ def parse_file_size_to_bytes(value: str | int | float | None) -> int | None:
         return None
 
 
+_SIZE_SUFFIXES = ("B", "KB", "MB", "GB", "TB")
+
+
 def format_file_size(size_bytes: int) -> str:
     """
-    Format a byte count in human-readable form (KB, MB, GB).
+    Format a byte count in human-readable form (KB, MB, GB, TB).
 
     Args:
         size_bytes: Size in bytes (non-negative).
@@ -150,12 +161,11 @@ def format_file_size(size_bytes: int) -> str:
         >>> format_file_size(1_500_000)
         '1.4 MB'
     """
-    if size_bytes < 0:
-        size_bytes = 0
-    for unit, suffix in [(1024**3, "GB"), (1024**2, "MB"), (1024, "KB")]:
-        if size_bytes >= unit:
-            return f"{size_bytes / unit:.1f} {suffix}"
-    return f"{size_bytes} B"
+    if size_bytes < 1024:
+        return f"{max(size_bytes, 0)} B"
+    # Each unit is 10 more bits: bit_length picks the unit directly (capped at TB).
+    shift = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_SUFFIXES) - 1)
+    return f"{size_bytes / (1 << (10 * shift)):.1f} {_SIZE_SUFFIXES[shift]}"
 
 
 def folder_extensions_and_size(folder_path: Path) -> tuple[list[str], int, int]:
@@ -174,12 +184,16 @@ def folder_extensions_and_size(folder_path: Path) -> tuple[list[str], int, int]:
     total = 0
     n_files = 0
     try:
-        for p in folder_path.iterdir():
-            if p.is_file():
-                n_files += 1
-                total += p.stat().st_size
-                if p.suffix:
-                    exts.add(p.suffix.lstrip(".").lower())
+        # scandir answers is_file() from the directory listing, leaving one stat per file.
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                if entry.is_file():
+                    n_files += 1
+                    total += entry.stat().st_size
+                    # Same rule as Path.suffix: no extension for ".name" or "name."
+                    stem, dot, ext = entry.name.rpartition(".")
+                    if dot and stem and ext:
+                        exts.add(ext.lower())
     except OSError:
         pass
     return (sorted(exts), total, n_files)
@@ -225,3 +239,39 @@ def create_output_folder(base_dir: Path, drpid: int, *, recreate: bool = True) -
         from utils.Logger import Logger
         Logger.error(f"Failed to create output folder: {e}")
         return None
+
+
+def _backing_fd(stream: BinaryIO) -> Optional[int]:
+    """Return the OS file descriptor behind stream, or None if it has none (e.g. BytesIO)."""
+    try:
+        return stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def copy_stream_to_file(stream: BinaryIO, dest: Path) -> int:
+    """
+    Write the whole of stream (from its start) to dest and return the byte count.
+
+    Uses os.sendfile (kernel-space copy) when stream is backed by a real file,
+    e.g. a large Werkzeug upload spooled to disk; otherwise copies in 1 MiB blocks.
+    """
+    stream.seek(0)
+    src_fd = _backing_fd(stream)
+    with open(dest, "wb") as dst:
+        if src_fd is not None and hasattr(os, "sendfile"):
+            size = os.fstat(src_fd).st_size
+            offset = 0
+            try:
+                while offset < size:
+                    sent = os.sendfile(dst.fileno(), src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return offset
+            except OSError:
+                dst.seek(0)
+                dst.truncate()
+                stream.seek(0)
+        shutil.copyfileobj(stream, dst, length=1 << 20)
+        return dst.tell()
@@ -252,6 +252,18 @@ class TestArgs(unittest.TestCase):
         Args.initialize()
         self.assertEqual(Args.start_row, 10)
 
+    def test_no_datalumos_cache_from_cli(self) -> None:
+        """Test --no-datalumos-cache disables the datalumos verification cache."""
+        import sys
+        sys.argv = ["test", "sourcing"]
+        Args._initialized = False
+        Args.initialize()
+        self.assertTrue(Args.datalumos_verify_cache)
+        sys.argv = ["test", "sourcing", "--no-datalumos-cache"]
+        Args._initialized = False
+        Args.initialize()
+        self.assertFalse(Args.datalumos_verify_cache)
+
 
 if __name__ == "__main__":
     unittest.main()
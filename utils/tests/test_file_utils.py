@@ -80,6 +80,23 @@ class TestFileUtils(unittest.TestCase):
         self.assertEqual(n, 3)
         self.assertGreaterEqual(total, 6)
 
+    def test_folder_extensions_and_size_matches_path_suffix_rules(self) -> None:
+        """Test dotfiles, trailing dots and subfolders are handled like Path.suffix/is_file."""
+        d = self.temp_dir / "suffixes"
+        d.mkdir()
+        names = [".env", "notes.", "archive.tar.GZ", "..b", "README"]
+        for name in names:
+            (d / name).write_bytes(b"ab")
+        (d / "sub.dir").mkdir()
+        exts, total, n = file_utils.folder_extensions_and_size(d)
+        expected = sorted({Path(name).suffix.lstrip(".").lower() for name in names} - {""})
+        self.assertEqual(exts, expected)
+        self.assertEqual((total, n), (10, 5))
+
+    def test_folder_extensions_and_size_missing_folder(self) -> None:
+        """Test a missing folder yields no extensions, size or files."""
+        self.assertEqual(file_utils.folder_extensions_and_size(self.temp_dir / "nope"), ([], 0, 0))
+
     def test_format_file_size_kb_mb_gb(self) -> None:
         """Test format_file_size for KB, MB, GB."""
         self.assertEqual(file_utils.format_file_size(1536), "1.5 KB")
@@ -87,6 +104,12 @@ class TestFileUtils(unittest.TestCase):
         self.assertEqual(file_utils.format_file_size(1_500_000), "1.4 MB")
         self.assertEqual(file_utils.format_file_size(1024**3), "1.0 GB")
 
+    def test_format_file_size_tb_boundary(self) -> None:
+        """Test format_file_size switches to TB at exactly 1 TiB and round-trips through the parser."""
+        self.assertEqual(file_utils.format_file_size(1024**4 - 1), "1024.0 GB")
+        self.assertEqual(file_utils.format_file_size(1024**4), "1.0 TB")
+        self.assertEqual(file_utils.parse_file_size_to_bytes("1.0 TB"), 1024**4)
+
     def test_parse_file_size_to_bytes(self) -> None:
         """Test parse_file_size_to_bytes for formatted and raw values."""
         self.assertEqual(file_utils.parse_file_size_to_bytes("10485760"), 10485760)
@@ -124,4 +147,39 @@ class TestFileUtils(unittest.TestCase):
         self.assertEqual(same, folder_path)
         self.assertTrue(marker.exists())
         self.assertEqual(marker.read_text(encoding="utf-8"), "stay")
-    
\ No newline at end of file
+    
+    def test_copy_stream_to_file_in_memory(self) -> None:
+        """Test copy_stream_to_file copies a BytesIO from its start."""
+        import io
+        stream = io.BytesIO(b"%PDF-1.4 data")
+        stream.seek(5)
+        dest = self.temp_dir / "a.pdf"
+        self.assertEqual(file_utils.copy_stream_to_file(stream, dest), 13)
+        self.assertEqual(dest.read_bytes(), b"%PDF-1.4 data")
+
+    def test_copy_stream_to_file_from_spooled_file(self) -> None:
+        """Test a small SpooledTemporaryFile (as Werkzeug uses for uploads) is copied whole."""
+        with tempfile.SpooledTemporaryFile(max_size=1024) as stream:
+            stream.write(b"small")
+            dest = self.temp_dir / "s.pdf"
+            self.assertEqual(file_utils.copy_stream_to_file(stream, dest), 5)
+        self.assertEqual(dest.read_bytes(), b"small")
+
+    def test_copy_stream_to_file_from_real_file(self) -> None:
+        """Test a file-backed stream is copied (via sendfile where available)."""
+        data = bytes(range(256)) * 5000
+        with tempfile.TemporaryFile() as stream:
+            stream.write(data)
+            dest = self.temp_dir / "big.pdf"
+            self.assertEqual(file_utils.copy_stream_to_file(stream, dest), len(data))
+        self.assertEqual(dest.read_bytes(), data)
+
+    def test_copy_stream_to_file_falls_back_when_sendfile_fails(self) -> None:
+        """Test an OSError from sendfile falls back to a buffered copy."""
+        from unittest.mock import patch
+        with tempfile.TemporaryFile() as stream, \
+                patch("utils.file_utils.os.sendfile", side_effect=OSError("unsupported"), create=True):
+            stream.write(b"fallback")
+            dest = self.temp_dir / "f.pdf"
+            self.assertEqual(file_utils.copy_stream_to_file(stream, dest), 8)
+        self.assertEqual(dest.read_bytes(), b"fallback")
@@ -51,7 +51,23 @@ class TestUrlUtils(unittest.TestCase):
     def test_is_valid_url_invalid_ftp(self) -> None:
         """Test is_valid_url with FTP URL (not HTTP/HTTPS)."""
         self.assertFalse(url_utils.is_valid_url("ftp://example.com"))
+
+    def test_is_valid_url_non_string_and_whitespace(self) -> None:
+        """Test is_valid_url rejects non-strings and ignores surrounding whitespace."""
+        self.assertFalse(url_utils.is_valid_url(["https://example.com"]))
+        self.assertTrue(url_utils.is_valid_url("\t https://example.com \n"))
+        self.assertFalse(url_utils.is_valid_url("x https://example.com"))
+        self.assertFalse(url_utils.is_valid_url("HTTPS://example.com"))
     
+    def test_create_pooled_session_mounts_adapter(self) -> None:
+        """Test create_pooled_session mounts one pooled, retrying adapter for http and https."""
+        session = url_utils.create_pooled_session(pool_maxsize=5, retries=1)
+        adapter = session.get_adapter("https://example.com")
+        self.assertIs(session.get_adapter("http://example.com"), adapter)
+        self.assertEqual(adapter._pool_maxsize, 5)
+        self.assertEqual(adapter.max_retries.total, 1)
+        self.assertFalse(adapter.max_retries.raise_on_status)
+
     @patch('utils.url_utils.requests.get')
     def test_access_url_success(self, mock_get) -> None:
         """Test access_url with successful response."""
@@ -468,6 +484,13 @@ class TestUrlUtils(unittest.TestCase):
         self.assertEqual(ct, "text/html")
 
 
+    def test_decoded_garbage_check_samples_prefix(self) -> None:
+        """Test only the leading sample decides garbage, so large text pages stay cheap."""
+        sample = url_utils._GARBAGE_SAMPLE_CHARS
+        self.assertFalse(url_utils._decoded_looks_like_garbage("a" * sample + "\x00" * (3 * sample)))
+        self.assertTrue(url_utils._decoded_looks_like_garbage("\x00" * sample + "a" * (3 * sample)))
+
+
 class TestIsNonHtmlResponse(unittest.TestCase):
     """Tests for is_non_html_response (used for download button on non-HTML links)."""
 
@@ -498,6 +521,25 @@ class TestIsNonHtmlResponse(unittest.TestCase):
         self.assertFalse(url_utils.is_non_html_response("application/json", '{"a":1}'))
 
 
+class TestBodySniffing(unittest.TestCase):
+    """Tests for body_looks_like_html / body_looks_like_xml."""
+
+    def test_leading_whitespace_and_bytes(self) -> None:
+        self.assertTrue(url_utils.body_looks_like_html("\n\t  <!DOCTYPE HTML><p>x</p>"))
+        self.assertTrue(url_utils.body_looks_like_html(b"  <HTML><body></body></HTML>"))
+        self.assertTrue(url_utils.body_looks_like_xml(b"\r\n<?XML version='1.0'?><a/>"))
+        self.assertTrue(url_utils.body_looks_like_xml("  <?xml version='1.0'?>"))
+
+    def test_only_first_8kb_considered(self) -> None:
+        self.assertFalse(url_utils.body_looks_like_html("<p>" + "x" * 9000 + "<html>"))
+        self.assertFalse(url_utils.body_looks_like_xml("<a/><?xml version='1.0'?>"))
+
+    def test_empty_or_short(self) -> None:
+        for body in (None, "", b"", "   ", "<a>   "):
+            self.assertFalse(url_utils.body_looks_like_html(body))
+            self.assertFalse(url_utils.body_looks_like_xml(body))
+
+
 class TestWafChallenge(unittest.TestCase):
     """Tests for is_waf_challenge (AWS WAF detection). Body must be >= 100 chars."""
 
@@ -516,6 +558,18 @@ class TestWafChallenge(unittest.TestCase):
     def test_awswaf_detected(self) -> None:
         self.assertTrue(url_utils.is_waf_challenge(202, "x" * 100 + "awswaf challenge"))
 
+    def test_large_challenge_page_detected(self) -> None:
+        """Markers in the head or tail of a large page are still found, case-insensitively."""
+        padding = "x" * 500_000
+        self.assertTrue(url_utils.is_waf_challenge(202, "<title>Human Verification</title>" + padding))
+        self.assertTrue(url_utils.is_waf_challenge(202, padding + '<script src="/Challenge.js"></script>'))
+
+    def test_large_page_middle_not_scanned(self) -> None:
+        """Only the head and tail of a large page are searched."""
+        padding = "x" * url_utils._WAF_SCAN_HEAD_LEN
+        body = padding + "awswaf" + padding
+        self.assertFalse(url_utils.is_waf_challenge(200, body))
+
     def test_normal_html_not_detected(self) -> None:
         body = "<html><body><h1>Normal page</h1><noscript>Fallback</noscript></body></html>" + " " * 30
         self.assertFalse(url_utils.is_waf_challenge(200, body))
@@ -536,6 +590,12 @@ class TestResolveCatalogResourceUrl(unittest.TestCase):
         result = url_utils.resolve_catalog_resource_url("https://catalog.data.gov/dataset/x/resource/y")
         self.assertEqual(result, "https://data.example.com/file.csv")
 
+    def test_is_catalog_url(self) -> None:
+        """Catalog URLs match by prefix; other hosts and http do not."""
+        self.assertTrue(url_utils.is_catalog_url("https://catalog.data.gov/dataset/x/resource/y"))
+        self.assertFalse(url_utils.is_catalog_url("http://catalog.data.gov/dataset/x"))
+        self.assertFalse(url_utils.is_catalog_url("https://example.com/catalog.data.gov"))
+
     @patch("utils.url_utils.fetch_page_body")
     def test_returns_none_for_non_catalog_url(self, mock_fetch: Mock) -> None:
         """Non-catalog URL returns None without calling fetch."""
@@ -550,6 +610,13 @@ class TestResolveCatalogResourceUrl(unittest.TestCase):
         result = url_utils.resolve_catalog_resource_url("https://catalog.data.gov/dataset/x/resource/y")
         self.assertIsNone(result)
 
+    @patch("utils.url_utils.fetch_page_body")
+    def test_href_before_id_still_found(self, mock_fetch: Mock) -> None:
+        """The res_url precheck does not hide links with href before id."""
+        mock_fetch.return_value = (200, "<a href='https://d/f.zip' id='res_url'>x</a>", "text/html", False)
+        result = url_utils.resolve_catalog_resource_url("https://catalog.data.gov/dataset/x/resource/y")
+        self.assertEqual(result, "https://d/f.zip")
+
     @patch("utils.url_utils.fetch_page_body")
     def test_returns_none_when_res_url_missing(self, mock_fetch: Mock) -> None:
         """When #res_url is missing from HTML, returns None."""
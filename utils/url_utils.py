@@ -8,6 +8,8 @@ import os
 import re
 from typing import Dict, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Headers to mimic a real browser and avoid abuse/filter blocks.
 # Includes Client Hints (Sec-CH-UA*) that Chrome sends; some WAFs check for these.
@@ -30,6 +32,10 @@ BROWSER_HEADERS: Dict[str, str] = {
     "Upgrade-Insecure-Requests": "1",
 }
 
+# Leading whitespace then an http(s) scheme; same answer as url.strip().startswith(...)
+# without copying the string.
+_HTTP_URL_RE = re.compile(r"\s*https?://")
+
 
 def is_valid_url(url: str) -> bool:
     """
@@ -49,8 +55,7 @@ def is_valid_url(url: str) -> bool:
     """
     if not url or not isinstance(url, str):
         return False
-    url = url.strip()
-    return url.startswith('http://') or url.startswith('https://')
+    return _HTTP_URL_RE.match(url) is not None
 
 
 def access_url(url: str, timeout: int = 30) -> Tuple[bool, str]:
@@ -247,13 +252,19 @@ def _raw_looks_binary(raw: bytes) -> bool:
     return any(raw.startswith(prefix) for prefix in _BINARY_MAGIC_PREFIXES)
 
 
+# Binary decoded as text is garbage throughout, so the printable ratio is taken over a
+# prefix; counting per character in Python over a multi-MB page costs tens of ms.
+_GARBAGE_SAMPLE_CHARS = 65536
+
+
 def _decoded_looks_like_garbage(text: str) -> bool:
     """Return True if decoded text has too few printable chars (likely binary decoded as text)."""
     if not text or len(text) < 10:
         return False
+    sample = text[:_GARBAGE_SAMPLE_CHARS]
     # Use Unicode notion of printable so UTF-8 HTML (curly quotes, em-dash, etc.) passes
-    printable = sum(1 for c in text if c.isprintable() or c in "\t\n\r")
-    return (printable / len(text)) < 0.7
+    printable = sum(1 for c in sample if c.isprintable() or c in "\t\n\r")
+    return (printable / len(sample)) < 0.7
 
 
 def _is_text_content_type(content_type: Optional[str]) -> bool:
@@ -297,14 +308,24 @@ def is_displayable_content_type(content_type: Optional[str]) -> bool:
     return False
 
 
+# Body sniffing only needs the start of the document; never copy or decode the whole body.
+_SNIFF_BYTES = 8192
+_NON_WS_RE = re.compile(r"\S")
+
+
+def _body_head(body: Optional[str | bytes], size: int = _SNIFF_BYTES) -> str:
+    """Return up to size chars of body starting at its first non-whitespace char."""
+    if not body:
+        return ""
+    if isinstance(body, bytes):
+        body = body[: 2 * size].decode("utf-8", errors="replace")
+    m = _NON_WS_RE.search(body)
+    return body[m.start(): m.start() + size] if m else ""
+
+
 def body_looks_like_xml(body: Optional[str | bytes]) -> bool:
     """Return True if body starts with XML declaration (e.g. when Content-Type is wrong)."""
-    if body is None:
-        return False
-    if isinstance(body, bytes):
-        body = body.decode("utf-8", errors="replace")
-    s = (body or "").strip()
-    return len(s) >= 5 and s[:5].lower() == "<?xml"
+    return _body_head(body, 5).lower() == "<?xml"
 
 
 def body_looks_like_html(body: Optional[str | bytes]) -> bool:
@@ -314,14 +335,10 @@ def body_looks_like_html(body: Optional[str | bytes]) -> bool:
     Pages like NCBI BioSample may be served as application/xml but are actually HTML.
     We treat as HTML if we see <!DOCTYPE html or <html in the first 8KB.
     """
-    if body is None:
+    head = _body_head(body)
+    if len(head.rstrip()) < 4:
         return False
-    if isinstance(body, bytes):
-        body = body.decode("utf-8", errors="replace")
-    s = (body or "").strip()
-    if len(s) < 4:
-        return False
-    head = s[:8192].lower()
+    head = head.lower()
     return "<!doctype html" in head or "<html" in head
 
 
@@ -357,6 +374,23 @@ def is_non_html_response(
     return False
 
 
+# AWS WAF challenge markers, matched case-insensitively without lowercasing the body.
+_WAF_MARKER_RE = re.compile(
+    r"awswaf|challenge\.js|challenge-container|human verification", re.IGNORECASE
+)
+# A noscript block with a JavaScript requirement (various phrasings).
+_WAF_NOSCRIPT_RE = re.compile(r"noscript", re.IGNORECASE)
+_WAF_JS_REQUIRED_RE = re.compile(
+    r"javascript is disabled|javascript is not enabled|enable javascript|javascript must be enabled",
+    re.IGNORECASE,
+)
+
+# Challenge markup sits in the page head and the bootstrap script near the end, so
+# large bodies are only searched in their first and last few KB.
+_WAF_SCAN_HEAD_LEN = 64_000
+_WAF_SCAN_TAIL_LEN = 16_000
+
+
 def _is_aws_waf_challenge(status_code: int, body: str) -> bool:
     """
     Return True if the response looks like an AWS WAF JavaScript challenge page.
@@ -370,24 +404,11 @@ def _is_aws_waf_challenge(status_code: int, body: str) -> bool:
         return False
     if not body or len(body) < 100:
         return False
-    lower = body.lower()
-    # Common WAF challenge indicators
-    if (
-        "awswaf" in lower
-        or "challenge.js" in lower
-        or "challenge-container" in lower
-        or "human verification" in lower
-    ):
+    if len(body) > _WAF_SCAN_HEAD_LEN + _WAF_SCAN_TAIL_LEN:
+        body = body[:_WAF_SCAN_HEAD_LEN] + body[-_WAF_SCAN_TAIL_LEN:]
+    if _WAF_MARKER_RE.search(body):
         return True
-    # noscript block with JS requirement (various phrasings)
-    if "noscript" in lower and (
-        "javascript is disabled" in lower
-        or "javascript is not enabled" in lower
-        or "enable javascript" in lower
-        or "javascript must be enabled" in lower
-    ):
-        return True
-    return False
+    return bool(_WAF_NOSCRIPT_RE.search(body) and _WAF_JS_REQUIRED_RE.search(body))
 
 
 def is_waf_challenge(status_code: int, body: str) -> bool:
@@ -415,6 +436,35 @@ def requests_verify() -> bool | str:
         return True
 
 
+def create_pooled_session(
+    pool_connections: int = 32,
+    pool_maxsize: int = 64,
+    retries: int = 2,
+) -> requests.Session:
+    """
+    Return a requests.Session with a keep-alive connection pool for http/https.
+
+    Long-lived callers (e.g. the collector API) keep one per module so repeated
+    requests to the same host reuse sockets and TLS sessions. Connection errors
+    and 502/503/504 are retried `retries` times with a short backoff; the last
+    response is returned (not raised) so callers keep using raise_for_status().
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 def _is_ssl_error(exc: BaseException) -> bool:
     """True when *exc* is an SSL certificate verification failure."""
     if isinstance(exc, requests.exceptions.SSLError):
@@ -614,6 +664,25 @@ def fetch_page_body(
         return -1, "", None, False
 
 
+# Hosts whose resource pages link to the real file via <a id="res_url">. One tuple so
+# str.startswith checks every prefix in a single C-level call.
+_CATALOG_URL_PREFIXES = ("https://catalog.data.gov",)
+
+
+def is_catalog_url(url: str) -> bool:
+    """Return True if url is on a catalog host that resolve_catalog_resource_url handles."""
+    return url.startswith(_CATALOG_URL_PREFIXES)
+
+
+# catalog.data.gov resource link: <a id="res_url" href="..."> with id and href in either order.
+_RES_URL_ID_FIRST_RE = re.compile(
+    r'<a\s+[^>]*id\s*=\s*["\']res_url["\'][^>]*href\s*=\s*["\']([^"\']+)["\']', re.I | re.DOTALL
+)
+_RES_URL_HREF_FIRST_RE = re.compile(
+    r'<a\s+[^>]*href\s*=\s*["\']([^"\']+)["\'][^>]*id\s*=\s*["\']res_url["\']', re.I | re.DOTALL
+)
+
+
 def resolve_catalog_resource_url(catalog_url: str, timeout: int = 30) -> Optional[str]:
     """
     Resolve a catalog.data.gov resource page URL to the actual download URL.
@@ -630,23 +699,16 @@ def resolve_catalog_resource_url(catalog_url: str, timeout: int = 30) -> Optiona
     Returns:
         The resolved download URL, or None.
     """
-    if not catalog_url.startswith("https://catalog.data.gov"):
+    if not is_catalog_url(catalog_url):
         return None
     status_code, body, content_type, is_logical_404 = fetch_page_body(catalog_url, timeout=timeout)
     if status_code == 404 or is_logical_404:
         return None
     if not body or not content_type or "text/html" not in content_type.lower():
         return None
-    # Match <a id="res_url" href="..."> or id then href in either order
-    match = re.search(
-        r'<a\s+[^>]*id\s*=\s*["\']res_url["\'][^>]*href\s*=\s*["\']([^"\']+)["\']',
-        body, re.I | re.DOTALL
-    )
-    if not match:
-        match = re.search(
-            r'<a\s+[^>]*href\s*=\s*["\']([^"\']+)["\'][^>]*id\s*=\s*["\']res_url["\']',
-            body, re.I | re.DOTALL
-        )
+    if "res_url" not in body and "RES_URL" not in body:
+        return None  # cheap reject before the attribute-order regexes scan the page
+    match = _RES_URL_ID_FIRST_RE.search(body) or _RES_URL_HREF_FIRST_RE.search(body)
     if match:
         return match.group(1).strip()
     return None